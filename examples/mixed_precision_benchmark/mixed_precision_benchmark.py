@@ -0,0 +1,126 @@
+import argparse
+import pathlib
+import time
+import torch
+import wasabi
+from typing import Dict, Any, Optional
+from sciwing.utils.sciwing_toml_runner import SciWingTOMLRunner
+
+
+def run_experiment(
+    toml_filename: str,
+    mixed_precision: Optional[str],
+    output_dir: str,
+    num_epochs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """ Trains and tests the experiment of a toml file with one precision
+
+    Parameters
+    ----------
+    toml_filename : str
+        The toml file of the experiment
+    mixed_precision : Optional[str]
+        The ``mixed_precision`` of the engine. None trains in fp32
+    output_dir : str
+        The experiment directory of the run is created inside this directory
+    num_epochs : Optional[int]
+        Overrides the number of epochs of the toml file
+
+    Returns
+    -------
+    Dict[str, Any]
+        The training time, the throughput in lines per second and the test
+        macro fscore averaged over the label namespaces
+    """
+    runner = SciWingTOMLRunner(toml_filename=pathlib.Path(toml_filename))
+    precision_name = mixed_precision or "float32"
+    exp_name = runner.doc["experiment"]["exp_name"]
+    exp_dir = pathlib.Path(output_dir, f"{exp_name}_{precision_name}")
+    runner.doc["experiment"]["exp_dir"] = str(exp_dir)
+
+    engine_section = runner.doc["engine"]
+    engine_section["save_dir"] = str(exp_dir.joinpath("checkpoints"))
+    engine_section["track_for_best"] = "macro_fscore"
+    if mixed_precision is not None:
+        engine_section["mixed_precision"] = mixed_precision
+    if num_epochs is not None:
+        engine_section["num_epochs"] = num_epochs
+
+    runner.parse()
+    engine = runner.engine
+
+    train_time = 0.0
+    for epoch_num in range(engine.num_epochs):
+        start = time.perf_counter()
+        engine.train_epoch(epoch_num)
+        train_time += time.perf_counter() - start
+        engine.validation_epoch(epoch_num)
+    engine.test_epoch(epoch_num)
+
+    num_train_lines = len(engine.get_train_dataset()) * engine.num_epochs
+    metric = engine.test_metric_calc.get_metric()
+    fscores = [metric[namespace]["macro_fscore"] for namespace in metric.keys()]
+
+    return {
+        "experiment": exp_name,
+        "precision": precision_name,
+        "train_time": train_time,
+        "lines_per_second": num_train_lines / train_time,
+        "macro_fscore": sum(fscores) / len(fscores),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares the training throughput and the test fscore of "
+        "experiments trained in fp32 and with mixed precision"
+    )
+    parser.add_argument(
+        "toml_filenames", help="The toml files of the experiments", nargs="+"
+    )
+    parser.add_argument(
+        "--mixed_precision",
+        help="The mixed precision dtype that is compared with fp32. "
+        "One of bfloat16 or float16",
+        default="bfloat16",
+    )
+    parser.add_argument(
+        "--output_dir",
+        help="Directory to store the experiments of the benchmark",
+        default="./output",
+    )
+    parser.add_argument(
+        "--epochs", help="Overrides the number of epochs of the toml files", type=int
+    )
+    parser.add_argument(
+        "--num_threads", help="The number of threads used by torch on cpu", type=int
+    )
+    args = parser.parse_args()
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+
+    results = []
+    for toml_filename in args.toml_filenames:
+        for mixed_precision in [None, args.mixed_precision]:
+            result = run_experiment(
+                toml_filename=toml_filename,
+                mixed_precision=mixed_precision,
+                output_dir=args.output_dir,
+                num_epochs=args.epochs,
+            )
+            results.append(result)
+
+    msg_printer = wasabi.Printer()
+    header = ["Experiment", "Precision", "Train time (s)", "Lines/s", "Macro F"]
+    data = [
+        (
+            result["experiment"],
+            result["precision"],
+            f"{result['train_time']:.2f}",
+            f"{result['lines_per_second']:.1f}",
+            f"{result['macro_fscore']:.4f}",
+        )
+        for result in results
+    ]
+    print(msg_printer.table(data=data, header=header, divider=True))
@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+
+
+SCRIPT_FILE="mixed_precision_benchmark.py"
+
+python ${SCRIPT_FILE} \
+../sectlabel_bilstm/sectlabel_bilstm.toml \
+../genericsect_bilstm/genericsect_bilstm.toml \
+../science_ie/science_ie.toml \
+--mixed_precision bfloat16 \
+--output_dir "./output" \
+--epochs 5
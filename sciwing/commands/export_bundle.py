@@ -0,0 +1,75 @@
+import click
+import pathlib
+import wasabi
+from typing import Optional
+from sciwing.utils.sciwing_toml_runner import SciWingTOMLRunner
+from sciwing.data.inference_bundle import InferenceBundle
+
+
+def export_inference_bundle(
+    toml_filename: str, bundle_dir: Optional[str] = None
+) -> InferenceBundle:
+    """ Exports the inference bundle of the experiment in the toml file. The bundle
+    has the best model of the experiment, the vocabs, the numericalizers and the
+    tokenizers. The datasets are read once here and are not needed to load the
+    model from the bundle
+
+    Parameters
+    ----------
+    toml_filename : str
+        The toml file of a trained experiment
+    bundle_dir : Optional[str]
+        The directory where the bundle is written. ``bundle`` in the experiment
+        directory by default
+
+    Returns
+    -------
+    InferenceBundle
+    """
+    sciwing_toml_runner = SciWingTOMLRunner(toml_filename=pathlib.Path(toml_filename))
+    experiment_section = sciwing_toml_runner.doc.get("experiment")
+    experiment_dir = pathlib.Path(experiment_section.get("exp_dir"))
+    model_filepath = experiment_dir.joinpath("checkpoints", "best_model.pt")
+    if not model_filepath.is_file():
+        raise FileNotFoundError(
+            f"{model_filepath} is not found. Train the model before exporting it"
+        )
+
+    if bundle_dir is None:
+        bundle_dir = experiment_dir.joinpath("bundle")
+
+    datasets_manager = sciwing_toml_runner.parse_dataset_section()
+    return InferenceBundle.export(
+        datasets_manager=datasets_manager,
+        bundle_dir=str(bundle_dir),
+        model_filepath=str(model_filepath),
+    )
+
+
+@click.command(name="export-bundle")
+@click.argument("toml_filename")
+@click.option(
+    "--bundle-dir",
+    default=None,
+    help="Directory of the bundle. Defaults to bundle in the experiment directory",
+)
+def export_bundle(toml_filename, bundle_dir):
+    """ Exports the inference bundle of a trained experiment. Ship the bundle
+    directory to load the model for inference without the datasets
+
+    Parameters
+    ----------
+    toml_filename : str
+        Full path of the toml filename of the experiment
+    bundle_dir : str
+        Directory where the bundle is written
+
+    """
+    toml_filepath = pathlib.Path(toml_filename)
+    if not toml_filepath.is_file():
+        raise FileNotFoundError(f"TOML File {toml_filename} is not found")
+
+    bundle = export_inference_bundle(
+        toml_filename=str(toml_filepath), bundle_dir=bundle_dir
+    )
+    wasabi.Printer().good(f"Exported the inference bundle to {bundle.bundle_dir}")
@@ -0,0 +1,121 @@
+import click
+import pathlib
+import multiprocessing
+import torch
+import wasabi
+from typing import Dict
+from sciwing.utils.sciwing_toml_runner import SciWingTOMLRunner
+from sciwing.utils.exceptions import TOMLConfigurationError
+from sciwing.modules.embedders.cached_embedder import CachedEmbedder
+from sciwing.utils.common import chunks
+
+
+def precompute_embeddings(
+    toml_filename: str, batch_size: int, process_idx: int, num_processes: int
+) -> Dict[str, Dict[str, int]]:
+    """ Runs the cached embedders of the model in the toml file over the
+    train, dev and test lines. Every process takes every ``num_processes`` th
+    batch and writes the embeddings to its own shard in the cache directory
+
+    Parameters
+    ----------
+    toml_filename : str
+        The toml file that defines the dataset, the model and the embedding cache
+    batch_size : int
+        The number of lines embedded at once
+    process_idx : int
+        The index of this process
+    num_processes : int
+        The total number of processes
+
+    Returns
+    -------
+    Dict[str, Dict[str, int]]
+        The hits and misses of the cache of every embedder
+    """
+    sciwing_toml_runner = SciWingTOMLRunner(toml_filename=pathlib.Path(toml_filename))
+    if sciwing_toml_runner.doc.get("embedding_cache") is None:
+        raise TOMLConfigurationError(
+            f"{toml_filename} does not have an embedding_cache section. Please "
+            f"provide one to store the precomputed embeddings"
+        )
+    sciwing_toml_runner.parse_dataset_and_model()
+
+    model = sciwing_toml_runner.model
+    model.eval()
+    cached_embedders = [
+        module for module in model.modules() if isinstance(module, CachedEmbedder)
+    ]
+    if len(cached_embedders) == 0:
+        wasabi.Printer().warn(f"None of the embedders in {toml_filename} are cached")
+
+    datasets_manager = sciwing_toml_runner.datasets_manager
+    lines = []
+    for dataset in [
+        datasets_manager.train_dataset,
+        datasets_manager.dev_dataset,
+        datasets_manager.test_dataset,
+    ]:
+        lines.extend(dataset.lines)
+
+    batches = list(chunks(lines, batch_size))
+    batches = batches[process_idx::num_processes]
+
+    stats = {}
+    with torch.no_grad():
+        for cached_embedder in cached_embedders:
+            for batch in batches:
+                cached_embedder(batch)
+            cached_embedder.embedding_cache.close()
+            stats[cached_embedder.embedder_name] = (
+                cached_embedder.embedding_cache.get_stats()
+            )
+
+    return stats
+
+
+@click.command()
+@click.argument("toml_filename")
+@click.option("--batch-size", default=32, help="Number of lines embedded at once")
+@click.option(
+    "--num-processes", default=1, help="Number of processes embedding the lines"
+)
+def precompute(toml_filename, batch_size, num_processes):
+    """ Precomputes the embeddings of the frozen embedders in the toml file for the
+    train, dev and test datasets. The toml file needs an ``embedding_cache`` section.
+    Training with the same toml file then reads the embeddings from the cache
+    instead of running the embedders.
+
+    Parameters
+    ----------
+    toml_filename : str
+        Full path of the toml filename
+    batch_size : int
+        Number of lines embedded at once
+    num_processes : int
+        Number of processes embedding the lines. Every process loads its own
+        copy of the embedders
+
+    """
+    toml_filepath = pathlib.Path(toml_filename)
+    if not toml_filepath.is_file():
+        raise FileNotFoundError(f"TOML File {toml_filename} is not found")
+
+    msg_printer = wasabi.Printer()
+    args = [
+        (str(toml_filepath), batch_size, process_idx, num_processes)
+        for process_idx in range(num_processes)
+    ]
+    if num_processes == 1:
+        all_stats = [precompute_embeddings(*args[0])]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=num_processes) as pool:
+            all_stats = pool.starmap(precompute_embeddings, args)
+
+    for stats in all_stats:
+        for embedder_name, embedder_stats in stats.items():
+            msg_printer.good(
+                f"{embedder_name}: computed {embedder_stats['misses']} lines, "
+                f"{embedder_stats['hits']} lines were already cached"
+            )
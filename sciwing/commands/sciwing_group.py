@@ -4,6 +4,8 @@ from sciwing.commands.run import run
 from sciwing.commands.test import test
 from sciwing.commands.develop import develop
 from sciwing.commands.download import download
+from sciwing.commands.precompute import precompute
+from sciwing.commands.export_bundle import export_bundle
 
 
 @click.group(name="sciwing")
@@ -19,6 +21,8 @@ def main():
     sciwing_group.add_command(test)
     sciwing_group.add_command(develop)
     sciwing_group.add_command(download)
+    sciwing_group.add_command(precompute)
+    sciwing_group.add_command(export_bundle)
     sciwing_group()
 
 
@@ -4,10 +4,11 @@ import pathlib
 ROOT_DIR = os.path.dirname(os.path.realpath(__file__))
 ROOT_UP_DIR = os.path.dirname(os.path.dirname(__file__))
 HOME_DIR = pathlib.Path("~").expanduser()
+DATA_DIR = os.path.join(HOME_DIR, ".sciwing.data_cache")
 
 
 PATHS = dict(
-    DATA_DIR=os.path.join(HOME_DIR, ".sciwing.data_cache"),
+    DATA_DIR=DATA_DIR,
     MODELS_CACHE_DIR=os.path.join(HOME_DIR, ".sciwing.model_cache"),
     AWS_CRED_DIR=os.path.join(HOME_DIR, ".sciwing.aws"),
     OUTPUT_DIR=os.path.join(HOME_DIR, ".sciwing.output_cache"),
@@ -16,6 +17,10 @@ PATHS = dict(
     TESTS_DIR=os.path.join(ROOT_UP_DIR, "tests"),
     DATASETS_DIR=os.path.join(ROOT_DIR, "datasets"),
     EMBEDDING_CACHE_DIR=os.path.join(HOME_DIR, ".sciwing.embedding_cache"),
+    # the snapshots of the datasets are stored next to the dataset files
+    DATASETS_CACHE_DIR=os.path.join(
+        os.path.dirname(DATA_DIR), ".sciwing.datasets_cache"
+    ),
 )
 
 
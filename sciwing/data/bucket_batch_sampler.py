@@ -0,0 +1,116 @@
+from torch.utils.data.sampler import Sampler
+from typing import List, Iterator, Optional
+import numpy as np
+
+
+class BucketBatchSampler(Sampler):
+    def __init__(
+        self,
+        indices: List[int],
+        lengths: List[int],
+        batch_size: int,
+        max_tokens_per_batch: Optional[int] = None,
+        bucket_size_multiplier: int = 100,
+        shuffle: bool = True,
+    ):
+        """ Groups examples of similar lengths into the same batch
+
+        The indices are shuffled and split into chunks of
+        ``batch_size * bucket_size_multiplier`` examples. Every chunk is sorted by
+        the length of the examples and then cut into batches. This keeps the
+        randomness of the batches across epochs while reducing the amount of
+        padding in every batch.
+
+        Parameters
+        ----------
+        indices : List[int]
+            The indices of the dataset that will be sampled
+        lengths : List[int]
+            The length (number of tokens) of every example in the dataset.
+            ``lengths[idx]`` is the length of the example with index ``idx``
+        batch_size : int
+            The maximum number of examples in a batch
+        max_tokens_per_batch : Optional[int]
+            If this is given, a batch is closed as soon as the padded number of tokens
+            ``len(batch) * max_length_in_batch`` would exceed this budget. The
+            ``batch_size`` is still an upper limit on the number of examples
+        bucket_size_multiplier : int
+            The number of batches worth of examples that are sorted together
+        shuffle : bool
+            If True, the indices and the order of batches are shuffled every epoch
+        """
+        self.indices = list(indices)
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.bucket_size_multiplier = bucket_size_multiplier
+        self.shuffle = shuffle
+        # the batches of the current epoch. They are formed by ``__len__`` when it
+        # is called before the epoch starts and reused by ``__iter__``
+        self._batches: List[List[int]] = None
+        self._batches_iterated = False
+
+        assert self.batch_size > 0, "batch_size should be a positive integer"
+        assert (
+            self.bucket_size_multiplier > 0
+        ), "bucket_size_multiplier should be a positive integer"
+
+    def get_batches(self) -> List[List[int]]:
+        """ Forms the batches for one epoch
+
+        Returns
+        -------
+        List[List[int]]
+            A list of batches where every batch is a list of dataset indices
+
+        """
+        indices = list(self.indices)
+        if self.shuffle:
+            np.random.shuffle(indices)
+
+        bucket_size = self.batch_size * self.bucket_size_multiplier
+        batches = []
+        for start in range(0, len(indices), bucket_size):
+            bucket = indices[start : start + bucket_size]
+            bucket = sorted(bucket, key=lambda idx: self.lengths[idx])
+            batches.extend(self._split_bucket(bucket))
+
+        if self.shuffle:
+            np.random.shuffle(batches)
+
+        return batches
+
+    def _split_bucket(self, bucket: List[int]) -> List[List[int]]:
+        batches = []
+        batch = []
+        max_length = 0
+        for idx in bucket:
+            length = max(self.lengths[idx], 1)
+            new_max_length = max(max_length, length)
+            exceeds_budget = (
+                self.max_tokens_per_batch is not None
+                and len(batch) > 0
+                and new_max_length * (len(batch) + 1) > self.max_tokens_per_batch
+            )
+            if len(batch) == self.batch_size or exceeds_budget:
+                batches.append(batch)
+                batch = []
+                new_max_length = length
+            batch.append(idx)
+            max_length = new_max_length
+
+        if len(batch) > 0:
+            batches.append(batch)
+
+        return batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        if self._batches is None or self._batches_iterated:
+            self._batches = self.get_batches()
+        self._batches_iterated = True
+        return iter(self._batches)
+
+    def __len__(self) -> int:
+        if self._batches is None:
+            self._batches = self.get_batches()
+        return len(self._batches)
@@ -0,0 +1,229 @@
+import torch
+import torch.nn.functional as F
+from typing import Dict, List, Tuple, Any, Union, Sequence
+from sciwing.data.line import Line
+from sciwing.data.label import Label
+from sciwing.data.seq_label import SeqLabel
+from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
+from sciwing.numericalizers.numericalizer import Numericalizer
+
+
+class CollatedInstances(list):
+    def __init__(
+        self,
+        instances: Sequence[Union[Line, Label, SeqLabel]],
+        padded: Dict[str, torch.LongTensor] = None,
+        lengths: Dict[str, torch.LongTensor] = None,
+    ):
+        """ The lines or the labels of a batch along with their padded indices.
+        It is a list of the instances, so it is used in place of the list of lines
+        or labels that the models take
+
+        Parameters
+        ----------
+        instances : Sequence[Union[Line, Label, SeqLabel]]
+            The lines or the labels of the batch
+        padded : Dict[str, torch.LongTensor]
+            For every namespace, the indices of the tokens of size
+            ``[batch_size, max_length]``. ``max_length`` is the number of tokens of
+            the longest instance. The padding has the index of the pad token
+        lengths : Dict[str, torch.LongTensor]
+            For every namespace, the number of tokens of every instance
+        """
+        super(CollatedInstances, self).__init__(instances)
+        self.padded = padded or {}
+        self.lengths = lengths or {}
+
+
+class CollatedBatch(list):
+    def __init__(
+        self, examples: List[Tuple[Any, ...]], instances: List[CollatedInstances]
+    ):
+        """ A batch made by ``NumericalizingCollator``. It is the list of the
+        examples of the batch. ``instances`` has the lines, the labels and their
+        padded indices
+
+        The models and the metrics still read the lines and the labels, for
+        example their text, so a batch made in a ``DataLoader`` worker is sent to
+        the main process with the instances next to the padded tensors. Only the
+        tokenizers of the lines are left out when they are pickled
+
+        Parameters
+        ----------
+        examples : List[Tuple[Any, ...]]
+            The ``(line, label)`` examples of the batch
+        instances : List[CollatedInstances]
+            The instances at every position of the examples. For example the lines
+            and then the labels
+        """
+        super(CollatedBatch, self).__init__(examples)
+        self.instances = instances
+
+    def pin_memory(self) -> "CollatedBatch":
+        # called by the DataLoader when the batches are pinned
+        for instances in self.instances:
+            instances.padded = {
+                namespace: padded.pin_memory()
+                for namespace, padded in instances.padded.items()
+            }
+        return self
+
+
+class NumericalizingCollator:
+    def __init__(self, namespace_to_numericalizer: Dict[str, BaseNumericalizer]):
+        """ Collates a list of ``(line, label)`` examples into a ``CollatedBatch``.
+        Every namespace of the lines and the labels that has a ``Numericalizer`` is
+        numericalized and padded into a single ``torch.LongTensor`` per namespace.
+        The instances of the dataset are not changed.
+
+        When the ``DataLoader`` has workers, the numericalization and the padding run
+        in the workers and the main process only runs the model.
+
+        Parameters
+        ----------
+        namespace_to_numericalizer : Dict[str, BaseNumericalizer]
+            The numericalizer for every namespace. Usually
+            ``DatasetsManager.namespace_to_numericalizer``
+        """
+        self.namespace_to_numericalizer = {
+            namespace: numericalizer
+            for namespace, numericalizer in namespace_to_numericalizer.items()
+            if isinstance(numericalizer, Numericalizer)
+        }
+
+    def __call__(self, batch: List[Tuple[Any, ...]]) -> CollatedBatch:
+        instances = [self.collate_instances(part) for part in zip(*batch)]
+        return CollatedBatch(examples=batch, instances=instances)
+
+    def collate_instances(
+        self, instances: Sequence[Union[Line, Label, SeqLabel]]
+    ) -> CollatedInstances:
+        padded = {}
+        lengths = {}
+        for namespace in instances[0].tokens.keys():
+            numericalizer = self.namespace_to_numericalizer.get(namespace)
+            if numericalizer is None:
+                continue
+            lengths[namespace] = torch.tensor(
+                [len(instance.tokens[namespace]) for instance in instances],
+                dtype=torch.long,
+            )
+            padded[namespace] = pad_instances(
+                instances=instances,
+                namespace=namespace,
+                numericalizer=numericalizer,
+                max_length=int(lengths[namespace].max()),
+            )
+        return CollatedInstances(instances=instances, padded=padded, lengths=lengths)
+
+
+def transpose_batch(batch: List[Tuple[Any, ...]]) -> List[Sequence[Any]]:
+    """ Returns the lines and the labels of a batch of ``(line, label)`` examples.
+    The instances of a ``CollatedBatch`` come with their padded indices
+
+    Parameters
+    ----------
+    batch : List[Tuple[Any, ...]]
+        The examples of the batch
+
+    Returns
+    -------
+    List[Sequence[Any]]
+        The instances at every position of the examples
+    """
+    if isinstance(batch, CollatedBatch):
+        return batch.instances
+    return list(zip(*batch))
+
+
+def pad_instances(
+    instances: Sequence[Union[Line, Label, SeqLabel]],
+    namespace: str,
+    numericalizer: Numericalizer,
+    max_length: int,
+) -> torch.LongTensor:
+    """ Numericalizes and pads the tokens of the instances in a namespace. The
+    indices stored in the instances, for example by a dataset snapshot, are used
+    when all the instances have them
+
+    Parameters
+    ----------
+    instances : Sequence[Union[Line, Label, SeqLabel]]
+        The lines or the labels of a batch
+    namespace : str
+        The namespace of the tokens
+    numericalizer : Numericalizer
+        The numericalizer of the namespace
+    max_length : int
+        The instances are truncated or padded to this length
+
+    Returns
+    -------
+    torch.LongTensor
+        The indices of size ``[batch_size, max_length]``
+    """
+    numericalized = [instance.numericalized.get(namespace) for instance in instances]
+    if any(instance_indices is None for instance_indices in numericalized):
+        numericalized = numericalizer.numericalize_batch_instances(
+            instances=[
+                [token.text for token in instance.tokens[namespace]]
+                for instance in instances
+            ]
+        )
+
+    return numericalizer.pad_batch_to_tensor(
+        instances=numericalized, max_length=max_length, add_start_end_token=False
+    )
+
+
+def get_numericalized_batch(
+    instances: Sequence[Union[Line, Label, SeqLabel]],
+    namespace: str,
+    numericalizer: Numericalizer,
+    max_length: int,
+    device: Union[str, torch.device] = torch.device("cpu"),
+) -> torch.LongTensor:
+    """ Returns the padded indices of the tokens of the instances in a namespace.
+    The indices padded by ``NumericalizingCollator`` are used when the instances are
+    ``CollatedInstances``. Otherwise the tokens of the batch are numericalized here
+
+    Parameters
+    ----------
+    instances : Sequence[Union[Line, Label, SeqLabel]]
+        The lines or the labels of a batch
+    namespace : str
+        The namespace of the tokens
+    numericalizer : Numericalizer
+        The numericalizer of the namespace
+    max_length : int
+        The instances are truncated or padded to this length
+    device : Union[str, torch.device]
+        The device of the returned tensor
+
+    Returns
+    -------
+    torch.LongTensor
+        The indices of size ``[batch_size, max_length]``. The padding has the index
+        of the pad token
+    """
+    padded = None
+    if isinstance(instances, CollatedInstances):
+        padded = instances.padded.get(namespace)
+
+    if padded is None:
+        padded = pad_instances(
+            instances=instances,
+            namespace=namespace,
+            numericalizer=numericalizer,
+            max_length=max_length,
+        )
+    elif padded.size(1) >= max_length:
+        padded = padded[:, :max_length]
+    else:
+        pad_token_idx = numericalizer.get_special_indices()["pad"]
+        padded = F.pad(
+            padded,
+            (0, max_length - padded.size(1)),
+            value=0 if pad_token_idx is None else pad_token_idx,
+        )
+    return padded.to(device, non_blocking=True)
@@ -0,0 +1,419 @@
+"""
+Compact storage of the lines and the labels of a dataset.
+The tokens of all the instances are stored as flat arrays of integer ids with
+offsets for every namespace. A ``Line``, ``Label`` or ``SeqLabel`` is made again only
+when an instance is accessed, for example while making a batch.
+"""
+import os
+import json
+import torch
+import numpy as np
+from abc import ABCMeta, abstractmethod
+from array import array
+from typing import Dict, List, Iterator, Union, Optional
+from sciwing.data.line import Line
+from sciwing.data.label import Label
+from sciwing.data.seq_label import SeqLabel
+from sciwing.data.token import Token
+from sciwing.vocab.vocab import Vocab
+
+
+class CompactTokenStore:
+    def __init__(self):
+        """ Stores the tokens of many instances in different namespaces.
+        Every distinct token string is stored once. For every namespace, the ids of
+        the tokens of all the instances are stored one after the other in a
+        single array along with the offset where every instance starts.
+
+        The vocab indices of the tokens can also be stored for every namespace using
+        ``numericalize``. They are attached to the instances that are made
+        """
+        self.token2id: Dict[str, int] = {}
+        self.id2token: List[str] = []
+        self.namespace_ids: Dict[str, Union[array, np.ndarray]] = {}
+        self.namespace_offsets: Dict[str, Union[array, np.ndarray]] = {}
+        self.namespace_indices: Dict[str, np.ndarray] = {}
+        self.num_instances = 0
+
+    def get_token_id(self, token: str) -> int:
+        token_id = self.token2id.get(token)
+        if token_id is None:
+            token_id = len(self.id2token)
+            self.token2id[token] = token_id
+            self.id2token.append(token)
+        return token_id
+
+    def append(self, namespace_tokens: Dict[str, List[Union[str, Token]]]):
+        """ Stores the tokens of one instance
+
+        Parameters
+        ----------
+        namespace_tokens : Dict[str, List[Union[str, Token]]]
+            A mapping from the namespace to the tokens of the instance
+        """
+        for namespace in namespace_tokens.keys():
+            if namespace not in self.namespace_ids:
+                # instances that were added before do not have tokens in the namespace
+                self.namespace_ids[namespace] = array("i")
+                self.namespace_offsets[namespace] = array("q", [0]) * (
+                    self.num_instances + 1
+                )
+
+        for namespace, ids in self.namespace_ids.items():
+            tokens = namespace_tokens.get(namespace, [])
+            ids.extend(
+                self.get_token_id(token.text if isinstance(token, Token) else token)
+                for token in tokens
+            )
+            self.namespace_offsets[namespace].append(len(ids))
+
+        self.num_instances += 1
+
+    def get_tokens(self, idx: int) -> Dict[str, List[str]]:
+        """ Returns the tokens of an instance
+
+        Parameters
+        ----------
+        idx : int
+            The index of the instance
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            A mapping from the namespace to the tokens of the instance
+        """
+        namespace_tokens = {}
+        for namespace, ids in self.namespace_ids.items():
+            offsets = self.namespace_offsets[namespace]
+            namespace_tokens[namespace] = [
+                self.id2token[token_id]
+                for token_id in ids[offsets[idx] : offsets[idx + 1]]
+            ]
+        return namespace_tokens
+
+    def get_num_tokens(self, idx: int, namespace: str) -> int:
+        offsets = self.namespace_offsets[namespace]
+        return int(offsets[idx + 1] - offsets[idx])
+
+    def numericalize(self, namespace_to_vocab: Dict[str, Vocab]):
+        """ Stores the vocab index of every token of the namespaces that have a vocab
+
+        Parameters
+        ----------
+        namespace_to_vocab : Dict[str, Vocab]
+            The vocab of every namespace
+        """
+        for namespace, ids in self.namespace_ids.items():
+            vocab = namespace_to_vocab.get(namespace)
+            if vocab is None:
+                continue
+            # every distinct token is looked up once. -1 marks the tokens
+            # that are not in a vocab without an unknown token
+            lookup = [vocab.get_idx_from_token(token) for token in self.id2token]
+            lookup = np.array(
+                [-1 if idx is None else idx for idx in lookup], dtype=np.int64
+            )
+            self.namespace_indices[namespace] = lookup[np.asarray(ids, dtype=np.int64)]
+
+    def get_indices(self, idx: int) -> Dict[str, torch.LongTensor]:
+        """ Returns the stored vocab indices of an instance
+
+        Parameters
+        ----------
+        idx : int
+            The index of the instance
+
+        Returns
+        -------
+        Dict[str, torch.LongTensor]
+            The indices of every numericalized namespace. Namespaces where a token
+            is not in the vocab are left out
+        """
+        namespace_indices = {}
+        for namespace, indices in self.namespace_indices.items():
+            offsets = self.namespace_offsets[namespace]
+            instance_indices = np.array(
+                indices[offsets[idx] : offsets[idx + 1]], dtype=np.int64
+            )
+            if (instance_indices < 0).any():
+                continue
+            namespace_indices[namespace] = torch.from_numpy(instance_indices)
+        return namespace_indices
+
+    def save(self, directory: str, prefix: str):
+        """ Writes the store to ``directory``. Every file name starts with ``prefix``
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the store is written
+        prefix : str
+            The prefix of the file names
+        """
+        meta = {
+            "num_instances": self.num_instances,
+            "namespaces": list(self.namespace_ids.keys()),
+            "numericalized_namespaces": list(self.namespace_indices.keys()),
+            "id2token": self.id2token,
+        }
+        with open(os.path.join(directory, f"{prefix}.json"), "w") as fp:
+            json.dump(meta, fp)
+
+        for namespace_idx, namespace in enumerate(meta["namespaces"]):
+            filename = os.path.join(directory, f"{prefix}.{namespace_idx}")
+            np.save(
+                f"{filename}.ids.npy",
+                np.asarray(self.namespace_ids[namespace], dtype=np.int32),
+            )
+            np.save(
+                f"{filename}.offsets.npy",
+                np.asarray(self.namespace_offsets[namespace], dtype=np.int64),
+            )
+            if namespace in self.namespace_indices:
+                np.save(
+                    f"{filename}.indices.npy",
+                    np.asarray(self.namespace_indices[namespace], dtype=np.int64),
+                )
+
+    @classmethod
+    def load(
+        cls, directory: str, prefix: str, mmap_mode: Optional[str] = "r"
+    ) -> "CompactTokenStore":
+        """ Reads a store that was written with ``save``. The arrays are memory mapped
+        by default. A loaded store cannot be appended to
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the store is written
+        prefix : str
+            The prefix of the file names
+        mmap_mode : Optional[str]
+            Passed to ``np.load``. Use None to read the arrays into memory
+
+        Returns
+        -------
+        CompactTokenStore
+        """
+        with open(os.path.join(directory, f"{prefix}.json"), "r") as fp:
+            meta = json.load(fp)
+
+        store = cls()
+        store.num_instances = meta["num_instances"]
+        store.id2token = meta["id2token"]
+        store.token2id = {token: idx for idx, token in enumerate(store.id2token)}
+        for namespace_idx, namespace in enumerate(meta["namespaces"]):
+            filename = os.path.join(directory, f"{prefix}.{namespace_idx}")
+            store.namespace_ids[namespace] = np.load(
+                f"{filename}.ids.npy", mmap_mode=mmap_mode
+            )
+            store.namespace_offsets[namespace] = np.load(
+                f"{filename}.offsets.npy", mmap_mode=mmap_mode
+            )
+            if namespace in meta["numericalized_namespaces"]:
+                store.namespace_indices[namespace] = np.load(
+                    f"{filename}.indices.npy", mmap_mode=mmap_mode
+                )
+        return store
+
+    def __getstate__(self):
+        # token2id is built again from id2token after unpickling
+        state = self.__dict__.copy()
+        state["token2id"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.token2id = {token: idx for idx, token in enumerate(self.id2token)}
+
+    def __len__(self) -> int:
+        return self.num_instances
+
+
+class CompactTexts:
+    def __init__(self):
+        """ Stores many strings as one utf-8 encoded buffer with offsets
+        """
+        self.buffer: Union[bytearray, np.ndarray] = bytearray()
+        self.offsets: Union[array, np.ndarray] = array("q", [0])
+
+    def append(self, text: str):
+        self.buffer.extend(text.encode("utf-8"))
+        self.offsets.append(len(self.buffer))
+
+    def __getitem__(self, idx: int) -> str:
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        return bytes(self.buffer[start:end]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def save(self, directory: str, prefix: str):
+        np.save(
+            os.path.join(directory, f"{prefix}.texts.npy"),
+            np.frombuffer(bytes(self.buffer), dtype=np.uint8),
+        )
+        np.save(
+            os.path.join(directory, f"{prefix}.text_offsets.npy"),
+            np.asarray(self.offsets, dtype=np.int64),
+        )
+
+    @classmethod
+    def load(
+        cls, directory: str, prefix: str, mmap_mode: Optional[str] = "r"
+    ) -> "CompactTexts":
+        texts = cls()
+        texts.buffer = np.load(
+            os.path.join(directory, f"{prefix}.texts.npy"), mmap_mode=mmap_mode
+        )
+        texts.offsets = np.load(
+            os.path.join(directory, f"{prefix}.text_offsets.npy"), mmap_mode=mmap_mode
+        )
+        return texts
+
+
+class CompactInstances(metaclass=ABCMeta):
+    def __init__(self):
+        """ A list like container of instances that are stored in a
+        ``CompactTokenStore``. Only indexing, iteration, ``len`` and ``append``
+        are supported
+        """
+        self.store = CompactTokenStore()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self.get_instance(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Index {idx} is out of range")
+        return self.get_instance(idx)
+
+    def __iter__(self) -> Iterator:
+        for idx in range(len(self)):
+            yield self.get_instance(idx)
+
+    def get_num_tokens(self, idx: int, namespace: str) -> int:
+        """ Returns the number of tokens of an instance without making the instance
+
+        Parameters
+        ----------
+        idx : int
+            The index of the instance
+        namespace : str
+            The namespace of the tokens
+
+        Returns
+        -------
+        int
+        """
+        return self.store.get_num_tokens(idx, namespace)
+
+    @abstractmethod
+    def append(self, instance: Union[Line, Label, SeqLabel]):
+        """ Stores the tokens of an instance at the end
+
+        Parameters
+        ----------
+        instance : Union[Line, Label, SeqLabel]
+            The instance that is stored
+        """
+        pass
+
+    @abstractmethod
+    def get_instance(self, idx: int) -> Union[Line, Label, SeqLabel]:
+        """ Makes a new instance from the stored tokens
+
+        Parameters
+        ----------
+        idx : int
+            The index of the instance
+
+        Returns
+        -------
+        Union[Line, Label, SeqLabel]
+        """
+        pass
+
+    def save(self, directory: str, prefix: str):
+        self.store.save(directory=directory, prefix=prefix)
+
+    @classmethod
+    def load(cls, directory: str, prefix: str, mmap_mode: Optional[str] = "r"):
+        instances = cls()
+        instances.store = CompactTokenStore.load(
+            directory=directory, prefix=prefix, mmap_mode=mmap_mode
+        )
+        return instances
+
+
+class CompactLines(CompactInstances):
+    def __init__(self):
+        """ Stores the text and the tokens of many lines. Indexing returns a new
+        ``Line`` every time
+        """
+        super(CompactLines, self).__init__()
+        self.texts = CompactTexts()
+
+    def append(self, line: Line):
+        self.texts.append(line.text)
+        self.store.append(line.tokens)
+
+    def get_instance(self, idx: int) -> Line:
+        line = Line.from_tokens(text=self.texts[idx], tokens=self.store.get_tokens(idx))
+        line.numericalized.update(self.store.get_indices(idx))
+        return line
+
+    def save(self, directory: str, prefix: str):
+        super(CompactLines, self).save(directory=directory, prefix=prefix)
+        self.texts.save(directory=directory, prefix=prefix)
+
+    @classmethod
+    def load(cls, directory: str, prefix: str, mmap_mode: Optional[str] = "r"):
+        lines = super(CompactLines, cls).load(
+            directory=directory, prefix=prefix, mmap_mode=mmap_mode
+        )
+        lines.texts = CompactTexts.load(
+            directory=directory, prefix=prefix, mmap_mode=mmap_mode
+        )
+        return lines
+
+
+class CompactLabels(CompactInstances):
+    def __init__(self):
+        """ Stores the text and the namespace of many labels. Indexing returns a new
+        ``Label`` every time
+        """
+        super(CompactLabels, self).__init__()
+
+    def append(self, label: Label):
+        self.store.append({label.namespace: [label.text]})
+
+    def get_instance(self, idx: int) -> Label:
+        # the label has a token only in its own namespace
+        namespace_tokens = self.store.get_tokens(idx)
+        namespace = next(
+            namespace for namespace, tokens in namespace_tokens.items() if tokens
+        )
+        label = Label(text=namespace_tokens[namespace][0], namespace=namespace)
+        label.numericalized.update(self.store.get_indices(idx))
+        return label
+
+
+class CompactSeqLabels(CompactInstances):
+    def __init__(self):
+        """ Stores the labels of many sequence labels. Indexing returns a new
+        ``SeqLabel`` every time
+        """
+        super(CompactSeqLabels, self).__init__()
+
+    def append(self, label: SeqLabel):
+        self.store.append(label.tokens)
+
+    def get_instance(self, idx: int) -> SeqLabel:
+        label = SeqLabel(labels=self.store.get_tokens(idx))
+        label.numericalized.update(self.store.get_indices(idx))
+        return label
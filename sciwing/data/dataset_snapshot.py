@@ -0,0 +1,288 @@
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
+from torch.utils.data import Dataset
+from sciwing.data.label import Label
+from sciwing.data.compact_storage import (
+    CompactInstances,
+    CompactLines,
+    CompactLabels,
+    CompactSeqLabels,
+)
+from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
+from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
+from sciwing.numericalizers.numericalizer import Numericalizer
+from sciwing.vocab.vocab import Vocab, COMPACT_VOCAB_EXTENSION
+
+# increase this when the files of a snapshot change
+SNAPSHOT_VERSION = 1
+SPLITS = ["train", "dev", "test"]
+
+
+class SnapshotDataset(Dataset):
+    def __init__(
+        self,
+        lines: CompactLines,
+        labels: CompactInstances,
+        tokenizers: Dict[str, BaseTokenizer],
+    ):
+        """ A dataset whose lines and labels are read from a snapshot
+
+        Parameters
+        ----------
+        lines : CompactLines
+            The lines of the dataset
+        labels : CompactInstances
+            The labels of the dataset
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizers that made the snapshot. They are used to make new lines
+        """
+        self.lines = lines
+        self.labels = labels
+        self.tokenizers = tokenizers
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, idx):
+        return self.lines[idx], self.labels[idx]
+
+
+class DatasetSnapshot:
+    def __init__(self, snapshot_dir: str):
+        """ A tokenized and numericalized copy of the train, dev and test datasets
+        and the vocabs of a ``DatasetsManager`` that is stored on the disk.
+        The token arrays are memory mapped when the snapshot is loaded. So making the
+        datasets again does not need any tokenization.
+
+        Use ``from_config`` to get the snapshot for a set of files and options
+
+        Parameters
+        ----------
+        snapshot_dir : str
+            The directory of the snapshot
+        """
+        self.snapshot_dir = snapshot_dir
+        self.meta_filename = os.path.join(self.snapshot_dir, "meta.json")
+
+    @classmethod
+    def from_config(
+        cls,
+        snapshots_dir: str,
+        filenames: List[str],
+        tokenizers: Dict[str, BaseTokenizer],
+        namespace_vocab_options: Dict[str, Dict[str, Any]],
+        namespace_numericalizer_map: Dict[str, BaseNumericalizer],
+        dataset_config: Optional[Dict[str, Any]] = None,
+    ) -> "DatasetSnapshot":
+        """ Returns the snapshot for the files and the options. The snapshot is
+        keyed by the contents of the files, the tokenizers, the vocab options,
+        the numericalizers and the dataset config. A change in any of them
+        results in a different snapshot
+
+        Parameters
+        ----------
+        snapshots_dir : str
+            The directory where all the snapshots are stored
+        filenames : List[str]
+            The train, dev and test files
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizer of every namespace
+        namespace_vocab_options : Dict[str, Dict[str, Any]]
+            The vocab options of every namespace
+        namespace_numericalizer_map : Dict[str, BaseNumericalizer]
+            The numericalizer of every namespace
+        dataset_config : Optional[Dict[str, Any]]
+            Any other option that changes the datasets, such as the class of the
+            dataset
+
+        Returns
+        -------
+        DatasetSnapshot
+        """
+        config = {
+            "version": SNAPSHOT_VERSION,
+            "files": [cls.get_file_hash(filename) for filename in filenames],
+            "tokenizers": {
+                namespace: cls.describe(tokenizer)
+                for namespace, tokenizer in tokenizers.items()
+            },
+            "namespace_vocab_options": namespace_vocab_options,
+            "numericalizers": {
+                namespace: numericalizer.__class__.__name__
+                for namespace, numericalizer in namespace_numericalizer_map.items()
+            },
+            "dataset_config": dataset_config or {},
+        }
+        config = json.dumps(config, sort_keys=True, default=cls.describe)
+        key = hashlib.sha1(config.encode("utf-8")).hexdigest()
+        return cls(snapshot_dir=os.path.join(snapshots_dir, key))
+
+    @staticmethod
+    def get_file_hash(filename: str) -> str:
+        sha1 = hashlib.sha1()
+        with open(filename, "rb") as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b""):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    @staticmethod
+    def describe(obj: Any) -> Dict[str, Any]:
+        """ Describes an object using its class and its attributes that are strings,
+        numbers or booleans
+
+        Parameters
+        ----------
+        obj : Any
+
+        Returns
+        -------
+        Dict[str, Any]
+        """
+        description = {"class": obj.__class__.__name__}
+        if callable(obj) and hasattr(obj, "__qualname__"):
+            description["name"] = obj.__qualname__
+        for name, value in getattr(obj, "__dict__", {}).items():
+            if name.startswith("_"):
+                continue
+            if isinstance(value, (str, int, float, bool)):
+                description[name] = value
+        return description
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.meta_filename)
+
+    def save(
+        self,
+        datasets: List[Dataset],
+        namespace_to_vocab: Dict[str, Vocab],
+        namespace_to_numericalizer: Dict[str, BaseNumericalizer],
+    ):
+        """ Writes the datasets and the vocabs. The snapshot is written to a temporary
+        directory first and then renamed. So a snapshot is either complete or absent
+
+        Parameters
+        ----------
+        datasets : List[Dataset]
+            The train, dev and test datasets
+        namespace_to_vocab : Dict[str, Vocab]
+            The vocab of every namespace
+        namespace_to_numericalizer : Dict[str, BaseNumericalizer]
+            The numericalizer of every namespace. The vocab indices of the tokens
+            are stored for namespaces that use a ``Numericalizer``
+        """
+        numericalized_vocabs = {
+            namespace: namespace_to_vocab[namespace]
+            for namespace, numericalizer in namespace_to_numericalizer.items()
+            if isinstance(numericalizer, Numericalizer)
+            and namespace in namespace_to_vocab
+        }
+
+        tmp_dir = f"{self.snapshot_dir}.tmp{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        label_class = None
+        for split, dataset in zip(SPLITS, datasets):
+            lines = self.get_compact(dataset.lines, CompactLines)
+            if isinstance(dataset.labels[0], Label):
+                label_class = CompactLabels
+            else:
+                label_class = CompactSeqLabels
+            labels = self.get_compact(dataset.labels, label_class)
+            for prefix, instances in [("lines", lines), ("labels", labels)]:
+                instances.store.numericalize(numericalized_vocabs)
+                instances.save(directory=tmp_dir, prefix=f"{split}.{prefix}")
+
+        vocab_filenames = {}
+        for namespace_idx, (namespace, vocab) in enumerate(namespace_to_vocab.items()):
+            vocab_filename = f"vocab.{namespace_idx}{COMPACT_VOCAB_EXTENSION}"
+            vocab.save_to_file(os.path.join(tmp_dir, vocab_filename))
+            vocab_filenames[namespace] = vocab_filename
+
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "label_class": label_class.__name__,
+            "vocab_filenames": vocab_filenames,
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as fp:
+            json.dump(meta, fp)
+
+        try:
+            os.rename(tmp_dir, self.snapshot_dir)
+        except OSError:
+            # another process has written the same snapshot
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def get_compact(instances, compact_class) -> CompactInstances:
+        if isinstance(instances, compact_class):
+            return instances
+        compact_instances = compact_class()
+        for instance in instances:
+            compact_instances.append(instance)
+        return compact_instances
+
+    def load_datasets(
+        self, tokenizers: Dict[str, BaseTokenizer]
+    ) -> Tuple[SnapshotDataset, SnapshotDataset, SnapshotDataset]:
+        """ Reads the train, dev and test datasets from the snapshot
+
+        Parameters
+        ----------
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizers of the datasets
+
+        Returns
+        -------
+        Tuple[SnapshotDataset, SnapshotDataset, SnapshotDataset]
+        """
+        with open(self.meta_filename, "r") as fp:
+            meta = json.load(fp)
+
+        label_class = {
+            "CompactLabels": CompactLabels,
+            "CompactSeqLabels": CompactSeqLabels,
+        }[meta["label_class"]]
+
+        datasets = []
+        for split in SPLITS:
+            lines = CompactLines.load(
+                directory=self.snapshot_dir, prefix=f"{split}.lines"
+            )
+            labels = label_class.load(
+                directory=self.snapshot_dir, prefix=f"{split}.labels"
+            )
+            datasets.append(
+                SnapshotDataset(lines=lines, labels=labels, tokenizers=tokenizers)
+            )
+        return tuple(datasets)
+
+    def load_vocab(
+        self, namespace_vocab_options: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Vocab]:
+        """ Reads the vocab of every namespace from the snapshot
+
+        Parameters
+        ----------
+        namespace_vocab_options : Optional[Dict[str, Dict[str, Any]]]
+            The vocab options of every namespace. The ``store_location`` of the
+            vocabs is taken from here
+
+        Returns
+        -------
+        Dict[str, Vocab]
+        """
+        namespace_vocab_options = namespace_vocab_options or {}
+        with open(self.meta_filename, "r") as fp:
+            meta = json.load(fp)
+
+        namespace_to_vocab = {}
+        for namespace, filename in meta["vocab_filenames"].items():
+            vocab = Vocab.load_from_file(os.path.join(self.snapshot_dir, filename))
+            vocab.store_location = namespace_vocab_options.get(namespace, {}).get(
+                "store_location"
+            )
+            namespace_to_vocab[namespace] = vocab
+        return namespace_to_vocab
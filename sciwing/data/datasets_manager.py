@@ -6,13 +6,20 @@ from torch.utils.data import Dataset
 from sciwing.vocab.vocab import Vocab
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 from sciwing.data.line import Line
-from typing import Dict, List, Any
-from collections import defaultdict
+from sciwing.data.dataset_snapshot import DatasetSnapshot
+from typing import Dict, List, Any, Callable, Optional
+from collections import defaultdict, Counter
+import sciwing.constants as constants
 import wasabi
-import itertools
+
+PATHS = constants.PATHS
+DATASETS_CACHE_DIR = PATHS["DATASETS_CACHE_DIR"]
 
 
 class DatasetsManager:
+    # the snapshot of the datasets. It is set by load_or_build_datasets
+    snapshot: Optional[DatasetSnapshot] = None
+
     def __init__(
         self,
         train_dataset: Dataset,
@@ -21,6 +28,7 @@ class DatasetsManager:
         namespace_vocab_options: Dict[str, Dict[str, Any]] = None,
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size: int = 32,
+        namespace_to_vocab: Dict[str, Vocab] = None,
     ):
         """
 
@@ -40,6 +48,9 @@ class DatasetsManager:
             be passed down to the Numericalizer Instances
         batch_size: int
             Batch size for loading the datasets
+        namespace_to_vocab: Dict[str, Vocab]
+            The vocab of every namespace, for example from a dataset snapshot.
+            If this is given, the vocabs are not built from the train dataset
         """
         self.train_dataset = train_dataset
         self.dev_dataset = dev_dataset
@@ -59,7 +70,11 @@ class DatasetsManager:
         ] = namespace_numericalizer_map
 
         # Build vocab using the datasets passed
-        self.namespace_to_vocab: Dict[str, Vocab] = self.build_vocab()
+        if namespace_to_vocab is None:
+            self.namespace_to_vocab: Dict[str, Vocab] = self.build_vocab()
+        else:
+            self.namespace_to_vocab = namespace_to_vocab
+            self.label_namespaces = list(self.train_dataset.labels[0].tokens.keys())
 
         # sets the vocab for the appropriate numericalizers
         self.namespace_to_numericalizer = self.build_numericalizers()
@@ -69,6 +84,69 @@ class DatasetsManager:
             vocab = self.namespace_to_vocab[namespace]
             self.num_labels[namespace] = vocab.get_vocab_len()
 
+        # a new snapshot is saved once the vocabs are built
+        if self.snapshot is not None and not self.snapshot.exists():
+            self.snapshot.save(
+                datasets=[self.train_dataset, self.dev_dataset, self.test_dataset],
+                namespace_to_vocab=self.namespace_to_vocab,
+                namespace_to_numericalizer=self.namespace_to_numericalizer,
+            )
+
+    def load_or_build_datasets(
+        self,
+        build_dataset: Callable[[str], Dataset],
+        dataset_config: Dict[str, Any],
+        use_snapshots: bool = False,
+        snapshots_dir: str = DATASETS_CACHE_DIR,
+    ) -> Optional[Dict[str, Vocab]]:
+        """ Sets the train, dev and test datasets of ``train_filename``,
+        ``dev_filename`` and ``test_filename``. They are loaded from the snapshot
+        of the files and the options when it exists. Otherwise they are built and
+        the snapshot is saved at the end of ``__init__``.
+
+        It is called by the managers before ``DatasetsManager.__init__``, after
+        they set the filenames, the tokenizers, the vocab options and the
+        numericalizers
+
+        Parameters
+        ----------
+        build_dataset : Callable[[str], Dataset]
+            Builds the dataset of a file
+        dataset_config : Dict[str, Any]
+            Any other option that changes the datasets, such as the class of the
+            dataset. It is a part of the key of the snapshot
+        use_snapshots : bool
+            If False, the datasets are always built and no snapshot is stored
+        snapshots_dir : str
+            The directory where the snapshots are stored
+
+        Returns
+        -------
+        Optional[Dict[str, Vocab]]
+            The vocabs of the snapshot. None if the vocabs have to be built
+        """
+        filenames = [self.train_filename, self.dev_filename, self.test_filename]
+        self.snapshot = None
+        if use_snapshots:
+            self.snapshot = DatasetSnapshot.from_config(
+                snapshots_dir=snapshots_dir,
+                filenames=filenames,
+                tokenizers=self.tokenizers,
+                namespace_vocab_options=self.namespace_vocab_options,
+                namespace_numericalizer_map=self.namespace_numericalizer_map,
+                dataset_config=dataset_config,
+            )
+
+        if self.snapshot is not None and self.snapshot.exists():
+            datasets = self.snapshot.load_datasets(tokenizers=self.tokenizers)
+            self.train_dataset, self.dev_dataset, self.test_dataset = datasets
+            return self.snapshot.load_vocab(self.namespace_vocab_options)
+
+        self.train_dataset, self.dev_dataset, self.test_dataset = [
+            build_dataset(filename) for filename in filenames
+        ]
+        return None
+
     def build_vocab(self) -> Dict[str, Vocab]:
         """ Returns a vocab for each of the namespace
         The namespace identifies the kind of tokens
@@ -85,24 +163,32 @@ class DatasetsManager:
         lines = self.train_dataset.lines
         labels = self.train_dataset.labels
 
-        namespace_to_instances: Dict[str, List[List[str]]] = defaultdict(list)
-        for line in lines:
-            namespace_tokens = line.tokens
-            for namespace, tokens in namespace_tokens.items():
-                namespace_to_instances[namespace].append(tokens)
-        for label in labels:
-            namespace_tokens = label.tokens
-            for namespace, tokens in namespace_tokens.items():
-                namespace_to_instances[namespace].append(tokens)
-
-        self.label_namespaces = list(labels[0].tokens.keys())
+        # The tokens are counted in a single pass over the examples. Only the
+        # counts are kept in memory. So the lines of compact and lazy datasets
+        # are made one at a time and thrown away
+        namespace_to_counts: Dict[str, Counter] = defaultdict(Counter)
+        for line, label in zip(lines, labels):
+            for instance in (line, label):
+                for namespace, tokens in instance.tokens.items():
+                    preprocessing_pipeline = self.namespace_vocab_options.get(
+                        namespace, {}
+                    ).get("preprocessing_pipeline")
+                    Vocab.count_tokens(
+                        [tokens],
+                        preprocessing_pipeline=preprocessing_pipeline,
+                        counter=namespace_to_counts[namespace],
+                    )
+
+        # the label of the last example gives the label namespaces without
+        # making the first example again
+        self.label_namespaces = list(label.tokens.keys())
 
         namespace_to_vocab: Dict[str, Vocab] = {}
 
-        # This always builds a vocab from instances
-        for namespace, instances in namespace_to_instances.items():
+        for namespace, token_counts in namespace_to_counts.items():
             namespace_to_vocab[namespace] = Vocab(
-                instances=instances, **self.namespace_vocab_options.get(namespace, {})
+                token_counts=token_counts,
+                **self.namespace_vocab_options.get(namespace, {}),
             )
             namespace_to_vocab[namespace].build_vocab()
         return namespace_to_vocab
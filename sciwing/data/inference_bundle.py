@@ -0,0 +1,253 @@
+import os
+import json
+import shutil
+import inspect
+import importlib
+import wasabi
+from typing import Dict, List, Any, Optional
+from sciwing.data.datasets_manager import DatasetsManager
+from sciwing.data.line import Line
+from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
+from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
+from sciwing.vocab.vocab import Vocab, COMPACT_VOCAB_EXTENSION
+
+# increase this when the files of a bundle change
+BUNDLE_VERSION = 1
+
+
+class InferenceDatasetsManager(DatasetsManager):
+    def __init__(
+        self,
+        namespace_to_vocab: Dict[str, Vocab],
+        namespace_to_numericalizer: Dict[str, BaseNumericalizer],
+        label_namespaces: List[str],
+        tokenizers: Dict[str, BaseTokenizer],
+        batch_size: int = 32,
+    ):
+        """ A datasets manager for inference that has the vocabs, the numericalizers
+        and the tokenizers of a trained model but no datasets. It is usually loaded
+        from an ``InferenceBundle``
+
+        Parameters
+        ----------
+        namespace_to_vocab : Dict[str, Vocab]
+            The vocab of every namespace
+        namespace_to_numericalizer : Dict[str, BaseNumericalizer]
+            The numericalizer of every namespace. Their vocabulary is already set
+        label_namespaces : List[str]
+            The namespaces of the labels
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizers that make new lines
+        batch_size : int
+            Batch size for inference
+        """
+        # the datasets are not needed and DatasetsManager.__init__ is not called
+        self.train_dataset = None
+        self.dev_dataset = None
+        self.test_dataset = None
+        self.namespace_vocab_options = {}
+        self.batch_size = batch_size
+        self.tokenizers = tokenizers
+        self.msg_printer = wasabi.Printer()
+
+        self.namespace_to_vocab = namespace_to_vocab
+        self.namespace_to_numericalizer = namespace_to_numericalizer
+        self.label_namespaces = label_namespaces
+        self.namespaces = list(self.namespace_to_vocab.keys())
+        self.num_labels = {
+            namespace: self.namespace_to_vocab[namespace].get_vocab_len()
+            for namespace in self.label_namespaces
+        }
+
+    def make_line(self, line: str) -> Line:
+        return Line(text=line, tokenizers=self.tokenizers)
+
+
+class InferenceBundle:
+    def __init__(self, bundle_dir: str):
+        """ Everything that is needed to run a trained model without the datasets:
+        the model weights, the vocab and the numericalizer of every namespace, the
+        configuration of the tokenizers and the label maps.
+
+        Use ``export`` to write a bundle for a datasets manager and
+        ``get_datasets_manager`` to load an ``InferenceDatasetsManager`` from it
+
+        Parameters
+        ----------
+        bundle_dir : str
+            The directory of the bundle
+        """
+        self.bundle_dir = str(bundle_dir)
+        self.meta_filename = os.path.join(self.bundle_dir, "bundle.json")
+        self._datasets_manager = None
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.meta_filename)
+
+    @classmethod
+    def export(
+        cls,
+        datasets_manager: DatasetsManager,
+        bundle_dir: str,
+        model_filepath: Optional[str] = None,
+    ) -> "InferenceBundle":
+        """ Writes the bundle for a datasets manager
+
+        Parameters
+        ----------
+        datasets_manager : DatasetsManager
+            The datasets manager that the model was trained with
+        bundle_dir : str
+            The directory where the bundle is written
+        model_filepath : Optional[str]
+            The model weights, usually ``best_model.pt`` of an experiment. They are
+            copied into the bundle
+
+        Returns
+        -------
+        InferenceBundle
+        """
+        bundle_dir = str(bundle_dir)
+        os.makedirs(bundle_dir, exist_ok=True)
+        tokenizers = datasets_manager.train_dataset.tokenizers
+
+        vocab_filenames = {}
+        for namespace_idx, (namespace, vocab) in enumerate(
+            datasets_manager.namespace_to_vocab.items()
+        ):
+            vocab_filename = f"vocab.{namespace_idx}{COMPACT_VOCAB_EXTENSION}"
+            vocab.save_to_file(os.path.join(bundle_dir, vocab_filename))
+            vocab_filenames[namespace] = vocab_filename
+
+        model_filename = None
+        if model_filepath is not None:
+            model_filename = os.path.basename(str(model_filepath))
+            destination = os.path.join(bundle_dir, model_filename)
+            if os.path.abspath(str(model_filepath)) != os.path.abspath(destination):
+                shutil.copyfile(str(model_filepath), destination)
+
+        meta = {
+            "version": BUNDLE_VERSION,
+            "label_namespaces": datasets_manager.label_namespaces,
+            "tokenizers": {
+                namespace: cls.get_object_config(tokenizer)
+                for namespace, tokenizer in tokenizers.items()
+            },
+            "numericalizers": {
+                namespace: cls.get_object_config(numericalizer)
+                for namespace, numericalizer in (
+                    datasets_manager.namespace_to_numericalizer.items()
+                )
+            },
+            "vocab_filenames": vocab_filenames,
+            "label_maps": {
+                namespace: datasets_manager.get_label_idx_mapping(namespace)
+                for namespace in datasets_manager.label_namespaces
+            },
+            "model_filename": model_filename,
+        }
+
+        # the meta file is written last. A bundle without it is not complete
+        with open(os.path.join(bundle_dir, "bundle.json"), "w") as fp:
+            json.dump(meta, fp, indent=2)
+
+        return cls(bundle_dir=bundle_dir)
+
+    @staticmethod
+    def get_object_config(obj: Any) -> Dict[str, Any]:
+        """ Describes how to make an object again. The arguments of the constructor
+        are read from the attributes of the same name that are strings, numbers
+        or booleans
+
+        Parameters
+        ----------
+        obj : Any
+            A tokenizer or a numericalizer
+
+        Returns
+        -------
+        Dict[str, Any]
+            The module, the class and the keyword arguments of the object
+        """
+        kwargs = {}
+        parameters = inspect.signature(obj.__class__.__init__).parameters
+        for name in parameters:
+            value = getattr(obj, name, None)
+            if isinstance(value, (str, int, float, bool)):
+                kwargs[name] = value
+        return {
+            "module": obj.__class__.__module__,
+            "class": obj.__class__.__name__,
+            "kwargs": kwargs,
+        }
+
+    @staticmethod
+    def make_object(config: Dict[str, Any]) -> Any:
+        module = importlib.import_module(config["module"])
+        cls = getattr(module, config["class"])
+        return cls(**config["kwargs"])
+
+    def get_meta(self) -> Dict[str, Any]:
+        if not self.exists():
+            raise FileNotFoundError(
+                f"No inference bundle is found in {self.bundle_dir}. Export it next "
+                f"to the model weights with `sciwing export-bundle <toml_filename>` "
+                f"or InferenceBundle.export"
+            )
+        with open(self.meta_filename, "r") as fp:
+            return json.load(fp)
+
+    @property
+    def model_filepath(self) -> Optional[str]:
+        model_filename = self.get_meta()["model_filename"]
+        if model_filename is None:
+            return None
+        return os.path.join(self.bundle_dir, model_filename)
+
+    def get_datasets_manager(self) -> InferenceDatasetsManager:
+        """ Loads the datasets manager from the bundle. It is loaded once and
+        the same manager is returned again. The label vocabs are checked against
+        the label maps of the bundle
+
+        Returns
+        -------
+        InferenceDatasetsManager
+        """
+        if self._datasets_manager is not None:
+            return self._datasets_manager
+
+        meta = self.get_meta()
+        namespace_to_vocab = {
+            namespace: Vocab.load_from_file(os.path.join(self.bundle_dir, filename))
+            for namespace, filename in meta["vocab_filenames"].items()
+        }
+        for vocab in namespace_to_vocab.values():
+            # the vocab is not written back to the bundle
+            vocab.store_location = None
+
+        # the model predicts the label indices of the label maps it was trained with
+        for namespace, label_map in meta["label_maps"].items():
+            if namespace_to_vocab[namespace].token2idx != label_map:
+                raise ValueError(
+                    f"The vocab of the label namespace {namespace} in "
+                    f"{self.bundle_dir} does not match the label map of the bundle"
+                )
+
+        namespace_to_numericalizer = {}
+        for namespace, config in meta["numericalizers"].items():
+            numericalizer = self.make_object(config)
+            numericalizer.vocabulary = namespace_to_vocab[namespace]
+            namespace_to_numericalizer[namespace] = numericalizer
+
+        tokenizers = {
+            namespace: self.make_object(config)
+            for namespace, config in meta["tokenizers"].items()
+        }
+
+        self._datasets_manager = InferenceDatasetsManager(
+            namespace_to_vocab=namespace_to_vocab,
+            namespace_to_numericalizer=namespace_to_numericalizer,
+            label_namespaces=meta["label_namespaces"],
+            tokenizers=tokenizers,
+        )
+        return self._datasets_manager
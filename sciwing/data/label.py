@@ -1,5 +1,5 @@
 from sciwing.data.token import Token
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Any
 from collections import defaultdict
 
 
@@ -21,6 +21,10 @@ class Label:
         self.tokens: Dict[str, List[Token]] = defaultdict(list)
         self.add_token(token=self.text, namespace=namespace)
 
+        # the label index of a dataset snapshot, set by the compact labels and
+        # reused by pad_instances
+        self.numericalized: Dict[str, Any] = {}
+
     @property
     def text(self):
         return self._text
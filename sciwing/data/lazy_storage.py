@@ -0,0 +1,148 @@
+"""
+Lazy storage of the examples of a dataset file.
+Only the byte offset of every line of the file is kept in memory. An example is
+read from the file and tokenized only when it is accessed.
+"""
+import os
+from array import array
+from typing import Any, Callable, Iterator, Tuple
+
+
+class LineOffsets:
+    def __init__(self, filename: str, skip_empty: bool = True):
+        """ An index of the byte offsets where the lines of a file start.
+        The file is read once to build the index. A line is read again using a
+        seek to its offset
+
+        Parameters
+        ----------
+        filename : str
+            The file that is indexed
+        skip_empty : bool
+            If True, the lines that only have whitespace are not indexed
+        """
+        self.filename = filename
+        self.skip_empty = skip_empty
+        self.offsets = self.build_offsets()
+        self.fp = None
+        self.fp_pid = None
+
+    def build_offsets(self) -> array:
+        offsets = array("q")
+        offset = 0
+        with open(self.filename, "rb") as fp:
+            for line in fp:
+                if not self.skip_empty or line.strip():
+                    offsets.append(offset)
+                offset += len(line)
+        return offsets
+
+    def get_file(self):
+        # every process opens its own file handle. The DataLoader workers
+        # are forked after the dataset is made
+        if self.fp is None or self.fp_pid != os.getpid():
+            self.fp = open(self.filename, "rb")
+            self.fp_pid = os.getpid()
+        return self.fp
+
+    def get_text(self, idx: int) -> str:
+        """ Returns the text of a line
+
+        Parameters
+        ----------
+        idx : int
+            The index of the line
+
+        Returns
+        -------
+        str
+            The line without the new line character
+        """
+        fp = self.get_file()
+        fp.seek(self.offsets[idx])
+        return fp.readline().decode("utf-8").rstrip("\r\n")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["fp"] = None
+        state["fp_pid"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+class LazyExamples:
+    def __init__(self, filename: str, parse_example: Callable[[str], Tuple[Any, ...]]):
+        """ The examples of a file that are made when they are accessed.
+        ``lines`` and ``labels`` are list like views of the examples that can be
+        used in place of a list of lines and a list of labels
+
+        Parameters
+        ----------
+        filename : str
+            The file with one example in every non empty line
+        parse_example : Callable[[str], Tuple[Any, ...]]
+            Makes an example such as ``(line, label)`` from a line of the file
+        """
+        self.filename = filename
+        self.parse_example = parse_example
+        self.line_offsets = LineOffsets(filename=filename)
+
+        # the line and the label of an example are usually accessed one after
+        # the other. The last example is kept so that it is parsed only once
+        self.last_idx = None
+        self.last_example = None
+
+    def __len__(self) -> int:
+        return len(self.line_offsets)
+
+    def __getitem__(self, idx: int) -> Tuple[Any, ...]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Index {idx} is out of range")
+        if idx != self.last_idx:
+            text = self.line_offsets.get_text(idx)
+            self.last_example = self.parse_example(text)
+            self.last_idx = idx
+        return self.last_example
+
+    @property
+    def lines(self) -> "LazyExamplesView":
+        return LazyExamplesView(examples=self, position=0)
+
+    @property
+    def labels(self) -> "LazyExamplesView":
+        return LazyExamplesView(examples=self, position=1)
+
+
+class LazyExamplesView:
+    def __init__(self, examples: LazyExamples, position: int):
+        """ A list like view of one part of the lazy examples. For example the lines
+
+        Parameters
+        ----------
+        examples : LazyExamples
+            The lazy examples
+        position : int
+            The position of the part in every example
+        """
+        self.examples = examples
+        self.position = position
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return self.examples[idx][self.position]
+
+    def __iter__(self) -> Iterator:
+        for idx in range(len(self)):
+            yield self[idx]
+
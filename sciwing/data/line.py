@@ -14,11 +14,45 @@ class Line:
         self.tokens: Dict[str, List[Any]] = defaultdict(list)
         self.namespaces = list(tokenizers.keys())
 
+        # indices of the tokens read from a dataset snapshot by the compact lines.
+        # pad_instances reuses them instead of numericalizing the tokens again
+        self.numericalized: Dict[str, Any] = {}
+
         for namespace, tokenizer in tokenizers.items():
             tokens = tokenizer.tokenize(text)
             for token in tokens:
                 self.add_token(token=token, namespace=namespace)
 
+    @classmethod
+    def from_tokens(
+        cls,
+        text: str,
+        tokens: Dict[str, List[str]],
+        tokenizers: Dict[str, BaseTokenizer] = None,
+    ) -> "Line":
+        """ Makes a line from tokens that are already available without running
+        the tokenizers again
+
+        Parameters
+        ----------
+        text : str
+            The text of the line
+        tokens : Dict[str, List[str]]
+            A mapping from the namespace to the tokens of the line in the namespace
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizers that produced the tokens. They are not run
+
+        Returns
+        -------
+        Line
+        """
+        line = cls(text=text, tokenizers={})
+        line.tokenizers = tokenizers or {}
+        for namespace, namespace_tokens in tokens.items():
+            line.add_tokens(tokens=namespace_tokens, namespace=namespace)
+        line.namespaces = list(tokens.keys())
+        return line
+
     def add_token(self, token: Union[Token, str], namespace: str):
         if isinstance(token, str):
             token = Token(token)
@@ -29,6 +63,17 @@ class Line:
         for token in tokens:
             self.add_token(token, namespace=namespace)
 
+    def __getstate__(self):
+        # the tokenizers are needed only while creating the line and can be
+        # expensive to pickle (spacy pipelines). Lines are pickled to be sent
+        # between the DataLoader workers and the main process
+        state = self.__dict__.copy()
+        state["tokenizers"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     @property
     def tokens(self):
         return self._tokens
@@ -0,0 +1,121 @@
+"""
+Parallel construction of the lines of a dataset.
+The examples are split into chunks that are processed in a pool of processes.
+The results are returned in the order of the examples, so a dataset built in
+parallel is the same as a dataset built in a single process.
+"""
+import functools
+import multiprocessing
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+from sciwing.data.line import Line
+from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
+from sciwing.utils.common import chunks
+
+# the tokenizers of a worker process. They are sent once when the worker starts
+# and not with every chunk
+WORKER_TOKENIZERS: Dict[str, BaseTokenizer] = {}
+
+
+def set_worker_tokenizers(tokenizers: Dict[str, BaseTokenizer]):
+    global WORKER_TOKENIZERS
+    WORKER_TOKENIZERS = tokenizers
+
+
+def run_with_worker_tokenizers(func: Callable, item: Any) -> Any:
+    return func(item, WORKER_TOKENIZERS)
+
+
+def parallel_map(
+    func: Callable[[Any, Dict[str, BaseTokenizer]], Any],
+    items: Iterable[Any],
+    tokenizers: Dict[str, BaseTokenizer],
+    num_processes: int = 1,
+    chunksize: int = 1,
+) -> Iterator[Any]:
+    """ Applies ``func(item, tokenizers)`` to every item. With more than one process,
+    the items are processed in a pool of processes. The results are always returned
+    in the order of the items
+
+    Parameters
+    ----------
+    func : Callable[[Any, Dict[str, BaseTokenizer]], Any]
+        A function that is defined at the top level of a module so that it can be
+        sent to the worker processes
+    items : Iterable[Any]
+        The items that are processed
+    tokenizers : Dict[str, BaseTokenizer]
+        The tokenizers that are passed to ``func``
+    num_processes : int
+        The number of processes
+    chunksize : int
+        The number of items that are sent to a worker process together
+
+    Returns
+    -------
+    Iterator[Any]
+        The results of ``func`` for every item
+    """
+    if num_processes <= 1:
+        for item in items:
+            yield func(item, tokenizers)
+        return
+
+    with multiprocessing.Pool(
+        processes=num_processes,
+        initializer=set_worker_tokenizers,
+        initargs=(tokenizers,),
+    ) as pool:
+        worker_func = functools.partial(run_with_worker_tokenizers, func)
+        for result in pool.imap(worker_func, items, chunksize=chunksize):
+            yield result
+
+
+def tokenize_batch(
+    texts: List[str], tokenizers: Dict[str, BaseTokenizer]
+) -> Dict[str, List[List[str]]]:
+    return {
+        namespace: tokenizer.tokenize_batch(texts)
+        for namespace, tokenizer in tokenizers.items()
+    }
+
+
+def make_lines(
+    texts: List[str],
+    tokenizers: Dict[str, BaseTokenizer],
+    batch_size: int = 1000,
+    num_processes: int = 1,
+) -> Iterator[Line]:
+    """ Makes the lines for the texts. The texts are tokenized in batches and the
+    batches are tokenized in a pool of processes when ``num_processes`` is more
+    than one. Only the tokens are sent back from the worker processes
+
+    Parameters
+    ----------
+    texts : List[str]
+        The texts of the lines
+    tokenizers : Dict[str, BaseTokenizer]
+        The mapping between the namespace and the tokenizer
+    batch_size : int
+        The number of texts that are tokenized together
+    num_processes : int
+        The number of processes that tokenize the batches
+
+    Returns
+    -------
+    Iterator[Line]
+        The lines in the order of the texts
+    """
+    batches = list(chunks(texts, batch_size))
+    batches_tokens = parallel_map(
+        func=tokenize_batch,
+        items=batches,
+        tokenizers=tokenizers,
+        num_processes=num_processes,
+    )
+    for batch, namespace_tokens in zip(batches, batches_tokens):
+        for idx, text in enumerate(batch):
+            tokens = {
+                namespace: batch_tokens[idx]
+                for namespace, batch_tokens in namespace_tokens.items()
+            }
+            yield Line.from_tokens(text=text, tokens=tokens, tokenizers=tokenizers)
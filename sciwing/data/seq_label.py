@@ -1,4 +1,4 @@
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Any
 from sciwing.data.token import Token
 from collections import defaultdict
 
@@ -16,6 +16,10 @@ class SeqLabel:
         self.namespace = list(self.labels.keys())
         self.tokens: Dict[str, List[Token]] = defaultdict(list)
 
+        # indices of the tags of a dataset snapshot, set by the compact labels.
+        # pad_instances uses them when every label of a batch has them
+        self.numericalized: Dict[str, Any] = {}
+
         for namespace, label in labels.items():
             self.add_tokens(tokens=label, namespace=namespace)
 
@@ -3,13 +3,28 @@ import torch
 
 
 class Token:
+    # a dataset has millions of tokens. Slots avoid a __dict__ for every token
+    __slots__ = ("_text", "_subtokens", "_embedding")
+
     def __init__(self, text: str):
         self.text = text
-        self.sub_tokens = []
+
+        # the sub tokens and the embeddings are created only when they are used
+        self._subtokens = None
 
         # a token can hold different kinds of embeddings
         # this is a mapping from the embedding_type to the embedding itself
-        self._embedding: Dict[str, torch.FloatTensor] = {}
+        self._embedding: Dict[str, torch.FloatTensor] = None
+
+    def __getstate__(self):
+        # the embeddings are computed again in every forward pass
+        # and are not sent between processes
+        return {"_text": self._text, "_subtokens": self._subtokens}
+
+    def __setstate__(self, state):
+        self._text = state["_text"]
+        self._subtokens = state["_subtokens"]
+        self._embedding = None
 
     @property
     def text(self):
@@ -24,13 +39,19 @@ class Token:
         return len(self.text)
 
     def set_embedding(self, name: str, value: torch.FloatTensor):
+        if self._embedding is None:
+            self._embedding = {}
         self._embedding[name] = value
 
     def get_embedding(self, name: str):
+        if self._embedding is None:
+            raise KeyError(name)
         return self._embedding[name]
 
     @property
     def sub_tokens(self):
+        if self._subtokens is None:
+            self._subtokens = []
         return self._subtokens
 
     @sub_tokens.setter
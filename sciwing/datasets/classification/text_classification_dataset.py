@@ -1,6 +1,9 @@
 from typing import Dict, List, Any
 from sciwing.data.line import Line
 from sciwing.data.label import Label
+from sciwing.data.compact_storage import CompactLines, CompactLabels
+from sciwing.data.lazy_storage import LazyExamples
+from sciwing.data.parallel import make_lines
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from torch.utils.data import Dataset
@@ -12,6 +15,10 @@ from sciwing.datasets.classification.base_text_classification import (
 )
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.utils.class_nursery import ClassNursery
+import sciwing.constants as constants
+
+PATHS = constants.PATHS
+DATASETS_CACHE_DIR = PATHS["DATASETS_CACHE_DIR"]
 
 
 class TextClassificationDataset(BaseTextClassification, Dataset):
@@ -24,30 +31,105 @@ class TextClassificationDataset(BaseTextClassification, Dataset):
     .
     """
 
+    # the number of lines that are tokenized together
+    tokenization_batch_size = 1000
+
     def __init__(
-        self, filename: str, tokenizers: Dict[str, BaseTokenizer] = WordTokenizer()
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer] = WordTokenizer(),
+        compact: bool = False,
+        lazy: bool = False,
+        num_processes: int = 1,
     ):
+        """
+
+        Parameters
+        ----------
+        filename : str
+            The file that stores the dataset
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        compact : bool
+            If True, the tokens of the lines and the labels are stored as arrays of
+            ids in ``CompactLines`` and ``CompactLabels``. The ``Line`` and ``Label``
+            objects are made only when an example is accessed. Use this for large
+            datasets that do not fit in memory as lines
+        lazy : bool
+            If True, only the byte offsets of the lines in the file are stored.
+            An example is read from the file and tokenized when it is accessed.
+            ``compact`` is ignored for lazy datasets
+        num_processes : int
+            The number of processes that tokenize the lines. With more than one
+            process, the file is split into batches of lines that are tokenized
+            in a pool of processes. The lines keep the order of the file
+        """
         super().__init__(filename, tokenizers)
         self.filename = filename
         self.tokenizers = tokenizers
+        self.compact = compact
+        self.lazy = lazy
+        self.num_processes = num_processes
         self.lines, self.labels = self.get_lines_labels()
 
     def get_lines_labels(self) -> (List[Line], List[Label]):
-        lines: List[Line] = []
-        labels: List[Label] = []
+        if self.lazy:
+            examples = LazyExamples(
+                filename=self.filename, parse_example=self.get_line_label
+            )
+            return examples.lines, examples.labels
+
+        lines: List[Line] = CompactLines() if self.compact else []
+        labels: List[Label] = CompactLabels() if self.compact else []
 
         with open(self.filename) as fp:
-            for line in fp:
-                line, label = line.split("###")
-                line = line.strip()
-                label = label.strip()
-                line_instance = Line(text=line, tokenizers=self.tokenizers)
-                label_instance = Label(text=label)
-                lines.append(line_instance)
-                labels.append(label_instance)
+            examples = [self.split_example(text) for text in fp]
+
+        # the lines are tokenized in batches
+        line_instances = make_lines(
+            texts=[line for line, _ in examples],
+            tokenizers=self.tokenizers,
+            batch_size=self.tokenization_batch_size,
+            num_processes=self.num_processes,
+        )
+        for line_instance, (_, label) in zip(line_instances, examples):
+            lines.append(line_instance)
+            labels.append(Label(text=label))
 
         return lines, labels
 
+    def split_example(self, text: str) -> (str, str):
+        """ Splits a line of the file into the text of the line and the label
+
+        Parameters
+        ----------
+        text : str
+            A line of the file of the form ``line###label``
+
+        Returns
+        -------
+        (str, str)
+        """
+        line, label = text.split("###")
+        return line.strip(), label.strip()
+
+    def get_line_label(self, text: str) -> (Line, Label):
+        """ Makes the line and the label from a line of the file
+
+        Parameters
+        ----------
+        text : str
+            A line of the file of the form ``line###label``
+
+        Returns
+        -------
+        (Line, Label)
+        """
+        line, label = self.split_example(text)
+        line_instance = Line(text=line, tokenizers=self.tokenizers)
+        label_instance = Label(text=label)
+        return line_instance, label_instance
+
     def __len__(self):
         return len(self.lines)
 
@@ -82,7 +164,44 @@ class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
         namespace_vocab_options: Dict[str, Dict[str, Any]] = None,
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size: int = 10,
+        compact: bool = False,
+        lazy: bool = False,
+        num_processes: int = 1,
+        use_snapshots: bool = False,
+        snapshots_dir: str = DATASETS_CACHE_DIR,
     ):
+        """
+
+        Parameters
+        ----------
+        train_filename : str
+            The train file
+        dev_filename : str
+            The dev file
+        test_filename : str
+            The test file
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        namespace_vocab_options : Dict[str, Dict[str, Any]]
+            The options of the vocab of every namespace
+        namespace_numericalizer_map : Dict[str, BaseNumericalizer]
+            The numericalizer of every namespace
+        batch_size : int
+            Batch size for loading the datasets
+        compact : bool
+            Stores the lines and labels as arrays of token ids
+        lazy : bool
+            Reads and tokenizes the examples from the files when they are accessed
+        num_processes : int
+            The number of processes that tokenize the lines of every dataset
+        use_snapshots : bool
+            If True, the tokenized and numericalized datasets and the vocabs are
+            stored in a snapshot in ``snapshots_dir``. The next time the same files
+            are used with the same options, they are loaded from the snapshot
+            without any tokenization
+        snapshots_dir : str
+            The directory where the snapshots are stored
+        """
         self.train_filename = train_filename
         self.dev_filename = dev_filename
         self.test_filename = test_filename
@@ -105,15 +224,21 @@ class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
         }
         self.namespace_numericalizer_map["label"] = Numericalizer()
         self.batch_size = batch_size
-
-        self.train_dataset = TextClassificationDataset(
-            filename=self.train_filename, tokenizers=self.tokenizers
-        )
-        self.dev_dataset = TextClassificationDataset(
-            filename=self.dev_filename, tokenizers=self.tokenizers
-        )
-        self.test_dataset = TextClassificationDataset(
-            filename=self.test_filename, tokenizers=self.tokenizers
+        self.compact = compact
+        self.lazy = lazy
+        self.num_processes = num_processes
+
+        namespace_to_vocab = self.load_or_build_datasets(
+            build_dataset=lambda filename: TextClassificationDataset(
+                filename=filename,
+                tokenizers=self.tokenizers,
+                compact=compact,
+                lazy=lazy,
+                num_processes=num_processes,
+            ),
+            dataset_config={"class": TextClassificationDataset.__name__},
+            use_snapshots=use_snapshots,
+            snapshots_dir=snapshots_dir,
         )
 
         super(TextClassificationDatasetManager, self).__init__(
@@ -123,4 +248,5 @@ class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            namespace_to_vocab=namespace_to_vocab,
         )
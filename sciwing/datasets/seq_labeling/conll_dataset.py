@@ -6,20 +6,31 @@ from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from sciwing.numericalizers.numericalizer import Numericalizer
 from sciwing.data.line import Line
 from sciwing.data.seq_label import SeqLabel
+from sciwing.data.compact_storage import CompactLines, CompactSeqLabels
+from sciwing.data.parallel import make_lines
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.datasets.seq_labeling.base_seq_labeling import BaseSeqLabelingDataset
 from torch.utils.data import Dataset
 import copy
+import sciwing.constants as constants
+
+PATHS = constants.PATHS
+DATASETS_CACHE_DIR = PATHS["DATASETS_CACHE_DIR"]
 
 
 class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
+    # the number of sentences that are tokenized together
+    tokenization_batch_size = 1000
+
     def __init__(
         self,
         filename: str,
         tokenizers: Dict[str, BaseTokenizer],
         column_names: List[str] = None,
         train_only: Optional[str] = None,
+        compact: bool = False,
+        num_processes: int = 1,
     ):
         """ Dataset in CoNLL format
 
@@ -35,6 +46,14 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
             You can pass one of ["pos", "dep", "ner"]
             If this is passed only those columns in CoNLL will be used
             And appropriate column names will be chosen
+        compact: bool
+            If True, the tokens of the lines and the labels are stored as arrays of
+            ids in ``CompactLines`` and ``CompactSeqLabels``. The ``Line`` and
+            ``SeqLabel`` objects are made only when an example is accessed
+        num_processes: int
+            The number of processes that tokenize the sentences. With more than one
+            process, the sentences are split into batches that are tokenized in a
+            pool of processes. The sentences keep the order of the file
         """
         super().__init__(filename, tokenizers)
         if column_names is None:
@@ -45,11 +64,18 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
         self.tokenizers = tokenizers
         self.column_names = column_names
         self.train_only = train_only
+        self.compact = compact
+        self.num_processes = num_processes
         self.lines, self.labels = self.get_lines_labels()
 
     def get_lines_labels(self) -> (List[Line], List[SeqLabel]):
-        lines: List[Line] = []
-        labels: List[SeqLabel] = []
+        lines: List[Line] = CompactLines() if self.compact else []
+        labels: List[SeqLabel] = CompactSeqLabels() if self.compact else []
+
+        # the sentences and their labels are read first. The sentences
+        # are then tokenized in batches
+        sentences: List[str] = []
+        sentences_labels: List[List[List[str]]] = []
         with open(self.filename) as fp:
             lines_: List[str] = []
             labels_: List[List[str]] = []  # every list is a label for one namespace
@@ -66,26 +92,29 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
                     next(fp)
                 else:
                     if len(lines_) > 0 and len(labels_) > 0:
-                        sentence = " ".join(lines_)
-                        line, label = self._form_line_label(
-                            text=sentence, labels=labels_
-                        )
-                        lines.append(line)
-                        labels.append(label)
+                        sentences.append(" ".join(lines_))
+                        sentences_labels.append(labels_)
                         lines_ = []
                         labels_ = []
             # handle the case when there is only one example without any new line
             else:
-                if len(lines_) > 0 and len(lines) == 0:
-                    text_ = " ".join(lines_)
-                    line, label = self._form_line_label(text=text_, labels=labels_)
-                    lines.append(line)
-                    labels.append(label)
+                if len(lines_) > 0 and len(sentences) == 0:
+                    sentences.append(" ".join(lines_))
+                    sentences_labels.append(labels_)
+
+        sentence_lines = make_lines(
+            texts=sentences,
+            tokenizers=self.tokenizers,
+            batch_size=self.tokenization_batch_size,
+            num_processes=self.num_processes,
+        )
+        for line, labels_ in zip(sentence_lines, sentences_labels):
+            lines.append(line)
+            labels.append(self._form_label(labels=labels_))
 
         return lines, labels
 
-    def _form_line_label(self, text: str, labels: List[str]):
-        line = Line(text=text, tokenizers=self.tokenizers)
+    def _form_label(self, labels: List[List[str]]) -> SeqLabel:
         labels_ = zip(*labels)
         labels_ = zip(self.column_names, labels_)
         labels_ = dict(labels_)
@@ -102,7 +131,7 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
             column_name = self.column_names[column_index]
             labels_ = {column_name: labels_[column_name]}
         label = SeqLabel(labels=labels_)
-        return line, label
+        return label
 
     def __len__(self):
         return len(self.lines)
@@ -125,7 +154,45 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
         batch_size=10,
         column_names: List[str] = None,
         train_only: Optional[str] = None,
+        compact: bool = False,
+        num_processes: int = 1,
+        use_snapshots: bool = False,
+        snapshots_dir: str = DATASETS_CACHE_DIR,
     ):
+        """
+
+        Parameters
+        ----------
+        train_filename : str
+            The train file
+        dev_filename : str
+            The dev file
+        test_filename : str
+            The test file
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        namespace_vocab_options : Dict[str, Dict[str, Any]]
+            The options of the vocab of every namespace
+        namespace_numericalizer_map : Dict[str, BaseNumericalizer]
+            The numericalizer of every namespace
+        batch_size : int
+            Batch size for loading the datasets
+        column_names : List[str]
+            The names of the three label columns of the CoNLL files
+        train_only : Optional[str]
+            One of ``pos``, ``dep`` or ``ner`` to use only one of the label columns
+        compact : bool
+            Stores the lines and labels as arrays of token ids
+        num_processes : int
+            The number of processes that tokenize the lines of every dataset
+        use_snapshots : bool
+            If True, the tokenized and numericalized datasets and the vocabs are
+            stored in a snapshot in ``snapshots_dir``. The next time the same files
+            are used with the same options, they are loaded from the snapshot
+            without any tokenization
+        snapshots_dir : str
+            The directory where the snapshots are stored
+        """
 
         self.train_filename = train_filename
         self.dev_filename = dev_filename
@@ -163,6 +230,8 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
         }
 
         self.batch_size = batch_size
+        self.compact = compact
+        self.num_processes = num_processes
 
         if column_names is None:
             column_names = ["label_1", "label_2", "label_3"]
@@ -179,25 +248,22 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
         for column_name in valid_column_names:
             self.namespace_numericalizer_map[column_name] = Numericalizer()
 
-        self.train_dataset = CoNLLDataset(
-            filename=self.train_filename,
-            tokenizers=self.tokenizers,
-            column_names=column_names,
-            train_only=train_only,
-        )
-
-        self.dev_dataset = CoNLLDataset(
-            filename=self.dev_filename,
-            tokenizers=self.tokenizers,
-            column_names=column_names,
-            train_only=train_only,
-        )
-
-        self.test_dataset = CoNLLDataset(
-            filename=self.test_filename,
-            tokenizers=self.tokenizers,
-            column_names=column_names,
-            train_only=train_only,
+        namespace_to_vocab = self.load_or_build_datasets(
+            build_dataset=lambda filename: CoNLLDataset(
+                filename=filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+                compact=compact,
+                num_processes=num_processes,
+            ),
+            dataset_config={
+                "class": CoNLLDataset.__name__,
+                "column_names": column_names,
+                "train_only": train_only,
+            },
+            use_snapshots=use_snapshots,
+            snapshots_dir=snapshots_dir,
         )
 
         super(CoNLLDatasetManager, self).__init__(
@@ -207,4 +273,5 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            namespace_to_vocab=namespace_to_vocab,
         )
@@ -3,22 +3,34 @@ from sciwing.data.seq_label import SeqLabel
 from sciwing.datasets.seq_labeling.base_seq_labeling import BaseSeqLabelingDataset
 from sciwing.numericalizers.numericalizer import Numericalizer
 from torch.utils.data import Dataset
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
+from sciwing.data.parallel import parallel_map
 import copy
 
 
+def make_line_with_context(
+    example: Tuple[str, List[str]], tokenizers: Dict[str, BaseTokenizer]
+) -> LineWithContext:
+    text, context = example
+    return LineWithContext(text=text, context=context, tokenizers=tokenizers)
+
+
 class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
+    # the number of sentences that are sent to a process together
+    chunksize = 100
+
     def __init__(
         self,
         filename: str,
         tokenizers: Dict[str, BaseTokenizer],
         column_names: List[str] = None,
+        num_processes: int = 1,
     ):
         """
 
@@ -29,6 +41,9 @@ class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
             A mapping between
         column_names : List[str]
         Maximum one column for NER.
+        num_processes : int
+            The number of processes that make the lines with their context.
+            The lines keep the order of the file
         """
         super().__init__(filename, tokenizers)
         if column_names is None:
@@ -37,12 +52,18 @@ class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
         self.filename = filename
         self.tokenizers = tokenizers
         self.column_names = column_names
+        self.num_processes = num_processes
         self.lines, self.labels = self.get_lines_labels()
 
     def get_lines_labels(self) -> (List[LineWithContext], List[SeqLabel]):
         lines: List[LineWithContext] = []
         labels: List[SeqLabel] = []
 
+        # the sentences, their context and their labels are read first.
+        # The lines are then made in order, possibly in a pool of processes
+        examples: List[Tuple[str, List[str]]] = []
+        examples_labels: List[List[str]] = []
+
         with open(self.filename) as fp:
             words_: List[str] = []
             labels_: List[str] = []
@@ -73,23 +94,24 @@ class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
                         if len(yago_entities) == 0:
                             yago_entities = ["NULL"]
 
-                        line, label = self._form_line_label(
-                            line=text, label=labels_, yago_entities=yago_entities
-                        )
+                        examples.append((text, yago_entities))
+                        examples_labels.append(labels_)
                         words_: List[str] = []
                         labels_: List[str] = []
                         yago_entities: List[str] = []
-                        lines.append(line)
-                        labels.append(label)
-
-        return lines, labels
 
-    def _form_line_label(self, line: str, label: List[str], yago_entities: List[str]):
-        line = LineWithContext(
-            text=line, context=yago_entities, tokenizers=self.tokenizers
+        example_lines = parallel_map(
+            func=make_line_with_context,
+            items=examples,
+            tokenizers=self.tokenizers,
+            num_processes=self.num_processes,
+            chunksize=self.chunksize,
         )
-        label = SeqLabel({self.column_names[0]: label})
-        return line, label
+        for line, label in zip(example_lines, examples_labels):
+            lines.append(line)
+            labels.append(SeqLabel({self.column_names[0]: label}))
+
+        return lines, labels
 
     def __len__(self):
         return len(self.lines)
@@ -111,6 +133,7 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size=10,
         column_names: List[str] = None,
+        num_processes: int = 1,
     ):
         self.train_filename = train_filename
         self.dev_filename = dev_filename
@@ -144,6 +167,7 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
         }
 
         self.batch_size = batch_size
+        self.num_processes = num_processes
 
         if column_names is None:
             column_names = ["NER"]
@@ -155,18 +179,21 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
             filename=self.train_filename,
             tokenizers=self.tokenizers,
             column_names=column_names,
+            num_processes=num_processes,
         )
 
         self.dev_dataset = ConllYagoDataset(
             filename=self.dev_filename,
             tokenizers=self.tokenizers,
             column_names=column_names,
+            num_processes=num_processes,
         )
 
         self.test_dataset = ConllYagoDataset(
             filename=self.test_filename,
             tokenizers=self.tokenizers,
             column_names=column_names,
+            num_processes=num_processes,
         )
 
         super(ConllYagoDatasetsManager, self).__init__(
@@ -8,7 +8,14 @@ from sciwing.numericalizers.numericalizer import Numericalizer
 from typing import Dict, List, Any
 from sciwing.data.line import Line
 from sciwing.data.seq_label import SeqLabel
+from sciwing.data.compact_storage import CompactLines, CompactSeqLabels
+from sciwing.data.lazy_storage import LazyExamples
+from sciwing.data.parallel import make_lines
 from sciwing.data.datasets_manager import DatasetsManager
+import sciwing.constants as constants
+
+PATHS = constants.PATHS
+DATASETS_CACHE_DIR = PATHS["DATASETS_CACHE_DIR"]
 
 
 class SeqLabellingDataset(BaseSeqLabelingDataset, Dataset):
@@ -21,38 +28,112 @@ class SeqLabellingDataset(BaseSeqLabelingDataset, Dataset):
         .
     """
 
-    def __init__(self, filename: str, tokenizers: Dict[str, BaseTokenizer]):
+    # the number of lines that are tokenized together
+    tokenization_batch_size = 1000
+
+    def __init__(
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        compact: bool = False,
+        lazy: bool = False,
+        num_processes: int = 1,
+    ):
+        """
+
+        Parameters
+        ----------
+        filename : str
+            The file that stores the dataset
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        compact : bool
+            If True, the tokens of the lines and the labels are stored as arrays of
+            ids in ``CompactLines`` and ``CompactSeqLabels``. The ``Line`` and
+            ``SeqLabel`` objects are made only when an example is accessed
+        lazy : bool
+            If True, only the byte offsets of the lines in the file are stored.
+            An example is read from the file and tokenized when it is accessed.
+            ``compact`` is ignored for lazy datasets
+        num_processes : int
+            The number of processes that tokenize the lines. With more than one
+            process, the file is split into batches of lines that are tokenized
+            in a pool of processes. The lines keep the order of the file
+        """
         super().__init__(filename, tokenizers)
         self.filename = filename
         self.tokenizers = tokenizers
+        self.compact = compact
+        self.lazy = lazy
+        self.num_processes = num_processes
         self.lines, self.labels = self.get_lines_labels()
 
     def get_lines_labels(self) -> (List[Line], List[SeqLabel]):
-        lines: List[Line] = []
-        labels: List[SeqLabel] = []
+        if self.lazy:
+            examples = LazyExamples(
+                filename=self.filename, parse_example=self.get_line_label
+            )
+            return examples.lines, examples.labels
+
+        lines: List[Line] = CompactLines() if self.compact else []
+        labels: List[SeqLabel] = CompactSeqLabels() if self.compact else []
 
         with open(self.filename, "r", encoding="utf-8") as fp:
-            for line in fp:
-                line = line.strip()
-                if not bool(line):
-                    continue
-                lines_and_labels = line.strip().split(" ")
-                words: List[str] = []
-                word_labels: List[str] = []
-                for word_line_labels in lines_and_labels:
-                    word, word_label = word_line_labels.split("###")
-                    word = word.strip()
-                    word_label = word_label.strip()
-                    words.append(word)
-                    word_labels.append(word_label)
-
-                line = Line(text=" ".join(words), tokenizers=self.tokenizers)
-                label = SeqLabel(labels={"seq_label": word_labels})
-                lines.append(line)
-                labels.append(label)
+            examples = [self.split_example(text) for text in fp if bool(text.strip())]
+
+        # the lines are tokenized in batches
+        line_instances = make_lines(
+            texts=[" ".join(words) for words, _ in examples],
+            tokenizers=self.tokenizers,
+            batch_size=self.tokenization_batch_size,
+            num_processes=self.num_processes,
+        )
+        for line, (_, word_labels) in zip(line_instances, examples):
+            lines.append(line)
+            labels.append(SeqLabel(labels={"seq_label": word_labels}))
 
         return lines, labels
 
+    def split_example(self, text: str) -> (List[str], List[str]):
+        """ Splits a line of the file into the words and their labels
+
+        Parameters
+        ----------
+        text : str
+            A line of the file of the form ``word1###label1 word2###label2``
+
+        Returns
+        -------
+        (List[str], List[str])
+        """
+        lines_and_labels = text.strip().split(" ")
+        words: List[str] = []
+        word_labels: List[str] = []
+        for word_line_labels in lines_and_labels:
+            word, word_label = word_line_labels.split("###")
+            word = word.strip()
+            word_label = word_label.strip()
+            words.append(word)
+            word_labels.append(word_label)
+        return words, word_labels
+
+    def get_line_label(self, text: str) -> (Line, SeqLabel):
+        """ Makes the line and the labels from a line of the file
+
+        Parameters
+        ----------
+        text : str
+            A line of the file of the form ``word1###label1 word2###label2``
+
+        Returns
+        -------
+        (Line, SeqLabel)
+        """
+        words, word_labels = self.split_example(text)
+        line = Line(text=" ".join(words), tokenizers=self.tokenizers)
+        label = SeqLabel(labels={"seq_label": word_labels})
+        return line, label
+
     def __len__(self):
         return len(self.lines)
 
@@ -71,7 +152,44 @@ class SeqLabellingDatasetManager(DatasetsManager):
         namespace_vocab_options: Dict[str, Dict[str, Any]] = None,
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size: int = 10,
+        compact: bool = False,
+        lazy: bool = False,
+        num_processes: int = 1,
+        use_snapshots: bool = False,
+        snapshots_dir: str = DATASETS_CACHE_DIR,
     ):
+        """
+
+        Parameters
+        ----------
+        train_filename : str
+            The train file
+        dev_filename : str
+            The dev file
+        test_filename : str
+            The test file
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        namespace_vocab_options : Dict[str, Dict[str, Any]]
+            The options of the vocab of every namespace
+        namespace_numericalizer_map : Dict[str, BaseNumericalizer]
+            The numericalizer of every namespace
+        batch_size : int
+            Batch size for loading the datasets
+        compact : bool
+            Stores the lines and labels as arrays of token ids
+        lazy : bool
+            Reads and tokenizes the examples from the files when they are accessed
+        num_processes : int
+            The number of processes that tokenize the lines of every dataset
+        use_snapshots : bool
+            If True, the tokenized and numericalized datasets and the vocabs are
+            stored in a snapshot in ``snapshots_dir``. The next time the same files
+            are used with the same options, they are loaded from the snapshot
+            without any tokenization
+        snapshots_dir : str
+            The directory where the snapshots are stored
+        """
 
         self.train_filename = train_filename
         self.dev_filename = dev_filename
@@ -95,17 +213,21 @@ class SeqLabellingDatasetManager(DatasetsManager):
         self.namespace_numericalizer_map["seq_label"] = Numericalizer()
 
         self.batch_size = batch_size
-
-        self.train_dataset = SeqLabellingDataset(
-            filename=self.train_filename, tokenizers=self.tokenizers
-        )
-
-        self.dev_dataset = SeqLabellingDataset(
-            filename=self.dev_filename, tokenizers=self.tokenizers
-        )
-
-        self.test_dataset = SeqLabellingDataset(
-            filename=self.test_filename, tokenizers=self.tokenizers
+        self.compact = compact
+        self.lazy = lazy
+        self.num_processes = num_processes
+
+        namespace_to_vocab = self.load_or_build_datasets(
+            build_dataset=lambda filename: SeqLabellingDataset(
+                filename=filename,
+                tokenizers=self.tokenizers,
+                compact=compact,
+                lazy=lazy,
+                num_processes=num_processes,
+            ),
+            dataset_config={"class": SeqLabellingDataset.__name__},
+            use_snapshots=use_snapshots,
+            snapshots_dir=snapshots_dir,
         )
 
         super(SeqLabellingDatasetManager, self).__init__(
@@ -115,4 +237,5 @@ class SeqLabellingDatasetManager(DatasetsManager):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            namespace_to_vocab=namespace_to_vocab,
         )
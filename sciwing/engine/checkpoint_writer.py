@@ -0,0 +1,144 @@
+"""
+Writes the checkpoints of the engine without stalling the training.
+The state is copied to cpu memory on the training thread and it is saved on a
+worker thread. Every checkpoint is written to a temporary file first and renamed,
+so that a checkpoint file is never left half written.
+"""
+import os
+import pathlib
+import threading
+import torch
+from collections import deque
+from typing import Any, Optional, List, Union
+
+
+class CheckpointWriter:
+    def __init__(
+        self,
+        keep_last: Optional[int] = None,
+        asynchronous: bool = True,
+        existing_checkpoints: Optional[List[pathlib.Path]] = None,
+    ):
+        """ Saves checkpoints on a background thread
+
+        Parameters
+        ----------
+        keep_last : Optional[int]
+            The number of checkpoints written with ``retain=True`` that are kept.
+            Older ones are deleted once a new one is written. None keeps all of them
+        asynchronous : bool
+            If False, the checkpoints are saved on the calling thread
+        existing_checkpoints : Optional[List[pathlib.Path]]
+            Checkpoints that are already on disk from oldest to newest. They count
+            towards ``keep_last``, for example when the training is resumed
+        """
+        if keep_last is not None and keep_last < 1:
+            raise ValueError(f"keep_last should be at least 1. Got {keep_last}")
+        self.keep_last = keep_last
+        self.asynchronous = asynchronous
+        self.retained_checkpoints = deque(
+            pathlib.Path(checkpoint) for checkpoint in existing_checkpoints or []
+        )
+        self.worker: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+    def write(self, state: Any, filename: Union[str, pathlib.Path], retain=True):
+        """ Saves a checkpoint
+
+        The tensors of ``state`` are copied to cpu before this returns, so the
+        training can go on changing the model and the optimizer.
+        At most one checkpoint is saved at a time. If the previous one is still
+        being saved, this waits for it after copying the state
+
+        Parameters
+        ----------
+        state : Any
+            The checkpoint. Dictionaries, lists and tuples of tensors and python
+            types are copied
+        filename : Union[str, pathlib.Path]
+            The file where the checkpoint is saved
+        retain : bool
+            Whether the checkpoint is deleted when ``keep_last`` newer checkpoints
+            are written. Files that are overwritten every time, like the best model,
+            are saved with ``retain=False``
+        """
+        snapshot = self.snapshot(state)
+        self.wait()
+        filename = pathlib.Path(filename)
+        if not self.asynchronous:
+            self._save(snapshot, filename, retain)
+            return
+
+        self.worker = threading.Thread(
+            target=self._run, args=(snapshot, filename, retain), name="sciwing-ckpt"
+        )
+        self.worker.start()
+
+    def wait(self):
+        """ Waits until the checkpoint being saved is on disk. An error raised while
+        saving it is raised again here
+        """
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    @classmethod
+    def snapshot(cls, state: Any) -> Any:
+        """ Copies all the tensors in ``state`` to cpu memory
+
+        Parameters
+        ----------
+        state : Any
+            Nested dictionaries, lists and tuples of tensors and python types
+
+        Returns
+        -------
+        Any
+            The state with tensors that do not share memory with the originals
+        """
+        if isinstance(state, torch.Tensor):
+            return state.detach().to("cpu", copy=True)
+        if isinstance(state, dict):
+            return {key: cls.snapshot(value) for key, value in state.items()}
+        if isinstance(state, list):
+            return [cls.snapshot(value) for value in state]
+        if isinstance(state, tuple):
+            return tuple(cls.snapshot(value) for value in state)
+        return state
+
+    def _run(self, state: Any, filename: pathlib.Path, retain: bool):
+        try:
+            self._save(state, filename, retain)
+        except BaseException as error:
+            self.error = error
+
+    def _save(self, state: Any, filename: pathlib.Path, retain: bool):
+        # the temporary file is in the same directory, so that the rename is atomic
+        tmp_filename = filename.with_name(f".{filename.name}.tmp")
+        try:
+            with open(tmp_filename, "wb") as fp:
+                torch.save(state, fp)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp_filename, filename)
+        finally:
+            if tmp_filename.exists():
+                tmp_filename.unlink()
+
+        if retain:
+            if filename in self.retained_checkpoints:
+                self.retained_checkpoints.remove(filename)
+            self.retained_checkpoints.append(filename)
+            self._remove_old_checkpoints()
+
+    def _remove_old_checkpoints(self):
+        if self.keep_last is None:
+            return
+        while len(self.retained_checkpoints) > self.keep_last:
+            checkpoint = self.retained_checkpoints.popleft()
+            if checkpoint.exists():
+                checkpoint.unlink()
@@ -3,7 +3,7 @@ from torch.utils.data import DataLoader
 import torch.nn as nn
 import torch.optim as optim
 from wasabi import Printer
-from typing import Iterator, Any, Optional, Dict, Union
+from typing import Iterator, Any, Optional, Dict, Union, List
 from sciwing.meters.loss_meter import LossMeter
 from sciwing.data.datasets_manager import DatasetsManager
 from tensorboardX import SummaryWriter
@@ -13,18 +13,35 @@ import time
 import logging
 import torch
 from torch.utils.data.sampler import SubsetRandomSampler
+from sciwing.data.bucket_batch_sampler import BucketBatchSampler
+from sciwing.data.collate import NumericalizingCollator, transpose_batch
+from sciwing.data.compact_storage import CompactLines
+from sciwing.engine.checkpoint_writer import CheckpointWriter
 from sciwing.utils.class_nursery import ClassNursery
 import logzero
 import hashlib
 import pathlib
 import random
 import json
+import re
 
 try:
     import wandb
 except ImportError:
     wandb = None
 
+AUTOCAST_DTYPES = {"bfloat16": torch.bfloat16, "float16": torch.float16}
+
+# model_epoch_{epoch}.pt or model_epoch_{epoch}_iteration_{iteration}.pt
+CHECKPOINT_FILENAME_PATTERN = re.compile(r"model_epoch_(\d+)(?:_iteration_(\d+))?\.pt")
+
+
+def get_grad_scaler(device: torch.device, enabled: bool):
+    # torch.amp.GradScaler is only available in the newer versions of torch
+    if hasattr(torch, "amp") and hasattr(torch.amp, "GradScaler"):
+        return torch.amp.GradScaler(device.type, enabled=enabled)
+    return torch.cuda.amp.GradScaler(enabled=enabled)
+
 
 class Engine(ClassNursery):
     def __init__(
@@ -44,13 +61,24 @@ class Engine(ClassNursery):
         experiment_hyperparams: Optional[Dict[str, Any]] = None,
         tensorboard_logdir: str = None,
         track_for_best: str = "loss",
-        collate_fn=list,
+        collate_fn=None,
         device: Union[torch.device, str] = torch.device("cpu"),
         gradient_norm_clip_value: Optional[float] = 5.0,
         lr_scheduler: Optional[torch.optim.lr_scheduler._LRScheduler] = None,
         use_wandb: bool = False,
         sample_proportion: float = 1.0,
         seeds: Dict[str, int] = None,
+        bucket_batches: bool = False,
+        max_tokens_per_batch: Optional[int] = None,
+        bucket_size_multiplier: int = 100,
+        bucket_tokens_namespace: str = "tokens",
+        num_workers: int = 1,
+        mixed_precision: Optional[str] = None,
+        accumulation_steps: int = 1,
+        checkpoint_every: Optional[int] = None,
+        resume_from: Optional[str] = None,
+        keep_last_checkpoints: Optional[int] = None,
+        async_checkpoints: bool = True,
     ):
         """ Engine runs the models end to end. It iterates through the train dataset and passes
         it through the model. During training it helps in tracking a lot of parameters for the run
@@ -77,7 +105,8 @@ class Engine(ClassNursery):
             The model will be checkpointed every ``save_every`` number of iterations
         log_train_metrics_every : int
             The train metrics will be reported every ``log_train_metrics_every`` iterations
-            during training
+            during training. The train metrics are calculated only for these batches
+            and not for every batch
         train_metric : BaseMetric
             Anything that is an instance of ``BaseMetric`` for calculating training metrics
         validation_metric : BaseMetric
@@ -102,6 +131,8 @@ class Engine(ClassNursery):
         collate_fn : Callable[[List[Any]], List[Any]]
             Collates the different examples into a single batch of examples.
             This is the same terminology adopted from ``pytorch``. There is no different
+            If None, ``NumericalizingCollator`` is used. It also pads the indices of the
+            tokens of every namespace into one tensor that the models use
         device : torch.device
             The device on which the model will be placed. If this is "cpu", then the model
             and the tensors will all be on cpu. If this is "cuda:0", then the model and
@@ -122,6 +153,52 @@ class Engine(ClassNursery):
             Set the random_seed, pytorch_seed and numpy_seed
             Found in
             https://github.com/allenai/allennlp/blob/master/allennlp/common/util.py
+        bucket_batches: bool
+            If True, lines of similar lengths are grouped into the same batch
+            using ``BucketBatchSampler``. This reduces the padding in every batch
+        max_tokens_per_batch: Optional[int]
+            Used only when ``bucket_batches`` is True. A batch is capped at
+            ``max_tokens_per_batch`` padded tokens instead of only ``batch_size`` lines
+        bucket_size_multiplier: int
+            Used only when ``bucket_batches`` is True. The number of batches
+            worth of lines that are sorted together by length
+        bucket_tokens_namespace: str
+            The namespace of the tokens that is used to find the length of every line
+        num_workers: int
+            The number of worker processes of the ``DataLoader`` that load and collate
+            the batches
+        mixed_precision: Optional[str]
+            If given, the forward passes run under ``torch.autocast`` with this dtype.
+            One of ``bfloat16`` or ``float16``. ``bfloat16`` works on cpu and cuda.
+            With ``float16`` the loss is scaled by a ``GradScaler`` to avoid the
+            underflow of the gradients
+        accumulation_steps: int
+            The gradients of ``accumulation_steps`` batches are accumulated before the
+            optimizer takes a step. The effective batch size is
+            ``batch_size * accumulation_steps`` while only ``batch_size`` lines are
+            in memory at once. The gradients are clipped and the train loss is
+            recorded once for every step of the optimizer
+        checkpoint_every: Optional[int]
+            If given, a checkpoint ``model_epoch_{epoch}_iteration_{iteration}.pt`` is
+            also saved every ``checkpoint_every`` iterations within an epoch, right
+            after a step of the optimizer. The training can be resumed from the middle
+            of the epoch using such a checkpoint. It should be a multiple of
+            ``accumulation_steps``
+        resume_from: Optional[str]
+            A checkpoint saved by the engine to resume the training from. ``latest``
+            resumes from the most recent checkpoint in ``save_dir`` and starts the
+            training from scratch if there is none. The model, the optimizer, the lr
+            scheduler, the best value tracked, the random states and the remaining
+            batches of the epoch are restored
+        keep_last_checkpoints: Optional[int]
+            The number of ``model_epoch_*.pt`` checkpoints that are kept in
+            ``save_dir``. Older ones are deleted when a new one is saved. None keeps
+            all of them. ``best_model.pt`` is always kept
+        async_checkpoints: bool
+            If True, the checkpoints are copied to cpu memory and saved on a
+            background thread while the training goes on. Every checkpoint is
+            written to a temporary file and renamed, so a checkpoint is never left
+            half written
         """
 
         if isinstance(device, str):
@@ -151,6 +228,11 @@ class Engine(ClassNursery):
         self.test_metric_calc = test_metric
         self.summaryWriter = SummaryWriter(log_dir=tensorboard_logdir)
         self.track_for_best = track_for_best
+        if collate_fn is None:
+            namespace_to_numericalizer = self.datasets_manager.namespace_to_numericalizer
+            collate_fn = NumericalizingCollator(
+                namespace_to_numericalizer=namespace_to_numericalizer
+            )
         self.collate_fn = collate_fn
         self.device = device
         self.best_track_value = None
@@ -162,6 +244,10 @@ class Engine(ClassNursery):
         )
         self.use_wandb = wandb and use_wandb
         self.sample_proportion = sample_proportion
+        self.bucket_batches = bucket_batches
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.bucket_size_multiplier = bucket_size_multiplier
+        self.bucket_tokens_namespace = bucket_tokens_namespace
         self.label_namespaces = self.datasets_manager.label_namespaces
         self.datasets_manager.print_stats()
 
@@ -187,9 +273,34 @@ class Engine(ClassNursery):
         with open(self.save_dir.joinpath("hyperparams.json"), "w") as fp:
             json.dump(self.experiment_hyperparams, fp)
 
-        self.num_workers = 1
+        self.num_workers = num_workers
         self.model.to(self.device)
 
+        if mixed_precision is not None and mixed_precision not in AUTOCAST_DTYPES:
+            raise ValueError(
+                f"mixed_precision should be one of {list(AUTOCAST_DTYPES.keys())}. "
+                f"Got {mixed_precision}"
+            )
+        self.mixed_precision = mixed_precision
+        self.grad_scaler = get_grad_scaler(
+            device=self.device, enabled=self.mixed_precision == "float16"
+        )
+
+        if accumulation_steps < 1:
+            raise ValueError(
+                f"accumulation_steps should be at least 1. Got {accumulation_steps}"
+            )
+        self.accumulation_steps = accumulation_steps
+
+        # mid epoch checkpoints are saved only right after a step of the optimizer
+        if checkpoint_every is not None and (
+            checkpoint_every < 1 or checkpoint_every % accumulation_steps != 0
+        ):
+            raise ValueError(
+                f"checkpoint_every should be a positive multiple of "
+                f"accumulation_steps ({accumulation_steps}). Got {checkpoint_every}"
+            )
+
         self.train_loader = self.get_loader(self.train_dataset)
         self.validation_loader = self.get_loader(self.validation_dataset)
         self.test_loader = self.get_loader(self.test_dataset)
@@ -203,6 +314,17 @@ class Engine(ClassNursery):
         self.train_loss_meter = LossMeter()
         self.validation_loss_meter = LossMeter()
 
+        # the batches of the current train epoch
+        self.train_batches: List[List[int]] = []
+        self.checkpoint_every = checkpoint_every
+        self.start_epoch = 0
+        self.resume_state: Optional[Dict[str, Any]] = None
+        self.checkpoint_writer = CheckpointWriter(
+            keep_last=keep_last_checkpoints,
+            asynchronous=async_checkpoints,
+            existing_checkpoints=self.get_checkpoints() if resume_from else None,
+        )
+
         self.msg_printer.divider("ENGINE STARTING")
         time.sleep(3)
 
@@ -244,6 +366,15 @@ class Engine(ClassNursery):
                     f"You are optimizing for micro_fscore and lr scheduler mode is min instead of max"
                 )
 
+        if resume_from == "latest":
+            resume_from = self.get_latest_checkpoint()
+            if resume_from is None:
+                self.msg_printer.warn(
+                    f"There are no checkpoints in {self.save_dir} to resume from"
+                )
+        if resume_from is not None:
+            self.load_checkpoint(resume_from)
+
     def get_loader(self, dataset: Dataset) -> DataLoader:
         """ Returns the DataLoader for the Dataset
 
@@ -260,16 +391,79 @@ class Engine(ClassNursery):
         dataset_size = len(dataset)
         sample_size = int(np.floor(dataset_size * self.sample_proportion))
         indices = np.random.choice(range(dataset_size), size=sample_size, replace=False)
-        sampler = SubsetRandomSampler(indices=indices)
-        loader = DataLoader(
+
+        if self.bucket_batches:
+            batch_sampler = BucketBatchSampler(
+                indices=indices.tolist(),
+                lengths=self.get_line_lengths(dataset),
+                batch_size=self.batch_size,
+                max_tokens_per_batch=self.max_tokens_per_batch,
+                bucket_size_multiplier=self.bucket_size_multiplier,
+            )
+            loader = DataLoader(
+                dataset=dataset,
+                batch_sampler=batch_sampler,
+                num_workers=self.num_workers,
+                collate_fn=self.collate_fn,
+                pin_memory=True,
+            )
+        else:
+            sampler = SubsetRandomSampler(indices=indices)
+            loader = DataLoader(
+                dataset=dataset,
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                collate_fn=self.collate_fn,
+                pin_memory=True,
+                sampler=sampler,
+            )
+        return loader
+
+    def get_batches_loader(
+        self, dataset: Dataset, batches: List[List[int]]
+    ) -> DataLoader:
+        """ Returns a DataLoader that loads the given batches in their order
+
+        Parameters
+        ----------
+        dataset : Dataset
+        batches : List[List[int]]
+            The indices of the lines of every batch
+
+        Returns
+        -------
+        DataLoader
+        """
+        return DataLoader(
             dataset=dataset,
-            batch_size=self.batch_size,
+            batch_sampler=batches,
             num_workers=self.num_workers,
             collate_fn=self.collate_fn,
             pin_memory=True,
-            sampler=sampler,
         )
-        return loader
+
+    def get_line_lengths(self, dataset: Dataset) -> List[int]:
+        """ Returns the number of tokens in every line of the dataset
+
+        Parameters
+        ----------
+        dataset : Dataset
+            A dataset that stores its lines in ``dataset.lines``
+
+        Returns
+        -------
+        List[int]
+            The number of tokens in ``bucket_tokens_namespace`` for every line
+        """
+        lines = dataset.lines
+        if isinstance(lines, CompactLines):
+            # the lengths are read from the offsets without making the lines
+            return [
+                lines.get_num_tokens(idx, self.bucket_tokens_namespace)
+                for idx in range(len(lines))
+            ]
+        lengths = [len(line.tokens[self.bucket_tokens_namespace]) for line in lines]
+        return lengths
 
     def is_best_lower(self, current_best=None):
         """ Returns True if the current value of the metric is lower than the best metric.
@@ -322,16 +516,31 @@ class Engine(ClassNursery):
         elif self.track_for_best == "micro_fscore":
             self.best_track_value = 0 if current_best is None else current_best
 
+    def autocast(self):
+        """ Returns the context in which the forward passes of the model run. The
+        autocast is disabled when ``mixed_precision`` is not given
+
+        Returns
+        -------
+        torch.autocast
+        """
+        dtype = AUTOCAST_DTYPES.get(self.mixed_precision, torch.bfloat16)
+        return torch.autocast(
+            device_type=self.device.type,
+            dtype=dtype,
+            enabled=self.mixed_precision is not None,
+        )
+
     def run(self):
         """
         Run the engine
         :return:
         """
-        for epoch_num in range(self.num_epochs):
+        for epoch_num in range(self.start_epoch, self.num_epochs):
             self.train_epoch(epoch_num)
             self.validation_epoch(epoch_num)
 
-        self.test_epoch(epoch_num)
+        self.test_epoch(self.num_epochs - 1)
 
     def train_epoch(self, epoch_num: int):
         """
@@ -341,44 +550,89 @@ class Engine(ClassNursery):
         """
 
         # refresh everything necessary before training begins
-        num_iterations = 0
-        train_iter = self.get_iter(self.train_loader)
+        # the batches of the epoch are fixed at its start. A checkpoint stores them
+        # to resume the epoch with the batches that remain
+        resume_state = self.resume_state
+        self.resume_state = None
+        if resume_state is not None and resume_state["epoch_num"] == epoch_num:
+            self.train_batches = resume_state["train_batches"]
+            num_iterations = resume_state["num_iterations"]
+        else:
+            resume_state = None
+            self.train_batches = [
+                [int(idx) for idx in batch] for batch in self.train_loader.batch_sampler
+            ]
+            num_iterations = 0
+        train_iter = self.get_iter(
+            self.get_batches_loader(
+                self.train_dataset, self.train_batches[num_iterations:]
+            )
+        )
         self.train_loss_meter.reset()
         self.train_metric_calc.reset()
         self.model.train()
 
+        if resume_state is not None:
+            for loss, num_lines in resume_state["train_losses"]:
+                self.train_loss_meter.add_loss(loss / num_lines, num_lines)
+            # the random states are restored after the loader is made, which
+            # also uses them, so that the epoch continues as it was
+            self.set_rng_states(resume_state["rng_states"])
+
         self.msg_printer.info(
             f"Starting Training Epoch: {epoch_num+1}/{self.num_epochs}"
         )
+
+        # the summed loss, the lines and the batches since the last optimizer step
+        # the loss stays a tensor and is moved to the cpu only at the end of the epoch
+        self.optimizer.zero_grad()
+        accumulated_loss = 0.0
+        accumulated_lines = 0
+        accumulated_batches = 0
+        model_forward_out = None
         while True:
             try:
                 # N*T, N * 1, N * 1
                 lines_labels = next(train_iter)
-                lines_labels = list(zip(*lines_labels))
+                lines_labels = transpose_batch(lines_labels)
                 lines = lines_labels[0]
                 labels = lines_labels[1]
                 batch_size = len(lines)
 
-                model_forward_out = self.model(
-                    lines=lines,
-                    labels=labels,
-                    is_training=True,
-                    is_validation=False,
-                    is_test=False,
-                )
-                self.train_metric_calc.calc_metric(
-                    lines=lines, labels=labels, model_forward_dict=model_forward_out
-                )
+                with self.autocast():
+                    model_forward_out = self.model(
+                        lines=lines,
+                        labels=labels,
+                        is_training=True,
+                        is_validation=False,
+                        is_test=False,
+                    )
+
+                # the metrics move the predictions to the cpu. They are calculated
+                # only for the batches whose metrics are reported
+                num_iterations += 1
+                log_train_metrics = num_iterations % self.log_train_metrics_every == 0
+                if log_train_metrics:
+                    self.train_metric_calc.calc_metric(
+                        lines=lines, labels=labels, model_forward_dict=model_forward_out
+                    )
 
                 try:
-                    self.optimizer.zero_grad()
                     loss = model_forward_out["loss"]
-                    loss.backward()
-                    torch.nn.utils.clip_grad_norm_(
-                        self.model.parameters(), max_norm=self.gradient_norm_clip_value
-                    )
-                    self.optimizer.step()
-                    self.train_loss_meter.add_loss(loss.item(), batch_size)
+                    # the gradients of the batches add up to those of their average
+                    self.grad_scaler.scale(loss / self.accumulation_steps).backward()
+                    accumulated_loss += loss.detach() * batch_size
+                    accumulated_lines += batch_size
+                    accumulated_batches += 1
+
+                    if accumulated_batches == self.accumulation_steps:
+                        self.optimizer_step(num_batches=accumulated_batches)
+                        self.train_loss_meter.add_loss(
+                            accumulated_loss / accumulated_lines, accumulated_lines
+                        )
+                        accumulated_loss = 0.0
+                        accumulated_lines = 0
+                        accumulated_batches = 0
 
                 except KeyError:
                     self.msg_printer.fail(
@@ -386,8 +640,20 @@ class Engine(ClassNursery):
                         "a key called loss. Please check to have "
                         "loss in the model output"
                     )
-                num_iterations += 1
-                if (num_iterations + 1) % self.log_train_metrics_every == 0:
+
+                if (
+                    self.checkpoint_every is not None
+                    and num_iterations % self.checkpoint_every == 0
+                ):
+                    self.save_checkpoint(
+                        filename=self.save_dir.joinpath(
+                            f"model_epoch_{epoch_num+1}_iteration_{num_iterations}.pt"
+                        ),
+                        epoch_num=epoch_num,
+                        num_iterations=num_iterations,
+                    )
+
+                if log_train_metrics:
                     metrics = self.train_metric_calc.report_metrics()
                     for label_namespace, table in metrics.items():
                         self.msg_printer.divider(
@@ -395,9 +661,48 @@ class Engine(ClassNursery):
                         )
                         print(table)
             except StopIteration:
+                # the last batches of the epoch that are fewer than accumulation_steps
+                if accumulated_batches > 0:
+                    self.optimizer_step(num_batches=accumulated_batches)
+                    self.train_loss_meter.add_loss(
+                        accumulated_loss / accumulated_lines, accumulated_lines
+                    )
+                # the epoch had fewer batches than log_train_metrics_every. The
+                # metrics of the last batch are used for the epoch
+                if (
+                    model_forward_out is not None
+                    and num_iterations < self.log_train_metrics_every
+                ):
+                    self.train_metric_calc.calc_metric(
+                        lines=lines, labels=labels, model_forward_dict=model_forward_out
+                    )
                 self.train_epoch_end(epoch_num)
                 break
 
+    def optimizer_step(self, num_batches: int):
+        """ Clips the accumulated gradients, takes a step of the optimizer and clears
+        the gradients
+
+        Parameters
+        ----------
+        num_batches : int
+            The number of batches whose gradients are accumulated. This is less than
+            ``accumulation_steps`` only for the last step of an epoch
+        """
+        # the gradients are unscaled before they are clipped
+        self.grad_scaler.unscale_(self.optimizer)
+        if num_batches < self.accumulation_steps:
+            # every loss was divided by accumulation_steps and not by num_batches
+            for parameter in self.model.parameters():
+                if parameter.grad is not None:
+                    parameter.grad.mul_(self.accumulation_steps / num_batches)
+        torch.nn.utils.clip_grad_norm_(
+            self.model.parameters(), max_norm=self.gradient_norm_clip_value
+        )
+        self.grad_scaler.step(self.optimizer)
+        self.grad_scaler.update()
+        self.optimizer.zero_grad()
+
     def train_epoch_end(self, epoch_num: int):
         """ Performs house-keeping at the end of a training epoch
 
@@ -431,14 +736,10 @@ class Engine(ClassNursery):
 
         # save the model after every `self.save_every` epochs
         if (epoch_num + 1) % self.save_every == 0:
-            torch.save(
-                {
-                    "epoch_num": epoch_num,
-                    "optimizer_state": self.optimizer.state_dict(),
-                    "model_state": self.model.state_dict(),
-                    "loss": average_loss,
-                },
-                self.save_dir.joinpath(f"model_epoch_{epoch_num+1}.pt"),
+            self.save_checkpoint(
+                filename=self.save_dir.joinpath(f"model_epoch_{epoch_num+1}.pt"),
+                epoch_num=epoch_num,
+                num_iterations=len(self.train_batches),
             )
 
         # log loss to tensor board
@@ -468,12 +769,12 @@ class Engine(ClassNursery):
         while True:
             try:
                 lines_labels = next(valid_iter)
-                lines_labels = list(zip(*lines_labels))
+                lines_labels = transpose_batch(lines_labels)
                 lines = lines_labels[0]
                 labels = lines_labels[1]
                 batch_size = len(lines)
 
-                with torch.no_grad():
+                with torch.no_grad(), self.autocast():
                     model_forward_out = self.model(
                         lines=lines,
                         labels=labels,
@@ -566,7 +867,7 @@ class Engine(ClassNursery):
         if is_best:
             self.set_best_track_value(current_best=value_tracked)
             self.msg_printer.good(f"Found Best Model @ epoch {epoch_num + 1}")
-            torch.save(
+            self.checkpoint_writer.write(
                 {
                     "epoch_num": epoch_num,
                     "optimizer_state": self.optimizer.state_dict(),
@@ -574,6 +875,7 @@ class Engine(ClassNursery):
                     "loss": average_loss,
                 },
                 self.save_dir.joinpath("best_model.pt"),
+                retain=False,
             )
 
     def test_epoch(self, epoch_num: int):
@@ -596,11 +898,11 @@ class Engine(ClassNursery):
         while True:
             try:
                 lines_labels = next(test_iter)
-                lines_labels = list(zip(*lines_labels))
+                lines_labels = transpose_batch(lines_labels)
                 lines = lines_labels[0]
                 labels = lines_labels[1]
 
-                with torch.no_grad():
+                with torch.no_grad(), self.autocast():
                     model_forward_out = self.model(
                         lines=lines,
                         labels=labels,
@@ -699,8 +1001,165 @@ class Engine(ClassNursery):
         iterator = iter(loader)
         return iterator
 
+    def get_checkpoint_state(
+        self, epoch_num: int, num_iterations: int
+    ) -> Dict[str, Any]:
+        """ Returns everything that is needed to resume the training
+
+        Parameters
+        ----------
+        epoch_num : int
+            The current epoch number (0 based)
+        num_iterations : int
+            The number of batches of the epoch that are trained. The epoch is
+            complete when this is the number of batches in the epoch
+
+        Returns
+        -------
+        Dict[str, Any]
+            The checkpoint. It only has tensors and python types, so that it can be
+            loaded with ``torch.load(filename, weights_only=True)``
+        """
+        train_losses = [
+            (float(loss), num_lines)
+            for loss, num_lines in zip(
+                self.train_loss_meter.losses, self.train_loss_meter.batch_sizes
+            )
+        ]
+        lr_scheduler_state = None
+        if self.lr_scheduler is not None:
+            lr_scheduler_state = self.lr_scheduler.state_dict()
+
+        return {
+            "epoch_num": epoch_num,
+            "num_iterations": num_iterations,
+            "optimizer_state": self.optimizer.state_dict(),
+            "model_state": self.model.state_dict(),
+            "loss": self.train_loss_meter.get_average(),
+            "lr_scheduler_state": lr_scheduler_state,
+            "grad_scaler_state": self.grad_scaler.state_dict(),
+            # the metrics can be numpy floats
+            "best_track_value": float(self.best_track_value),
+            "train_batches": self.train_batches,
+            "train_losses": train_losses,
+            "rng_states": self.get_rng_states(),
+        }
+
+    def save_checkpoint(self, filename: str, epoch_num: int, num_iterations: int):
+        checkpoint = self.get_checkpoint_state(
+            epoch_num=epoch_num, num_iterations=num_iterations
+        )
+        self.checkpoint_writer.write(checkpoint, filename)
+
+    def load_checkpoint(self, filename: str):
+        """ Restores the training from a checkpoint. The training continues from the
+        epoch and the batch after the checkpoint when ``run`` is called
+
+        Parameters
+        ----------
+        filename : str
+            A checkpoint saved by the engine
+        """
+        self.msg_printer.divider("RESUMING FROM CHECKPOINT")
+        self.checkpoint_writer.wait()
+        with self.msg_printer.loading(f"Loading the checkpoint {filename}"):
+            checkpoint = torch.load(filename, map_location="cpu")
+
+        self.model.load_state_dict(checkpoint["model_state"])
+        self.optimizer.load_state_dict(checkpoint["optimizer_state"])
+
+        # checkpoints of older versions only have the model and the optimizer.
+        # The training resumes from the next epoch
+        if "num_iterations" not in checkpoint:
+            self.start_epoch = checkpoint["epoch_num"] + 1
+            self.msg_printer.good(f"Resuming from epoch {self.start_epoch + 1}")
+            return
+
+        if self.lr_scheduler is not None and checkpoint["lr_scheduler_state"]:
+            self.lr_scheduler.load_state_dict(checkpoint["lr_scheduler_state"])
+        self.grad_scaler.load_state_dict(checkpoint["grad_scaler_state"])
+        self.set_best_track_value(checkpoint["best_track_value"])
+        self.start_epoch = checkpoint["epoch_num"]
+        self.resume_state = checkpoint
+        self.msg_printer.good(
+            f"Resuming from epoch {self.start_epoch + 1} after "
+            f"{checkpoint['num_iterations']} iterations"
+        )
+
+    def get_latest_checkpoint(self) -> Optional[pathlib.Path]:
+        """ Returns the checkpoint in ``save_dir`` that was saved last
+
+        Returns
+        -------
+        Optional[pathlib.Path]
+            The checkpoint or None if there are no checkpoints
+        """
+        self.checkpoint_writer.wait()
+        checkpoints = self.get_checkpoints()
+        if len(checkpoints) == 0:
+            return None
+        return checkpoints[-1]
+
+    def get_checkpoints(self) -> List[pathlib.Path]:
+        """ Returns the checkpoints in ``save_dir`` from the oldest to the newest
+
+        Returns
+        -------
+        List[pathlib.Path]
+            The ``model_epoch_*.pt`` files sorted by the epoch and the iteration in
+            their names. The checkpoint at the end of an epoch comes after the
+            checkpoints of the iterations of the epoch. A checkpoint that is still
+            being saved is not included
+        """
+        checkpoints = []
+        for checkpoint in self.save_dir.glob("model_epoch_*.pt"):
+            match = CHECKPOINT_FILENAME_PATTERN.fullmatch(checkpoint.name)
+            if match is None:
+                continue
+            epoch, iteration = match.groups()
+            # the modification times can be equal or lost when the files are copied
+            order = (int(epoch), float("inf") if iteration is None else int(iteration))
+            checkpoints.append((order, checkpoint))
+        return [checkpoint for _, checkpoint in sorted(checkpoints)]
+
+    @staticmethod
+    def get_rng_states() -> Dict[str, Any]:
+        numpy_state = np.random.get_state()
+        states = {
+            "random": random.getstate(),
+            # the numpy keys are stored as a tensor to keep the checkpoint free of
+            # numpy arrays
+            "numpy": (
+                numpy_state[0],
+                torch.from_numpy(numpy_state[1].astype(np.int64)),
+                int(numpy_state[2]),
+                int(numpy_state[3]),
+                float(numpy_state[4]),
+            ),
+            "torch": torch.get_rng_state(),
+        }
+        if torch.cuda.is_available():
+            states["cuda"] = torch.cuda.get_rng_state_all()
+        return states
+
+    @staticmethod
+    def set_rng_states(states: Dict[str, Any]):
+        random.setstate(states["random"])
+        numpy_state = states["numpy"]
+        np.random.set_state(
+            (
+                numpy_state[0],
+                numpy_state[1].numpy().astype(np.uint32),
+                *numpy_state[2:],
+            )
+        )
+        torch.set_rng_state(states["torch"])
+        if "cuda" in states and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all(states["cuda"])
+
     def load_model_from_file(self, filename: str):
         self.msg_printer.divider("LOADING MODEL FROM FILE")
+        self.checkpoint_writer.wait()
         with self.msg_printer.loading(f"Loading Pytorch Model from file {filename}"):
             model_chkpoint = torch.load(filename)
 
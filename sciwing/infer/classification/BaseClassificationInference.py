@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 import torch.nn as nn
 from sciwing.data.datasets_manager import DatasetsManager
+from sciwing.data.inference_bundle import InferenceBundle
 from sciwing.data.line import Line
 from sciwing.data.label import Label
 import torch
@@ -61,6 +62,28 @@ class BaseClassificationInference(metaclass=ABCMeta):
             "Loaded Best Model with loss value {0}".format(loss_value)
         )
 
+    @classmethod
+    def from_bundle(cls, model: nn.Module, bundle: InferenceBundle, **kwargs):
+        """ Makes the inference from an inference bundle. The dataset files are not
+        read. ``run_inference`` needs a test dataset and is not available
+
+        Parameters
+        ----------
+        model : nn.Module
+            A pytorch module. It is usually made with the datasets manager of
+            the bundle
+        bundle : InferenceBundle
+            The bundle with the model weights, the vocabs and the tokenizers
+        kwargs : Dict[str, Any]
+            Other arguments of the inference such as ``device``
+        """
+        return cls(
+            model=model,
+            model_filepath=bundle.model_filepath,
+            datasets_manager=bundle.get_datasets_manager(),
+            **kwargs,
+        )
+
     @abstractmethod
     def run_inference(self) -> Dict[str, Any]:
         """ Should Run inference on the test dataset
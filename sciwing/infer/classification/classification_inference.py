@@ -12,6 +12,7 @@ from typing import Any, Dict, List
 import pandas as pd
 from sciwing.data.line import Line
 from sciwing.data.label import Label
+from sciwing.utils.tensor_utils import set_packed_sequences
 from wasabi.util import MESSAGES
 
 FILES = constants.FILES
@@ -43,6 +44,7 @@ class ClassificationInference(BaseClassificationInference):
         datasets_manager: DatasetsManager,
         tokens_namespace: str = "tokens",
         normalized_probs_namespace: str = "normalized_probs",
+        use_packed_sequences: bool = True,
     ):
 
         super(ClassificationInference, self).__init__(
@@ -63,6 +65,7 @@ class ClassificationInference(BaseClassificationInference):
         )
 
         self.load_model()
+        set_packed_sequences(self.model, use_packed_sequences)
 
         self.metrics_calculator = PrecisionRecallFMeasure(
             datasets_manager=datasets_manager
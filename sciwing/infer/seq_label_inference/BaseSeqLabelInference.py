@@ -6,6 +6,7 @@ from sciwing.data.line import Line
 from sciwing.data.seq_label import SeqLabel
 import torch.nn as nn
 from sciwing.data.datasets_manager import DatasetsManager
+from sciwing.data.inference_bundle import InferenceBundle
 
 
 class BaseSeqLabelInference(metaclass=ABCMeta):
@@ -41,6 +42,28 @@ class BaseSeqLabelInference(metaclass=ABCMeta):
         self.device = device
         self.msg_printer = wasabi.Printer()
 
+    @classmethod
+    def from_bundle(cls, model: nn.Module, bundle: InferenceBundle, **kwargs):
+        """ Makes the inference from an inference bundle. The dataset files are not
+        read. ``run_inference`` needs a test dataset and is not available
+
+        Parameters
+        ----------
+        model : nn.Module
+            A pytorch module. It is usually made with the datasets manager of
+            the bundle
+        bundle : InferenceBundle
+            The bundle with the model weights, the vocabs and the tokenizers
+        kwargs : Dict[str, Any]
+            Other arguments of the inference such as ``device``
+        """
+        return cls(
+            model=model,
+            model_filepath=bundle.model_filepath,
+            datasets_manager=bundle.get_datasets_manager(),
+            **kwargs,
+        )
+
     @abstractmethod
     def run_inference(self):
         """ Should Run inference on the test dataset
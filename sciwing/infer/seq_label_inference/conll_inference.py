@@ -15,6 +15,7 @@ class Conll2003Inference(SequenceLabellingInference):
         datasets_manager: DatasetsManager,
         device: Optional[Union[str, torch.device]] = torch.device("cpu"),
         predicted_tags_namespace_prefix: str = "predicted_tags",
+        use_packed_sequences: bool = True,
     ):
         super(Conll2003Inference, self).__init__(
             model=model,
@@ -22,6 +23,7 @@ class Conll2003Inference(SequenceLabellingInference):
             datasets_manager=datasets_manager,
             device=device,
             predicted_tags_namespace_prefix=predicted_tags_namespace_prefix,
+            use_packed_sequences=use_packed_sequences,
         )
 
     def generate_predictions_for(
@@ -4,6 +4,7 @@ import torch
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.data.line import Line
 from sciwing.data.seq_label import SeqLabel
+from sciwing.utils.tensor_utils import set_packed_sequences
 from sciwing.infer.seq_label_inference.BaseSeqLabelInference import (
     BaseSeqLabelInference,
 )
@@ -25,6 +26,7 @@ class SequenceLabellingInference(BaseSeqLabelInference):
         datasets_manager: DatasetsManager,
         device: Optional[Union[str, torch.device]] = torch.device("cpu"),
         predicted_tags_namespace_prefix: str = "predicted_tags",
+        use_packed_sequences: bool = True,
     ):
         super(SequenceLabellingInference, self).__init__(
             model=model,
@@ -56,6 +58,7 @@ class SequenceLabellingInference(BaseSeqLabelInference):
         self.output_df = None
         self.batch_size = 32
         self.load_model()
+        set_packed_sequences(self.model, use_packed_sequences)
 
         self.namespace_to_unique_categories = {}
         self.namespace_to_visualizer = {}
@@ -215,20 +218,20 @@ class SequenceLabellingInference(BaseSeqLabelInference):
             max_len = max_len_pred if max_len_pred > max_len_true else max_len_true
 
             numericalizer = self.datasets_manager.namespace_to_numericalizer[namespace]
-            padded_true_tag_indices = numericalizer.pad_batch_instances(
+            padded_true_tag_indices = numericalizer.pad_batch_to_tensor(
                 instances=true_tags_indices,
                 max_length=max_len,
                 add_start_end_token=False,
             )
 
-            padded_predicted_tag_indices = numericalizer.pad_batch_instances(
+            padded_predicted_tag_indices = numericalizer.pad_batch_to_tensor(
                 instances=predicted_tag_indices,
                 max_length=max_len,
                 add_start_end_token=False,
             )
 
-            labels_mask = numericalizer.get_mask_for_batch_instances(
-                instances=padded_true_tag_indices
+            labels_mask = numericalizer.get_mask_for_batch_tensor(
+                padded_true_tag_indices
             )
             # we have to pad the true tags indices and predicted tag indices all to max length
 
@@ -265,9 +268,6 @@ class SequenceLabellingInference(BaseSeqLabelInference):
                 pred_labels = self.output_analytics[namespace]["predicted_tag_names"][
                     idx
                 ].split()
-                len_sentence = len(sentence)
-                true_labels = true_labels[:len_sentence]
-                pred_labels = pred_labels[:len_sentence]
                 stylized_string_true = self.namespace_to_visualizer[
                     namespace
                 ].visualize_tokens(sentence, true_labels)
@@ -1,4 +1,6 @@
 import numpy as np
+import torch
+from typing import Union
 
 
 class LossMeter:
@@ -6,17 +8,22 @@ class LossMeter:
         self.losses = []
         self.batch_sizes = []
 
-    def add_loss(self, avg_batch_loss: float, num_instances: int) -> None:
+    def add_loss(
+        self, avg_batch_loss: Union[float, torch.Tensor], num_instances: int
+    ) -> None:
         """ Adds the average batch loss and the num of instances in that batch to that loss
 
         Parameters
         ----------
-        avg_batch_loss : float
-            Average batch loss
+        avg_batch_loss : Union[float, torch.Tensor]
+            Average batch loss. A tensor is kept on its device without the graph and
+            is moved to the cpu only by ``get_average``
         num_instances : int
             Number of instances from the batch
 
         """
+        if isinstance(avg_batch_loss, torch.Tensor):
+            avg_batch_loss = avg_batch_loss.detach()
         self.losses.append(avg_batch_loss * num_instances)
         self.batch_sizes.append(num_instances)
 
@@ -32,7 +39,10 @@ class LossMeter:
         if len(self.losses) == 0 or len(self.batch_sizes) == 0:
             average = None  # to indicate absent value
         else:
-            average = sum(self.losses) / sum(self.batch_sizes)
+            total_loss = sum(self.losses)
+            if isinstance(total_loss, torch.Tensor):
+                total_loss = total_loss.item()
+            average = total_loss / sum(self.batch_sizes)
 
         return average
 
@@ -1,7 +1,6 @@
 import wasabi
 import numpy as np
-from typing import Dict, List, Optional
-import itertools
+from typing import Dict, List, Optional, Union
 from sklearn.metrics import confusion_matrix
 from sklearn.utils.multiclass import unique_labels
 import torch
@@ -175,10 +174,10 @@ class ClassificationMetricsUtils:
 
     @staticmethod
     def get_confusion_matrix_and_labels(
-        predicted_tag_indices: List[List[int]],
-        true_tag_indices: List[List[int]],
-        true_masked_label_indices: List[List[int]],
-        pred_labels_mask: List[List[int]] = None,
+        predicted_tag_indices: Union[List[List[int]], torch.LongTensor],
+        true_tag_indices: Union[List[List[int]], torch.LongTensor],
+        true_masked_label_indices: Union[List[List[int]], torch.BoolTensor],
+        pred_labels_mask: Union[List[List[int]], torch.BoolTensor] = None,
     ) -> (np.array, List[int]):
         """ Gets the confusion matrix and the list of classes for which the confusion matrix
         is generated
@@ -193,33 +192,43 @@ class ClassificationMetricsUtils:
         true_masked_label_indices : List[List[int]]
             Every integer is either a 0 or 1, where 1 will indicate that the
             label in `true_tag_indices` will be ignored
+        pred_labels_mask : List[List[int]]
+            The same as ``true_masked_label_indices`` for ``predicted_tag_indices``
+
+        The indices and the masks can also be tensors of the same sizes
         """
+        true_tag_indices = torch.as_tensor(true_tag_indices, dtype=torch.long).cpu()
+        predicted_tag_indices = torch.as_tensor(
+            predicted_tag_indices, dtype=torch.long
+        ).cpu()
+
         # get the masked label indices
-        true_masked_label_indices = torch.BoolTensor(true_masked_label_indices).cpu()
+        true_masked_label_indices = torch.as_tensor(
+            true_masked_label_indices, dtype=torch.bool
+        ).cpu()
 
         # select the elements in true tag indices where mask is 1
         # these classes will not be considered for calculating the metrics
         true_masked_label_indices = torch.masked_select(
-            torch.tensor(true_tag_indices, dtype=torch.long), true_masked_label_indices
+            true_tag_indices, true_masked_label_indices
         )
         true_masked_label_indices = list(set(true_masked_label_indices.tolist()))
         masked_classes = true_masked_label_indices
 
         # do the same for pred labels
         if pred_labels_mask is not None:
-            pred_mask_label_indices = torch.BoolTensor(pred_labels_mask).cpu()
+            pred_mask_label_indices = torch.as_tensor(
+                pred_labels_mask, dtype=torch.bool
+            ).cpu()
             pred_mask_label_indices = torch.masked_select(
-                torch.tensor(predicted_tag_indices, dtype=torch.long),
-                pred_mask_label_indices,
+                predicted_tag_indices, pred_mask_label_indices
             )
             pred_mask_label_indices = list(set(pred_mask_label_indices.tolist()))
             masked_classes = masked_classes + pred_mask_label_indices
 
         # get the set of unique classes
-        predicted_tags_flat = list(itertools.chain.from_iterable(predicted_tag_indices))
-        labels = list(itertools.chain.from_iterable(true_tag_indices))
-        predicted_tags_flat = np.array(predicted_tags_flat)
-        labels_numpy = np.array(labels)
+        predicted_tags_flat = predicted_tag_indices.reshape(-1).numpy()
+        labels_numpy = true_tag_indices.reshape(-1).numpy()
         classes = unique_labels(labels_numpy, predicted_tags_flat)
 
         classes = filter(lambda class_: class_ not in masked_classes, classes)
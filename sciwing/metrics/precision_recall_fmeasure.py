@@ -143,17 +143,14 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
 
         normalized_probs = model_forward_dict[self.normalized_probs_namespace]
 
-        labels_tensor = []
-        for label in labels:
-            tokens = label.tokens[self.label_namespace]
-            tokens = [tok.text for tok in tokens]
-            numericalized_instance = self.label_numericalizer.numericalize_instance(
-                instance=tokens
-            )
-
-            labels_tensor.extend(numericalized_instance)
-
-        labels_tensor = torch.LongTensor(labels_tensor)
+        # every label has a single token
+        labels_tensor = self.label_numericalizer.numericalize_batch_to_tensor(
+            instances=[
+                [tok.text for tok in label.tokens[self.label_namespace]]
+                for label in labels
+            ],
+            add_start_end_token=False,
+        )
         labels_tensor = labels_tensor.view(-1, 1)
         labels_mask = torch.zeros_like(labels_tensor).type(torch.ByteTensor)
 
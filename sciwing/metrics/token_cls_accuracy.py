@@ -54,14 +54,16 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
             The model_forward_dict should have predicted tags for every namespace
             The predicted_tags are the best possible predicted tags for the batch
             They are List[List[int]] where the size is ``[batch_size, time_steps]``
-            We expect that the predicted tags are
+            The predicted tags of every line can be of different lengths. They are
+            padded to the longest line in the batch
 
         """
 
         # get true labels for all namespaces
-        namespace_to_true_labels = defaultdict(list)
-        namespace_to_true_labels_mask = defaultdict(list)
-        namespace_to_pred_labels_mask = defaultdict(list)
+        namespace_to_true_labels = {}
+        namespace_to_true_labels_mask = {}
+        namespace_to_pred_labels_mask = {}
+        namespace_to_pred_labels = {}
 
         for namespace in self.label_namespaces:
             # List[List[int]]
@@ -70,35 +72,37 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
             )
             max_length = max([len(tags) for tags in predicted_tags])  # max num tokens
             numericalizer = self.datasets_manager.namespace_to_numericalizer[namespace]
-            pred_tags_mask = numericalizer.get_mask_for_batch_instances(
-                instances=predicted_tags
-            ).tolist()
-            namespace_to_pred_labels_mask[namespace] = pred_tags_mask
-
-            for label in labels:
-                true_labels = label.tokens[namespace]
-                true_labels = [tok.text for tok in true_labels]
-
-                true_labels = numericalizer.numericalize_instance(instance=true_labels)
-                true_labels = numericalizer.pad_instance(
-                    numericalized_text=true_labels,
-                    max_length=max_length,
-                    add_start_end_token=False,
-                )
-                labels_mask = numericalizer.get_mask_for_instance(
-                    instance=true_labels
-                ).tolist()
-                namespace_to_true_labels[namespace].append(true_labels)
-                namespace_to_true_labels_mask[namespace].append(labels_mask)
+
+            # the predicted tags for every line are as long as the line
+            # pad them to the same length before masking
+            predicted_tags = numericalizer.pad_batch_to_tensor(
+                instances=[list(tags) for tags in predicted_tags],
+                max_length=max_length,
+                add_start_end_token=False,
+            )
+            namespace_to_pred_labels[namespace] = predicted_tags
+            namespace_to_pred_labels_mask[
+                namespace
+            ] = numericalizer.get_mask_for_batch_tensor(predicted_tags)
+
+            true_labels = numericalizer.numericalize_batch_to_tensor(
+                instances=[
+                    [tok.text for tok in label.tokens[namespace]] for label in labels
+                ],
+                max_length=max_length,
+                add_start_end_token=False,
+            )
+            namespace_to_true_labels[namespace] = true_labels
+            namespace_to_true_labels_mask[
+                namespace
+            ] = numericalizer.get_mask_for_batch_tensor(true_labels)
 
         for namespace in self.label_namespaces:
             labels_ = namespace_to_true_labels[namespace]
             labels_mask_ = namespace_to_true_labels_mask[namespace]
             pred_labels_mask_ = namespace_to_pred_labels_mask[namespace]
-            # List[List[int]]
-            predicted_tags = model_forward_dict.get(
-                f"{self.predicted_tags_namespace_prefix}_{namespace}"
-            )
+            # batch_size, max_length
+            predicted_tags = namespace_to_pred_labels[namespace]
 
             (
                 confusion_mtrx,
@@ -275,8 +279,8 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
         """
 
         if labels_mask is None:
-            labels_mask = torch.zeros_like(torch.Tensor(true_tag_indices)).type(
-                torch.bool
+            labels_mask = torch.zeros_like(
+                torch.as_tensor(true_tag_indices), dtype=torch.bool
             )
 
         (
@@ -8,6 +8,7 @@ from sciwing.modules.lstm2vecencoder import LSTM2VecEncoder
 from sciwing.datasets.classification.text_classification_dataset import (
     TextClassificationDatasetManager,
 )
+from sciwing.data.inference_bundle import InferenceBundle
 from sciwing.models.simpleclassifier import SimpleClassifier
 from sciwing.infer.classification.classification_inference import (
     ClassificationInference,
@@ -33,6 +34,7 @@ class CitationIntentClassification(nn.Module):
         self.msg_printer = wasabi.Printer()
         self._download_if_required()
         self.hparams = self._get_hparams()
+        self.bundle = InferenceBundle(bundle_dir=self.final_model_dir)
         self.data_manager = self._get_data()
         self.model: nn.Module = self._get_model()
         self.infer = self._get_infer_client()
@@ -91,10 +93,22 @@ class CitationIntentClassification(nn.Module):
         return label
 
     def _get_data(self):
+        # the vocabs and the tokenizers are loaded from the inference bundle.
+        # The downloaded models do not ship one, so it is exported once from the
+        # dataset files and the dataset files are not read again
+        if self.bundle.exists():
+            return self.bundle.get_datasets_manager()
+
         data_manager = TextClassificationDatasetManager(
             train_filename=self.data_dir.joinpath("scicite.train"),
             dev_filename=self.data_dir.joinpath("scicite.dev"),
             test_filename=self.data_dir.joinpath("scicite.test"),
+            use_snapshots=True,
+        )
+        InferenceBundle.export(
+            datasets_manager=data_manager,
+            bundle_dir=self.final_model_dir,
+            model_filepath=self.final_model_dir.joinpath("best_model.pt"),
         )
         return data_manager
 
@@ -2,6 +2,7 @@ import sciwing.constants as constants
 from sciwing.datasets.classification.text_classification_dataset import (
     TextClassificationDatasetManager,
 )
+from sciwing.data.inference_bundle import InferenceBundle
 from sciwing.modules.embedders.bow_elmo_embedder import BowElmoEmbedder
 from sciwing.modules.bow_encoder import BOW_Encoder
 from sciwing.models.simpleclassifier import SimpleClassifier
@@ -28,6 +29,7 @@ class GenericSect:
         self.data_dir = pathlib.Path(DATA_DIR)
         self.msg_printer = wasabi.Printer()
         self._download_if_required()
+        self.bundle = InferenceBundle(bundle_dir=self.final_model_dir)
         self.data_manager = self._get_data()
         self.hparams = self._get_hparams()
         self.model = self._get_model()
@@ -77,6 +79,12 @@ class GenericSect:
         return prediction
 
     def _get_data(self):
+        # the vocabs and the tokenizers are loaded from the inference bundle.
+        # The downloaded models do not ship one, so it is exported once from the
+        # dataset files and the dataset files are not read again
+        if self.bundle.exists():
+            return self.bundle.get_datasets_manager()
+
         train_filename = self.data_dir.joinpath("genericSect.train")
         dev_filename = self.data_dir.joinpath("genericSect.dev")
         test_filename = self.data_dir.joinpath("genericSect.test")
@@ -85,8 +93,14 @@ class GenericSect:
             train_filename=train_filename,
             dev_filename=dev_filename,
             test_filename=test_filename,
+            use_snapshots=True,
         )
 
+        InferenceBundle.export(
+            datasets_manager=data_manager,
+            bundle_dir=self.final_model_dir,
+            model_filepath=self.model_filepath,
+        )
         return data_manager
 
     def _get_hparams(self):
@@ -8,6 +8,7 @@ from sciwing.models.rnn_seq_crf_tagger import RnnSeqCrfTagger
 from sciwing.datasets.seq_labeling.seq_labelling_dataset import (
     SeqLabellingDatasetManager,
 )
+from sciwing.data.inference_bundle import InferenceBundle
 from sciwing.infer.seq_label_inference.seq_label_inference import (
     SequenceLabellingInference,
 )
@@ -44,6 +45,7 @@ class NeuralParscit(nn.Module):
         self.msg_printer = wasabi.Printer()
         self._download_if_required()
         self.hparams = self._get_hparams()
+        self.bundle = InferenceBundle(bundle_dir=self.final_model_dir)
         self.data_manager = self._get_data()
         self.model: nn.Module = self._get_model()
         self.infer = self._get_infer_client()
@@ -129,10 +131,22 @@ class NeuralParscit(nn.Module):
             return prediction[0]
 
     def _get_data(self):
+        # the vocabs and the tokenizers are loaded from the inference bundle.
+        # The downloaded models do not ship one, so it is exported once from the
+        # dataset files and the dataset files are not read again
+        if self.bundle.exists():
+            return self.bundle.get_datasets_manager()
+
         data_manager = SeqLabellingDatasetManager(
             train_filename=self.data_dir.joinpath("parscit.train"),
             dev_filename=self.data_dir.joinpath("parscit.dev"),
             test_filename=self.data_dir.joinpath("parscit.test"),
+            use_snapshots=True,
+        )
+        InferenceBundle.export(
+            datasets_manager=data_manager,
+            bundle_dir=self.final_model_dir,
+            model_filepath=self.model_filepath,
         )
         return data_manager
 
@@ -1,5 +1,5 @@
 import torch.nn as nn
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 from allennlp.modules.conditional_random_field import ConditionalRandomField as CRF
 from allennlp.modules.conditional_random_field import allowed_transitions
 import torch
@@ -7,8 +7,11 @@ from sciwing.modules.lstm2seqencoder import Lstm2SeqEncoder
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.data.seq_label import SeqLabel
 from sciwing.data.line import Line
+from sciwing.data.collate import get_numericalized_batch
 from collections import defaultdict
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.utils.tensor_utils import get_mask, get_lines_lengths
+from sciwing.utils.crf_utils import batched_viterbi_tags
 
 
 class RnnSeqCrfTagger(nn.Module, ClassNursery):
@@ -23,6 +26,9 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
         namespace_to_constraints: Dict[str, List[Tuple[int, int]]] = None,
         tagging_type=None,
         include_start_end_trainsitions: bool = True,
+        word_tokens_namespace: str = "tokens",
+        use_batched_viterbi: bool = True,
+        top_k: int = None,
     ):
         """
 
@@ -36,6 +42,16 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
             A set of constraints that are valid transitions
         include_start_end_trainsitions: bool
             Whether to include start end transitions
+        word_tokens_namespace: str
+            The namespace of the tokens in the lines. The number of tokens in this
+            namespace decides the real length of every line. The CRF decoding and
+            the loss are masked beyond the real length
+        use_batched_viterbi: bool
+            If True, the best tags are decoded for the whole batch at once.
+            Otherwise the tags are decoded line by line using the allennlp CRF
+        top_k: int
+            If this is given, the ``top_k`` best tag sequences of every line are
+            also returned. This requires ``use_batched_viterbi``
         """
         super(RnnSeqCrfTagger, self).__init__()
         self.rnn2seqencoder = rnn2seqencoder
@@ -48,6 +64,13 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
         self.crfs = nn.ModuleDict()
         self.linear_clfs = nn.ModuleDict()
         self.include_start_end_transitions = include_start_end_trainsitions
+        self.word_tokens_namespace = word_tokens_namespace
+        self.use_batched_viterbi = use_batched_viterbi
+        self.top_k = top_k
+
+        assert (
+            self.top_k is None or self.use_batched_viterbi
+        ), "top_k decoding is only supported with use_batched_viterbi"
 
         if namespace_to_constraints is None and self.tagging_type is not None:
             namespace_to_constraints = defaultdict(list)
@@ -104,7 +127,13 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
                 Un-normalized probabilities over all the classes
                 of the shape ``[batch_size, num_classes]``
             predicted_tags: List[List[int]]
-                Set of predicted tags for the batch
+                Set of predicted tags for the batch. The tags for every line
+                are as long as the number of tokens in the line
+            top_k_tags: List[List[List[int]]]
+                The ``top_k`` best tag sequences of every line, from the best to the
+                worst. Only returned when ``top_k`` is given
+            top_k_scores: List[List[float]]
+                The viterbi scores of the ``top_k`` best tag sequences
             loss: float
                 Loss value if this is a training forward pass
                 or validation loss. There will be no loss
@@ -113,58 +142,118 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
 
         # batch size, max_num_word_tokens, hidden_dim
         encoding = self.rnn2seqencoder(lines=lines)
-        max_time_steps = encoding.size(1)
+        batch_size, max_time_steps, _ = encoding.size()
+        mask = self.get_mask_for_lines(lines=lines, max_time_steps=max_time_steps)
 
         output_dict = {}
         for namespace in self.label_namespaces:
             # batch size, time steps, num_classes
-            namespace_logits = self.linear_clfs[namespace](encoding)
-            batch_size, time_steps, _ = namespace_logits.size()
+            # the CRF always runs in fp32, also when the model runs under autocast
+            namespace_logits = self.linear_clfs[namespace](encoding).float()
             output_dict[f"logits_{namespace}"] = namespace_logits
-            predicted_tags = self.crfs[namespace].viterbi_tags(
-                logits=namespace_logits,
-                mask=torch.ones(
-                    size=(batch_size, time_steps), dtype=torch.long, device=self.device
-                ),
-            )
-            predicted_tags = [tag for tag, _ in predicted_tags]
+            with torch.autocast(device_type=encoding.device.type, enabled=False):
+                predicted_tags = self.decode(
+                    namespace=namespace,
+                    namespace_logits=namespace_logits,
+                    mask=mask,
+                    output_dict=output_dict,
+                )
             output_dict[f"predicted_tags_{namespace}"] = predicted_tags
 
         if is_training or is_validation:
-            labels_indices = defaultdict(list)
-            for label in labels:
-                for namespace in self.label_namespaces:
-                    numericalizer = self.datasets_manager.namespace_to_numericalizer[
-                        namespace
-                    ]
-                    label_ = label.tokens[namespace]
-                    label_ = [tok.text for tok in label_]
-                    label_instances = numericalizer.numericalize_instance(
-                        instance=label_
-                    )
-                    label_instances = numericalizer.pad_instance(
-                        numericalized_text=label_instances,
-                        max_length=max_time_steps,
-                        add_start_end_token=False,
-                    )
-                    label_instances = torch.tensor(
-                        label_instances, dtype=torch.long, device=self.device
-                    )
-                    labels_indices[namespace].append(label_instances)
-
             losses = []
             for namespace in self.label_namespaces:
-                labels_tensor = labels_indices[namespace]
-                labels_tensor = torch.stack(labels_tensor)
-                batch_size, time_steps = labels_tensor.size()
-                mask = torch.ones(
-                    size=(batch_size, time_steps), dtype=torch.long, device=self.device
+                labels_tensor = get_numericalized_batch(
+                    instances=labels,
+                    namespace=namespace,
+                    numericalizer=self.datasets_manager.namespace_to_numericalizer[
+                        namespace
+                    ],
+                    max_length=max_time_steps,
+                    device=self.device,
                 )
                 logits_namespace = output_dict[f"logits_{namespace}"]
-                loss_ = -self.crfs[namespace](logits_namespace, labels_tensor, mask)
+                with torch.autocast(device_type=encoding.device.type, enabled=False):
+                    loss_ = -self.crfs[namespace](logits_namespace, labels_tensor, mask)
                 losses.append(loss_)
 
             loss = sum(losses)
             output_dict["loss"] = loss
 
         return output_dict
+
+    def decode(
+        self,
+        namespace: str,
+        namespace_logits: torch.FloatTensor,
+        mask: torch.LongTensor,
+        output_dict: Dict[str, Any],
+    ) -> List[List[int]]:
+        """ Decodes the best tags of every line using the CRF of the namespace
+
+        Parameters
+        ----------
+        namespace : str
+            The label namespace
+        namespace_logits : torch.FloatTensor
+            The logits of size ``[batch_size, time_steps, num_classes]``
+        mask : torch.LongTensor
+            The mask of the real tokens of every line
+        output_dict : Dict[str, Any]
+            The ``top_k`` tags and scores are added to it when ``top_k`` is given
+
+        Returns
+        -------
+        List[List[int]]
+            The best tags for every line
+        """
+        if self.use_batched_viterbi:
+            top_k_tags = batched_viterbi_tags(
+                crf=self.crfs[namespace],
+                logits=namespace_logits,
+                mask=mask,
+                top_k=self.top_k,
+            )
+            if self.top_k is None:
+                predicted_tags = [tag for tag, _ in top_k_tags]
+            else:
+                predicted_tags = [line_tags[0][0] for line_tags in top_k_tags]
+                output_dict[f"top_k_tags_{namespace}"] = [
+                    [tag for tag, _ in line_tags] for line_tags in top_k_tags
+                ]
+                output_dict[f"top_k_scores_{namespace}"] = [
+                    [score for _, score in line_tags] for line_tags in top_k_tags
+                ]
+        else:
+            predicted_tags = self.crfs[namespace].viterbi_tags(
+                logits=namespace_logits, mask=mask
+            )
+            predicted_tags = [tag for tag, _ in predicted_tags]
+        return predicted_tags
+
+    def get_mask_for_lines(
+        self, lines: List[Line], max_time_steps: int
+    ) -> torch.LongTensor:
+        """ Returns the mask for the real tokens of every line
+
+        Parameters
+        ----------
+        lines : List[Line]
+            A list of lines
+        max_time_steps : int
+            The number of time steps in the encoding of the batch
+
+        Returns
+        -------
+        torch.LongTensor
+            A mask of size ``[batch_size, max_time_steps]`` which is 1 for the
+            real tokens of every line and 0 for the padding
+        """
+        lengths = get_lines_lengths(
+            lines=lines, namespace=self.word_tokens_namespace, max_length=max_time_steps
+        )
+        mask = get_mask(
+            batch_size=len(lines), max_size=max_time_steps, lengths=lengths
+        )
+        mask = mask.to(self.device)
+        return mask
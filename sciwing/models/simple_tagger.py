@@ -7,6 +7,7 @@ from torch.nn import CrossEntropyLoss
 from torch.nn.functional import softmax
 from sciwing.data.seq_label import SeqLabel
 from sciwing.data.line import Line
+from sciwing.data.collate import get_numericalized_batch
 from sciwing.utils.class_nursery import ClassNursery
 
 
@@ -99,27 +100,17 @@ class SimpleTagger(nn.Module, ClassNursery):
         predicted_tags = predicted_tags.indices.flatten(start_dim=1).tolist()
         output_dict[f"predicted_tags_{self.label_namespace}"] = predicted_tags
 
-        labels_indices = []
         if is_training or is_validation:
-            for label in labels:
-                numericalizer = self.datasets_manager.namespace_to_numericalizer[
-                    self.label_namespace
-                ]
-                label_ = label.tokens[self.label_namespace]
-                label_ = [tok.text for tok in label_]
-                label_instances = numericalizer.numericalize_instance(instance=label_)
-                label_instances = numericalizer.pad_instance(
-                    numericalized_text=label_instances,
-                    max_length=max_time_steps,
-                    add_start_end_token=False,
-                )
-                label_instances = torch.tensor(
-                    label_instances, dtype=torch.long, device=self.device
-                )
-                labels_indices.append(label_instances)
-
             # batch_size, num_steps
-            labels_tensor = torch.stack(labels_indices)
+            labels_tensor = get_numericalized_batch(
+                instances=labels,
+                namespace=self.label_namespace,
+                numericalizer=self.datasets_manager.namespace_to_numericalizer[
+                    self.label_namespace
+                ],
+                max_length=max_time_steps,
+                device=self.device,
+            )
             loss = self._loss(
                 input=normalized_probs.view(batch_size * max_time_steps, -1),
                 target=labels_tensor.view(-1),
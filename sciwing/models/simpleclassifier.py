@@ -3,6 +3,7 @@ from torch.nn.functional import softmax
 from torch.nn import CrossEntropyLoss
 from typing import List, Any, Dict, Union
 from sciwing.data.line import Line
+from sciwing.data.collate import get_numericalized_batch
 from sciwing.data.label import Label
 from wasabi import Printer
 from sciwing.utils.class_nursery import ClassNursery
@@ -104,7 +105,8 @@ class SimpleClassifier(nn.Module, ClassNursery):
         # N * C
         # N - batch size
         # C - number of classes
-        logits = self.classification_layer(encoding)
+        # the logits are in fp32 even when the model runs under autocast
+        logits = self.classification_layer(encoding).float()
 
         # N * C
         # N - batch size
@@ -115,16 +117,15 @@ class SimpleClassifier(nn.Module, ClassNursery):
         output_dict = {"logits": logits, "normalized_probs": normalized_probs}
 
         if is_training or is_validation:
-            label_indices = []
-            for label in labels:
-                label_ = label.tokens[self.label_namespace]
-                label_ = [tok.text for tok in label_]
-                label_ = self.label_numericalizer.numericalize_instance(instance=label_)
-                label_indices.append(label_[0])  # taking only the first label here
-
-            labels_tensor = torch.tensor(
-                label_indices, device=self.device, dtype=torch.long
+            # taking only the first label here
+            labels_tensor = get_numericalized_batch(
+                instances=labels,
+                namespace=self.label_namespace,
+                numericalizer=self.label_numericalizer,
+                max_length=1,
+                device=self.device,
             )
+            labels_tensor = labels_tensor.squeeze(1)
 
             assert labels_tensor.ndimension() == 1, self.msg_printer.fail(
                 "the labels should have 1 dimension "
@@ -3,3 +3,4 @@ from sciwing.modules.embedders.concat_embedders import ConcatEmbedders
 from sciwing.modules.embedders.bow_elmo_embedder import BowElmoEmbedder
 from sciwing.modules.embedders.bert_embedder import BertEmbedder
 from sciwing.modules.embedders.char_embedder import CharEmbedder
+from sciwing.modules.embedders.cached_embedder import CachedEmbedder
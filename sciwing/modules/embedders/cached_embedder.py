@@ -0,0 +1,155 @@
+import os
+import json
+import hashlib
+import torch
+import torch.nn as nn
+from torch.nn.utils.rnn import pad_sequence
+from typing import List, Union, Optional
+from sciwing.utils.class_nursery import ClassNursery
+from sciwing.data.line import Line
+from sciwing.data.datasets_manager import DatasetsManager
+from sciwing.modules.embedders.base_embedders import BaseEmbedder
+from sciwing.utils.embedding_cache import EmbeddingCache
+import sciwing.constants as constants
+
+PATHS = constants.PATHS
+PRECOMPUTED_EMBEDDINGS_DIR = os.path.join(
+    PATHS["EMBEDDING_CACHE_DIR"], "precomputed_embeddings"
+)
+
+
+class CachedEmbedder(nn.Module, BaseEmbedder, ClassNursery):
+    def __init__(
+        self,
+        embedder: nn.Module,
+        cache_dir: Optional[str] = PRECOMPUTED_EMBEDDINGS_DIR,
+        max_memory_items: int = 10000,
+        datasets_manager: DatasetsManager = None,
+        word_tokens_namespace: str = "tokens",
+        device: Union[str, torch.device] = torch.device("cpu"),
+        embedder_config: Optional[str] = None,
+    ):
+        """ Caches the embeddings of a frozen embedder for every line. The
+        contextual embedders like ``BowElmoEmbedder``, ``BertEmbedder`` and
+        ``FlairEmbedder`` are expensive to run. When they are not trained, the
+        embedding of a line is the same in every epoch and it is computed only once.
+
+        The cache is keyed by a hash of the tokens of the line and the configuration
+        of the embedder. Only wrap embedders whose parameters are not trained and
+        whose output is deterministic.
+
+        Parameters
+        ----------
+        embedder : nn.Module
+            The frozen embedder whose embeddings are cached
+        cache_dir : Optional[str]
+            The embeddings are also stored on the disk in a sub directory of
+            ``cache_dir`` for the embedder. They are reused across epochs and runs.
+            If None, the embeddings are cached only in memory. Then only the
+            datasets that have at most ``max_memory_items`` lines get hits in the
+            next epochs, because the lines are evicted before they are seen again
+        max_memory_items : int
+            The maximum number of lines whose embeddings are kept in memory. The
+            least recently used lines are evicted first
+        datasets_manager : DatasetsManager
+            The datasets manager which is running your experiments
+        word_tokens_namespace : str
+            The namespace where the word tokens are stored in your data
+        device : Union[str, torch.device]
+            The device on which the embeddings are returned
+        embedder_config : Optional[str]
+            A string that identifies the configuration of the embedder. By default
+            it is built from the class and the simple attributes of the embedder
+        """
+        super(CachedEmbedder, self).__init__()
+        self.embedder = embedder
+        self.datasets_manager = datasets_manager
+        self.word_tokens_namespace = word_tokens_namespace
+        self.device = torch.device(device) if isinstance(device, str) else device
+        self.embedder_name = embedder.embedder_name
+        self.embedding_dimension = self.get_embedding_dimension()
+        self.embedder_config = embedder_config or self.get_embedder_config(embedder)
+
+        config_hash = hashlib.sha1(self.embedder_config.encode("utf-8")).hexdigest()
+        self.cache_dir = (
+            os.path.join(cache_dir, config_hash[:16]) if cache_dir is not None else None
+        )
+        self.embedding_cache = EmbeddingCache(
+            embedding_dimension=self.embedding_dimension,
+            cache_dir=self.cache_dir,
+            max_memory_items=max_memory_items,
+        )
+
+    @staticmethod
+    def get_embedder_config(embedder: nn.Module) -> str:
+        """ Describes the embedder using its class and its attributes
+        that are strings, numbers or booleans
+
+        Parameters
+        ----------
+        embedder : nn.Module
+            An embedder
+
+        Returns
+        -------
+        str
+            A json string describing the embedder
+        """
+        ignored_attributes = ["training", "device", "cuda_device_id"]
+        config = {"class": embedder.__class__.__name__}
+        for name, value in vars(embedder).items():
+            if name.startswith("_") or name in ignored_attributes:
+                continue
+            if isinstance(value, (str, int, float, bool)):
+                config[name] = value
+        return json.dumps(config, sort_keys=True)
+
+    def forward(self, lines: List[Line]) -> torch.FloatTensor:
+        """ Returns the cached embeddings of the lines. The embedder is run only on
+        the lines that are not in the cache
+
+        Parameters
+        ----------
+        lines : List[Line]
+            A list of lines
+
+        Returns
+        -------
+        torch.FloatTensor
+            It returns the embedding of the size ``[batch_size, max_num_timesteps, embedding_dimension]``
+            The padding is zeros
+        """
+        texts = [
+            [token.text for token in line.tokens[self.word_tokens_namespace]]
+            for line in lines
+        ]
+        keys = [
+            EmbeddingCache.get_key(tokens=line_texts, config=self.embedder_config)
+            for line_texts in texts
+        ]
+        line_embeddings = [self.embedding_cache.get(key) for key in keys]
+
+        missing_indices = [
+            idx for idx, embedding in enumerate(line_embeddings) if embedding is None
+        ]
+        if len(missing_indices) > 0:
+            with torch.no_grad():
+                embedded = self.embedder([lines[idx] for idx in missing_indices])
+            for position, idx in enumerate(missing_indices):
+                embedding = embedded[position, : len(texts[idx])].cpu()
+                self.embedding_cache.put(keys[idx], embedding)
+                line_embeddings[idx] = embedding
+
+        # batch_size, max_num_timesteps, embedding_dimension
+        batch_embeddings = pad_sequence(line_embeddings, batch_first=True)
+        batch_embeddings = batch_embeddings.to(self.device)
+
+        for line, embeddings in zip(lines, batch_embeddings):
+            tokens = line.tokens[self.word_tokens_namespace]
+            for token, token_embedding in zip(tokens, embeddings):
+                token.set_embedding(name=self.embedder_name, value=token_embedding)
+
+        return batch_embeddings
+
+    def get_embedding_dimension(self) -> int:
+        return self.embedder.get_embedding_dimension()
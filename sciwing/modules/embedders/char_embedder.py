@@ -1,5 +1,7 @@
 import torch.nn as nn
+from torch.nn.utils.rnn import pack_padded_sequence
 from typing import List, Union
+from collections import OrderedDict
 from sciwing.modules.embedders.base_embedders import BaseEmbedder
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
@@ -16,6 +18,7 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         word_tokens_namespace: str = "tokens",
         char_tokens_namespace: str = "char_tokens",
         device: Union[str, torch.device] = torch.device("cpu"),
+        char_encodings_cache_size: int = 0,
     ):
         """ This is a character embedder that takes in lines and collates the character
         embeddings for all the tokens in the lines.
@@ -33,6 +36,11 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         hidden_dimension : int
             The hidden dimension of the LSTM which will be used to get
             character embeddings
+        char_encodings_cache_size : int
+            The maximum number of words whose encodings are cached while running
+            inference. The least recently used words are removed first. The cache
+            is cleared whenever the mode of the module changes or parameters are
+            loaded. 0 disables the cache
         """
         super(CharEmbedder, self).__init__()
         self.char_embedding_dimension = char_embedding_dimension
@@ -41,6 +49,8 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         self.datasets_manager = datasets_manager
         self.hidden_dimension = hidden_dimension
         self.device = torch.device(device) if isinstance(device, str) else device
+        self.char_encodings_cache_size = char_encodings_cache_size
+        self.char_encodings_cache: OrderedDict = OrderedDict()
 
         self.char_vocab = self.datasets_manager.namespace_to_vocab[
             self.char_tokens_namespace
@@ -74,82 +84,47 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         self.embedding_dimension = self.get_embedding_dimension()
 
     def forward(self, lines: List[Line]):
-        batch_size = len(lines)
-        token_lengths = []
-        line_lengths = []
+        # the words that are not in the word vocab are encoded as the unknown token
+        token2idx = self.word_vocab.token2idx or self.word_vocab.get_token2idx_mapping()
+        unk_token = self.word_vocab.unk_token
 
-        # find the maximum token length
+        words = []
         for line in lines:
             word_tokens = line.tokens[self.word_tokens_namespace]
-            len_tokens = [len(token.text) for token in word_tokens]
-            line_lengths.append(len(word_tokens))
-            token_lengths.extend(len_tokens)
+            line_words = [
+                token.text if token.text in token2idx else unk_token
+                for token in word_tokens
+            ]
+            words.append(line_words)
 
-        max_token_length = max(token_lengths)
+        line_lengths = [len(line_words) for line_words in words]
         max_line_length = max(line_lengths)
 
-        # numericalized version of all the characters in the lines
-        batch_numericalized = []  # batch_size * max_line_length * max_token_length
-        for line in lines:
-            word_tokens = line.tokens[self.word_tokens_namespace]
-            word_tokens = [tok.text for tok in word_tokens]
-            word_tokens_num = self.word_numericalizer.numericalize_instance(
-                instance=word_tokens
-            )
-            word_tokens_num_padded = self.word_numericalizer.pad_instance(
-                numericalized_text=word_tokens_num,
-                max_length=max_line_length,
-                add_start_end_token=False,
-            )
-            word_tokens_padded = [
-                self.word_vocab.get_token_from_idx(token)
-                for token in word_tokens_num_padded
-            ]
-
-            line_numericalized = []
-            for token in word_tokens_padded:
-                char_tokens = [char for char in token]
-                char_numericalized = self.char_numericalizer.numericalize_instance(
-                    char_tokens
-                )
-                char_numericalized = self.char_numericalizer.pad_instance(
-                    numericalized_text=char_numericalized,
-                    max_length=max_token_length,
-                    add_start_end_token=False,
-                )  # max_num_chars
-                char_numericalized = torch.tensor(
-                    char_numericalized, device=self.device, dtype=torch.long
-                )
-                line_numericalized.append(char_numericalized)
-            line_numericalized = torch.stack(
-                line_numericalized
-            )  # max_line_length * max_num_chars
-            batch_numericalized.append(line_numericalized)
-
-        batch_numericalized = torch.stack(batch_numericalized)
-        batch_numericalized = batch_numericalized.view(
-            batch_size * max_line_length, max_token_length
+        # every unique word in the batch is encoded only once
+        unique_words = list(
+            dict.fromkeys(word for line_words in words for word in line_words)
         )
+        word_to_position = dict(zip(unique_words, range(len(unique_words))))
 
-        # get embedding for every character
-
-        # batch_size * max_line_length, max_token_length, char_emb_dim
-        embedded_tokens = self.embedding(batch_numericalized)
+        # num_unique_words, embedding_dimension
+        unique_encodings = self.encode_words(unique_words)
 
-        # pass through bilstm
+        # the padding words are embedded as zeros from the last row
+        padding_position = len(unique_words)
+        padding_encoding = unique_encodings.new_zeros(1, self.embedding_dimension)
+        unique_encodings = torch.cat([unique_encodings, padding_encoding], dim=0)
 
-        # output: batch_size * max_line_length, max_token_length, num_directions * hidden_size
-        # h_n = num_layers * num_directions, batch_size, hidden_dimension
-        # c_n = num_layers * num_directions, batch_size, hidden_dimension
-        output, (h_n, c_n) = self.char_rnn(embedded_tokens)
+        word_positions = [
+            [word_to_position[word] for word in line_words]
+            + [padding_position] * (max_line_length - len(line_words))
+            for line_words in words
+        ]
+        word_positions = torch.tensor(
+            word_positions, dtype=torch.long, device=self.device
+        )
 
-        # concat forward and backward hidden states
-        forward_hidden = h_n[0, :, :]
-        backward_hidden = h_n[1, :, :]
-        encoding = torch.cat([forward_hidden, backward_hidden], dim=1)
-        encoding = encoding.view(
-            batch_size, max_line_length, -1
-        )  # batch_size, max_line_length, embedding_dimension
+        # batch_size, max_line_length, embedding_dimension
+        encoding = unique_encodings[word_positions]
 
         # set the character embeddings in the line tokens
         for idx, line in enumerate(lines):
@@ -163,5 +138,101 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
 
         return encoding
 
+    def encode_words(self, words: List[str]) -> torch.FloatTensor:
+        """ Encodes the words using the character embeddings and the bilstm.
+        While running inference, the encodings of the words are cached if
+        ``char_encodings_cache_size`` is greater than 0
+
+        Parameters
+        ----------
+        words : List[str]
+            A list of unique words
+
+        Returns
+        -------
+        torch.FloatTensor
+            The encoding of the words of size ``[num_words, embedding_dimension]``
+        """
+        if self.training or self.char_encodings_cache_size == 0:
+            return self.run_char_rnn(words)
+
+        cache = self.char_encodings_cache
+        missing_words = [word for word in words if word not in cache]
+        if len(missing_words) > 0:
+            missing_encodings = self.run_char_rnn(missing_words).detach()
+            for word, word_encoding in zip(missing_words, missing_encodings):
+                cache[word] = word_encoding
+
+        encodings = []
+        for word in words:
+            cache.move_to_end(word)
+            encodings.append(cache[word])
+        encodings = torch.stack(encodings)
+
+        while len(cache) > self.char_encodings_cache_size:
+            cache.popitem(last=False)
+
+        return encodings
+
+    def run_char_rnn(self, words: List[str]) -> torch.FloatTensor:
+        """ Runs the character bilstm over the words. The characters of the words
+        are packed, so that the lstm does not run over the padding
+
+        Parameters
+        ----------
+        words : List[str]
+            A list of words
+
+        Returns
+        -------
+        torch.FloatTensor
+            The concatenated final hidden states of the forward and the backward lstm
+            of size ``[num_words, embedding_dimension]``
+        """
+        char_lengths = [max(len(word), 1) for word in words]
+        max_token_length = max(char_lengths)
+
+        # num_words, max_token_length
+        words_numericalized = self.char_numericalizer.numericalize_batch_to_tensor(
+            instances=[list(word) for word in words],
+            max_length=max_token_length,
+            add_start_end_token=False,
+        )
+        words_numericalized = words_numericalized.to(self.device)
+
+        # num_words, max_token_length, char_emb_dim
+        embedded_tokens = self.embedding(words_numericalized)
+
+        packed_tokens = pack_padded_sequence(
+            embedded_tokens,
+            torch.tensor(char_lengths, dtype=torch.long),
+            batch_first=True,
+            enforce_sorted=False,
+        )
+
+        # h_n = num_layers * num_directions, num_words, hidden_dimension
+        # c_n = num_layers * num_directions, num_words, hidden_dimension
+        _, (h_n, c_n) = self.char_rnn(packed_tokens)
+
+        # concat forward and backward hidden states
+        forward_hidden = h_n[0, :, :]
+        backward_hidden = h_n[1, :, :]
+        encoding = torch.cat([forward_hidden, backward_hidden], dim=1)
+        return encoding
+
+    def clear_char_encodings_cache(self):
+        """ Removes all the cached encodings of the words
+        """
+        self.char_encodings_cache.clear()
+
+    def train(self, mode: bool = True):
+        # the parameters can change after training, so the cache is stale
+        self.clear_char_encodings_cache()
+        return super(CharEmbedder, self).train(mode)
+
+    def _load_from_state_dict(self, *args, **kwargs):
+        self.clear_char_encodings_cache()
+        super(CharEmbedder, self)._load_from_state_dict(*args, **kwargs)
+
     def get_embedding_dimension(self) -> int:
         return self.hidden_dimension * 2
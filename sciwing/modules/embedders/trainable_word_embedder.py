@@ -5,6 +5,7 @@ import torch
 import torch.nn as nn
 from typing import List
 from sciwing.data.line import Line
+from sciwing.data.collate import get_numericalized_batch
 from sciwing.utils.class_nursery import ClassNursery
 
 
@@ -38,15 +39,18 @@ class TrainableWordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         self.word_tokens_namespace = word_tokens_namespace
         self.device = torch.device(device) if isinstance(device, str) else device
         self.word_tokens_namespace = word_tokens_namespace
-        self.embedding_loader = EmbeddingLoader(embedding_type=embedding_type)
-        self.embedder_name = self.embedding_loader.embedding_type
-        self.embedding_dimension = self.get_embedding_dimension()
         self.vocab = self.datasets_manager.namespace_to_vocab[
             self.word_tokens_namespace
         ]
         self.numericalizer = self.datasets_manager.namespace_to_numericalizer[
             self.word_tokens_namespace
         ]
+        # only the embeddings of the tokens in the vocab are needed
+        self.embedding_loader = EmbeddingLoader(
+            embedding_type=embedding_type, vocab=self.vocab
+        )
+        self.embedder_name = self.embedding_loader.embedding_type
+        self.embedding_dimension = self.get_embedding_dimension()
         embeddings = self.embedding_loader.get_embeddings_for_vocab(self.vocab)
 
         self.embedding = nn.Embedding.from_pretrained(
@@ -57,20 +61,12 @@ class TrainableWordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         line_lengths = [len(line.tokens[self.word_tokens_namespace]) for line in lines]
         max_line_length = max(line_lengths)
 
-        numericalized_tokens = []
-        for line in lines:
-            tokens = line.tokens[self.word_tokens_namespace]
-            tokens = [tok.text for tok in tokens]
-            tokens = self.numericalizer.numericalize_instance(instance=tokens)
-            tokens = self.numericalizer.pad_instance(
-                numericalized_text=tokens,
-                max_length=max_line_length,
-                add_start_end_token=False,
-            )
-            numericalized_tokens.append(tokens)
-
-        numericalized_tokens = torch.tensor(
-            numericalized_tokens, dtype=torch.long, device=self.device
+        numericalized_tokens = get_numericalized_batch(
+            instances=lines,
+            namespace=self.word_tokens_namespace,
+            numericalizer=self.numericalizer,
+            max_length=max_line_length,
+            device=self.device,
         )
         embedding = self.embedding(numericalized_tokens)
         return embedding
@@ -1,8 +1,10 @@
 import torch.nn as nn
 import torch
+import numpy as np
 from typing import List, Union
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.line import Line
+from sciwing.data.collate import get_numericalized_batch
 from sciwing.vocab.embedding_loader import EmbeddingLoader
 from sciwing.modules.embedders.base_embedders import BaseEmbedder
 from sciwing.data.datasets_manager import DatasetsManager
@@ -15,6 +17,8 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         datasets_manager: DatasetsManager = None,
         word_tokens_namespace="tokens",
         device: Union[torch.device, str] = torch.device("cpu"),
+        restrict_to_vocab: bool = False,
+        set_token_embeddings: bool = True,
     ):
         """ Word Embedder embeds the tokens using the desired embeddings. These are static
         embeddings.
@@ -29,21 +33,61 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             The namespace where the word tokens are stored in your data
         device: Union[torch.device, str]
             The device on which this embedder is run
+        restrict_to_vocab: bool
+            If True, only the embeddings for the tokens in the vocab of the
+            ``word_tokens_namespace`` are loaded into a frozen ``nn.Embedding``.
+            The memory used is then proportional to the size of the vocab.
+            Tokens that are not in the vocab are embedded as the unknown token.
+            This requires the ``datasets_manager``
+        set_token_embeddings: bool
+            If True, the embedding of every token is also stored in the token
+            using ``Token.set_embedding``. Turn this off if only the returned
+            embeddings are used
         """
         super(WordEmbedder, self).__init__()
 
         self.embedding_type = embedding_type
         self.datasets_manager = datasets_manager
-        self.embedding_loader = EmbeddingLoader(embedding_type=self.embedding_type)
-        self.embedder_name = embedding_type
-        self.embedding_dimension = self.get_embedding_dimension()
         self.word_tokens_namespace = word_tokens_namespace
         self.device = torch.device(device) if isinstance(device, str) else device
+        self.restrict_to_vocab = restrict_to_vocab
+        self.set_token_embeddings = set_token_embeddings
+        self.vocab = None
+        self.numericalizer = None
+
+        if self.restrict_to_vocab:
+            assert (
+                self.datasets_manager is not None
+            ), "restrict_to_vocab needs the datasets_manager"
+            self.vocab = self.datasets_manager.namespace_to_vocab[
+                self.word_tokens_namespace
+            ]
+            self.numericalizer = self.datasets_manager.namespace_to_numericalizer[
+                self.word_tokens_namespace
+            ]
+
+        self.embedding_loader = EmbeddingLoader(
+            embedding_type=self.embedding_type, vocab=self.vocab
+        )
+        self.embedder_name = embedding_type
+        self.embedding_dimension = self.get_embedding_dimension()
+
+        if self.restrict_to_vocab:
+            embeddings = self.embedding_loader.get_embeddings_for_vocab(
+                vocab=self.vocab, zeros_for_missing=True
+            )
+            self.embedding = nn.Embedding.from_pretrained(
+                embeddings=embeddings, freeze=True
+            )
 
     def forward(self, lines: List[Line]) -> torch.FloatTensor:
         """ This will only consider the "tokens" present in the line. The namespace
         for the tokens is set with the class instantiation
 
+        The tokens of the batch are converted to indices once and the embeddings are
+        gathered from the embedding matrix in one operation. The tokens without an
+        embedding and the padding are embedded as zeros.
+
         Parameters
         ----------
         lines : List[Line]
@@ -55,53 +99,102 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             It returns the embedding of the size ``[batch_size, max_num_timesteps, embedding_dimension]``
 
         """
-
-        for line in lines:
-            for token in line.tokens[self.word_tokens_namespace]:
-                try:
-                    emb = self.embedding_loader.embeddings[token.text]
-                    emb = torch.tensor(emb, dtype=torch.float, device=self.device)
-                except KeyError:
-                    try:
-                        emb = self.embedding_loader.embeddings[token.text.lower()]
-                        emb = torch.tensor(emb, dtype=torch.float, device=self.device)
-                    except KeyError:
-                        emb = torch.zeros(
-                            self.embedding_dimension,
-                            device=self.device,
-                            dtype=torch.float,
-                        )
-
-                token.set_embedding(name=self.embedder_name, value=emb)
+        if self.restrict_to_vocab:
+            indices, mask = self.get_vocab_indices(lines=lines)
+            batch_embeddings = self.embedding(indices)
+        else:
+            indices, mask = self.get_embedding_indices(lines=lines)
+            indices = np.array(indices, dtype=np.int64)
+            batch_size, max_line_length = indices.shape
+            # a single gather from the (possibly memory mapped) embedding matrix
+            batch_embeddings = self.embedding_loader.vectors[indices.reshape(-1)]
+            batch_embeddings = torch.from_numpy(
+                np.asarray(batch_embeddings, dtype=np.float32)
+            )
+            batch_embeddings = batch_embeddings.view(
+                batch_size, max_line_length, self.embedding_dimension
+            ).to(self.device)
+
+        mask = torch.tensor(mask, dtype=torch.float, device=self.device)
+        batch_embeddings = batch_embeddings * mask.unsqueeze(2)
+
+        if self.set_token_embeddings:
+            for line, line_embeddings in zip(lines, batch_embeddings):
+                tokens = line.tokens[self.word_tokens_namespace]
+                for token, token_embedding in zip(tokens, line_embeddings):
+                    token.set_embedding(name=self.embedder_name, value=token_embedding)
 
         # return the [batch_size, longest_sequence, embedding_dimension]
-        # This module store all the information in the tokens and the sentences
+        return batch_embeddings
+
+    def get_embedding_indices(
+        self, lines: List[Line]
+    ) -> (List[List[int]], List[List[int]]):
+        """ Returns the rows of the embedding matrix for the tokens of the lines.
+        The tokens are looked up as they are and then in lower case.
+
+        Parameters
+        ----------
+        lines : List[Line]
 
+        Returns
+        -------
+        (List[List[int]], List[List[int]])
+            The padded indices of size ``[batch_size, max_num_timesteps]`` and a mask of
+            the same size which is 0 for the padding and the tokens without an embedding
+        """
+        word2idx = self.embedding_loader.word2idx
+        texts = [
+            [token.text for token in line.tokens[self.word_tokens_namespace]]
+            for line in lines
+        ]
+        max_line_length = max([len(line_texts) for line_texts in texts])
+
+        indices = []
+        mask = []
+        for line_texts in texts:
+            line_indices = []
+            line_mask = []
+            for text in line_texts:
+                idx = word2idx.get(text)
+                if idx is None:
+                    idx = word2idx.get(text.lower())
+                line_indices.append(0 if idx is None else idx)
+                line_mask.append(0 if idx is None else 1)
+            padding_length = max_line_length - len(line_texts)
+            indices.append(line_indices + [0] * padding_length)
+            mask.append(line_mask + [0] * padding_length)
+
+        return indices, mask
+
+    def get_vocab_indices(
+        self, lines: List[Line]
+    ) -> (torch.LongTensor, List[List[int]]):
+        """ Returns the indices of the tokens of the lines in the vocab
+
+        Parameters
+        ----------
+        lines : List[Line]
+
+        Returns
+        -------
+        (torch.LongTensor, List[List[int]])
+            The padded indices of size ``[batch_size, max_num_timesteps]`` and a mask of
+            the same size which is 0 for the padding
+        """
         line_lengths = [len(line.tokens[self.word_tokens_namespace]) for line in lines]
         max_line_length = max(line_lengths)
-
-        batch_embeddings = []
-        for idx, length in enumerate(line_lengths):
-            sentence_embedding = []
-            padding_length = max_line_length - length
-            line = lines[idx]
-            tokens = line.tokens[self.word_tokens_namespace]
-            for token in tokens:
-                token_embedding = token.get_embedding(name=self.embedder_name)
-                sentence_embedding.append(token_embedding)
-            for i in range(padding_length):
-                zeros = torch.randn(
-                    self.embedding_loader.embedding_dimension,
-                    device=self.device,
-                    dtype=torch.float,
-                )
-                sentence_embedding.append(zeros)
-
-            sentence_embedding = torch.stack(sentence_embedding)
-            batch_embeddings.append(sentence_embedding)
-
-        batch_embeddings = torch.stack(batch_embeddings)
-        return batch_embeddings
+        indices = get_numericalized_batch(
+            instances=lines,
+            namespace=self.word_tokens_namespace,
+            numericalizer=self.numericalizer,
+            max_length=max_line_length,
+            device=self.device,
+        )
+        mask = [
+            [1] * length + [0] * (max_line_length - length) for length in line_lengths
+        ]
+        return indices, mask
 
     def get_embedding_dimension(self) -> int:
         return self.embedding_loader.embedding_dimension
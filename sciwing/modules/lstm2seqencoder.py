@@ -1,8 +1,10 @@
 import torch
 import torch.nn as nn
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 import wasabi
 from typing import List
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.utils.tensor_utils import get_lines_lengths
 from sciwing.data.line import Line
 
 
@@ -19,6 +21,8 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         device: torch.device = torch.device("cpu"),
         add_projection_layer: bool = True,
         projection_activation: str = "Tanh",
+        word_tokens_namespace: str = "tokens",
+        use_packed_sequences: bool = False,
     ):
         """Encodes a set of tokens to a set of hidden states.
 
@@ -48,6 +52,12 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
             Adds a projection layer after the lstm over the hidden activation
         projection_activation: str
             Refer to torch.nn activations. Use any class name as a projection here
+        word_tokens_namespace: str
+            The namespace of the tokens in the lines. The real length of every line
+            is the number of tokens in this namespace
+        use_packed_sequences: bool
+            If True, the lines are packed according to their real lengths before
+            passing them through the LSTM. The LSTM then does not run over the padding
         """
         super(Lstm2SeqEncoder, self).__init__()
         self.embedder = embedder
@@ -64,6 +74,8 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         self.msg_printer = wasabi.Printer()
         self.add_projection_layer = add_projection_layer
         self.projection_activation = projection_activation
+        self.word_tokens_namespace = word_tokens_namespace
+        self.use_packed_sequences = use_packed_sequences
         self.projection_activation_module = getattr(
             torch.nn, self.projection_activation
         )()
@@ -130,7 +142,21 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         # output = batch_size, sequence_length, num_directions * hidden_size
         # h_n = num_layers * num_directions, batch_size, hidden_dimension
         # c_n = num_layers * num_directions, batch_size, hidden_dimension
-        output, (_, _) = self.rnn(embeddings, (h0, c0))
+        if self.use_packed_sequences:
+            lengths = get_lines_lengths(
+                lines=lines,
+                namespace=self.word_tokens_namespace,
+                max_length=seq_length,
+            )
+            packed_embeddings = pack_padded_sequence(
+                embeddings, lengths, batch_first=True, enforce_sorted=False
+            )
+            packed_output, (_, _) = self.rnn(packed_embeddings, (h0, c0))
+            output, _ = pad_packed_sequence(
+                packed_output, batch_first=True, total_length=seq_length
+            )
+        else:
+            output, (_, _) = self.rnn(embeddings, (h0, c0))
 
         if self.bidirectional:
             output = output.view(batch_size, seq_length, self.num_directions, -1)
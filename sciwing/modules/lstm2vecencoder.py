@@ -1,9 +1,11 @@
 import torch
 import torch.nn as nn
+from torch.nn.utils.rnn import pack_padded_sequence
 import wasabi
 from typing import Union, List
 from sciwing.data.line import Line
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.utils.tensor_utils import get_lines_lengths
 
 
 class LSTM2VecEncoder(nn.Module, ClassNursery):
@@ -16,6 +18,8 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         combine_strategy: str = "concat",
         rnn_bias: bool = True,
         device: Union[str, torch.device] = torch.device("cpu"),
+        word_tokens_namespace: str = "tokens",
+        use_packed_sequences: bool = False,
     ):
         """LSTM2Vec encoder that encodes a series of tokens to a single vector representation
 
@@ -35,6 +39,13 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
             Whether to use the bias layer in RNN. Should be set to false only for debugging purposes
         device : Union[str, torch.device]
             The device on which the model is run
+        word_tokens_namespace: str
+            The namespace of the tokens in the lines. The real length of every line
+            is the number of tokens in this namespace
+        use_packed_sequences: bool
+            If True, the lines are packed according to their real lengths before
+            passing them through the LSTM. The final hidden state is then the state
+            after the last real token of every line and not after the padding
         """
         super(LSTM2VecEncoder, self).__init__()
         self.embedder = embedder
@@ -49,6 +60,8 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         self.rnn_bias = rnn_bias
         self.device = torch.device(device) if isinstance(device, str) else device
         self.msg_printer = wasabi.Printer()
+        self.word_tokens_namespace = word_tokens_namespace
+        self.use_packed_sequences = use_packed_sequences
 
         assert (
             self.combine_strategy in self.allowed_combine_strategies
@@ -102,6 +115,16 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         # output = batch_size, sequence_length, num_layers * num_directions
         # h_n = num_layers * num_directions, batch_size, hidden_dimension
         # c_n = num_layers * num_directions, batch_size, hidden_dimension
+        if self.use_packed_sequences:
+            lengths = get_lines_lengths(
+                lines=lines,
+                namespace=self.word_tokens_namespace,
+                max_length=embedded_tokens.size(1),
+            )
+            embedded_tokens = pack_padded_sequence(
+                embedded_tokens, lengths, batch_first=True, enforce_sorted=False
+            )
+
         output, (h_n, c_n) = self.rnn(embedded_tokens, (h0, c0))
 
         # for a discourse on bi-directional RNNs and LSTMS
@@ -1,4 +1,5 @@
-from typing import List
+import itertools
+from typing import List, Dict, Optional, Union
 from sciwing.vocab.vocab import Vocab
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 import torch
@@ -17,9 +18,38 @@ class Numericalizer(BaseNumericalizer):
         super().__init__(vocabulary)
         self.vocabulary = vocabulary
 
-        if vocabulary and not self.vocabulary.vocab:
+        if vocabulary and not self.vocabulary.is_built():
             self.vocabulary.build_vocab()
 
+    def get_special_indices(self) -> Dict[str, Optional[int]]:
+        """ Returns the indices of the start, end, pad and unk tokens. They are looked
+        up once and cached until the vocabulary changes
+
+        Returns
+        -------
+        Dict[str, Optional[int]]
+            The mapping from ``start``, ``end``, ``pad`` and ``unk`` to the index of
+            the token. The index is None when the token is not in the vocab
+        """
+        if self._special_indices is None:
+            vocabulary = self.vocabulary
+            token2idx = self.get_token2idx()
+            self._special_indices = {
+                "start": token2idx.get(vocabulary.start_token),
+                "end": token2idx.get(vocabulary.end_token),
+                "pad": token2idx.get(vocabulary.pad_token),
+                "unk": token2idx.get(vocabulary.unk_token),
+            }
+        return self._special_indices
+
+    def get_token2idx(self) -> Dict[str, int]:
+        vocabulary = self.vocabulary
+        if not vocabulary.is_built():
+            raise ValueError("Please build the vocab first")
+        if not vocabulary.token2idx:
+            vocabulary.token2idx = vocabulary.get_token2idx_mapping()
+        return vocabulary.token2idx
+
     def numericalize_instance(self, instance: List[str]) -> List[int]:
         """ Numericalize a single instance
 
@@ -34,16 +64,9 @@ class Numericalizer(BaseNumericalizer):
         List[int]
             Numericalized instance
         """
-        numerical_tokens = []
-        len_tokens = len(instance)
-
-        for string in instance:
-            idx = self.vocabulary.get_idx_from_token(string)
-            numerical_tokens.append(idx)
-
-        assert len(numerical_tokens) == len_tokens
-
-        return numerical_tokens
+        token2idx = self.get_token2idx()
+        unk_token_idx = self.get_special_indices()["unk"]
+        return [token2idx.get(token, unk_token_idx) for token in instance]
 
     def numericalize_batch_instances(
         self, instances: List[List[str]]
@@ -61,12 +84,41 @@ class Numericalizer(BaseNumericalizer):
             A list of numericalized instances
 
         """
-        numerical_tokens_batch = []
-        for instance in instances:
-            tokens = self.numericalize_instance(instance)
-            numerical_tokens_batch.append(tokens)
+        token2idx = self.get_token2idx()
+        unk_token_idx = self.get_special_indices()["unk"]
+        return [
+            [token2idx.get(token, unk_token_idx) for token in instance]
+            for instance in instances
+        ]
+
+    def numericalize_batch_to_tensor(
+        self,
+        instances: List[List[str]],
+        max_length: Optional[int] = None,
+        add_start_end_token: bool = False,
+    ) -> torch.LongTensor:
+        """ Numericalizes and pads a batch of instances into a single tensor
 
-        return numerical_tokens_batch
+        Parameters
+        ----------
+        instances : List[List[str]]
+            A list of tokenized sentences
+        max_length : Optional[int]
+            The length of every instance in the tensor. The longest instance decides
+            the length when it is None
+        add_start_end_token : bool
+            If true, start and end token will be added to every instance
+
+        Returns
+        -------
+        torch.LongTensor
+            The indices of size ``[batch_size, max_length]``
+        """
+        return self.pad_batch_to_tensor(
+            instances=self.numericalize_batch_instances(instances),
+            max_length=max_length,
+            add_start_end_token=add_start_end_token,
+        )
 
     def pad_instance(
         self,
@@ -92,23 +144,18 @@ class Numericalizer(BaseNumericalizer):
             Padded instance
 
         """
-        start_token_idx = self.vocabulary.get_idx_from_token(
-            self.vocabulary.start_token
-        )
-        end_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.end_token)
-        pad_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.pad_token)
+        special_indices = self.get_special_indices()
 
         if not add_start_end_token:
             numericalized_text = numericalized_text[:max_length]
         else:
             max_length = max_length if max_length > 2 else 2
             numericalized_text = numericalized_text[: max_length - 2]
-            numericalized_text.append(end_token_idx)
-            numericalized_text.insert(0, start_token_idx)
+            numericalized_text.append(special_indices["end"])
+            numericalized_text.insert(0, special_indices["start"])
 
         pad_length = max_length - len(numericalized_text)
-        for i in range(pad_length):
-            numericalized_text.append(pad_token_idx)
+        numericalized_text.extend([special_indices["pad"]] * pad_length)
 
         assert len(numericalized_text) == max_length
 
@@ -142,6 +189,70 @@ class Numericalizer(BaseNumericalizer):
             padded_instances.append(padded_instance)
         return padded_instances
 
+    def pad_batch_to_tensor(
+        self,
+        instances: List[Union[List[int], torch.LongTensor]],
+        max_length: Optional[int] = None,
+        add_start_end_token: bool = False,
+    ) -> torch.LongTensor:
+        """ Pads a batch of numericalized instances into a single tensor. The indices
+        of all the instances are copied into the tensor at once
+
+        Parameters
+        ----------
+        instances : List[Union[List[int], torch.LongTensor]]
+            The numericalized instances. Either all of them are lists or all of them
+            are tensors
+        max_length : Optional[int]
+            The length of every instance in the tensor. The longest instance decides
+            the length when it is None
+        add_start_end_token : bool
+            If true, start and end token will be added to every instance
+
+        Returns
+        -------
+        torch.LongTensor
+            The indices of size ``[batch_size, max_length]``. The padding has the
+            index of the pad token
+        """
+        special_indices = self.get_special_indices()
+        pad_token_idx = special_indices["pad"]
+        pad_token_idx = 0 if pad_token_idx is None else pad_token_idx
+        num_special = 2 if add_start_end_token else 0
+
+        if max_length is None:
+            max_length = max([len(instance) for instance in instances], default=0)
+            max_length += num_special
+        max_length = max(max_length, num_special)
+        num_tokens = max_length - num_special
+
+        instances = [instance[:num_tokens] for instance in instances]
+        lengths = torch.tensor(
+            [len(instance) for instance in instances], dtype=torch.long
+        )
+        padded = torch.full(
+            (len(instances), max_length), pad_token_idx, dtype=torch.long
+        )
+
+        if len(instances) > 0 and isinstance(instances[0], torch.Tensor):
+            indices = torch.cat(instances)
+        else:
+            indices = list(itertools.chain.from_iterable(instances))
+            indices = torch.tensor(indices, dtype=torch.long)
+
+        # positions of the tokens in every row, after the start token if any
+        offset = 1 if add_start_end_token else 0
+        positions = torch.arange(max_length)
+        ends = lengths.unsqueeze(1) + offset
+        tokens_mask = (positions >= offset) & (positions < ends)
+        padded[tokens_mask] = indices
+
+        if add_start_end_token:
+            padded[:, 0] = special_indices["start"]
+            padded.scatter_(1, ends, special_indices["end"])
+
+        return padded
+
     @property
     def vocabulary(self):
         return self._vocabulary
@@ -149,28 +260,38 @@ class Numericalizer(BaseNumericalizer):
     @vocabulary.setter
     def vocabulary(self, value):
         self._vocabulary = value
+        self._special_indices = None
 
     def get_mask_for_instance(self, instance: List[int]) -> torch.BoolTensor:
-        start_token_idx = self.vocabulary.get_idx_from_token(
-            self.vocabulary.start_token
-        )
-        end_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.end_token)
-        pad_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.pad_token)
-        unk_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.unk_token)
-        masked_tokens = [start_token_idx, end_token_idx, pad_token_idx, unk_token_idx]
-
-        assert len(set(masked_tokens)) == 4
-        mask = [1 if token in masked_tokens else 0 for token in instance]
-        mask = torch.BoolTensor(mask)
-        return mask
+        return self.get_mask_for_batch_tensor(torch.tensor(instance, dtype=torch.long))
 
     def get_mask_for_batch_instances(
         self, instances: List[List[int]]
     ) -> torch.BoolTensor:
-        masks = []
-        for instance in instances:
-            mask = self.get_mask_for_instance(instance=instance).tolist()
-            masks.append(mask)
+        return self.get_mask_for_batch_tensor(
+            torch.tensor(instances, dtype=torch.long)
+        )
+
+    def get_mask_for_batch_tensor(
+        self, instances: torch.LongTensor
+    ) -> torch.BoolTensor:
+        """ Returns the mask for a tensor of indices. The mask is True where the index
+        is of the start, end, pad or unk token
+
+        Parameters
+        ----------
+        instances : torch.LongTensor
+            Numericalized instances of any size
 
-        masks = torch.BoolTensor(masks)
-        return masks
+        Returns
+        -------
+        torch.BoolTensor
+            The mask of the same size as ``instances``
+        """
+        masked_tokens = list(self.get_special_indices().values())
+        assert len(set(masked_tokens)) == 4
+
+        mask = torch.zeros_like(instances, dtype=torch.bool)
+        for token_idx in masked_tokens:
+            mask |= instances == token_idx
+        return mask
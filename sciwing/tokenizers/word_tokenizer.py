@@ -1,12 +1,66 @@
 import spacy
-from typing import List
+import inspect
+from typing import List, Dict, Any
 from wasabi import Printer
 from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
 from sciwing.utils.custom_spacy_tokenizers import CustomSpacyWhiteSpaceTokenizer
 
+# spacy models are expensive to load. They are loaded when they are first used
+# and are shared by all the word tokenizers of the same type
+SPACY_MODELS: Dict[str, "spacy.language.Language"] = {}
+
+
+def get_spacy_model(tokenizer: str) -> "spacy.language.Language":
+    """ Returns the spacy model for a type of word tokenizer. The model is loaded
+    only once
+
+    Parameters
+    ----------
+    tokenizer : str
+        ``spacy`` or ``spacy-whitespace``
+
+    Returns
+    -------
+    spacy.language.Language
+    """
+    if tokenizer not in SPACY_MODELS:
+        nlp = spacy.load("en_core_web_sm", disable=["parser", "tagger", "ner"])
+        if tokenizer == "spacy-whitespace":
+            nlp.tokenizer = CustomSpacyWhiteSpaceTokenizer(nlp.vocab)
+        SPACY_MODELS[tokenizer] = nlp
+    return SPACY_MODELS[tokenizer]
+
+
+def get_pipe_kwargs(
+    nlp: "spacy.language.Language", batch_size: int, n_process: int
+) -> Dict[str, Any]:
+    """ Returns the keyword arguments of ``nlp.pipe`` for the installed spacy.
+    ``n_process`` is available from spacy 2.2.2. The older versions, like the
+    pinned 2.1, take ``n_threads`` instead
+
+    Parameters
+    ----------
+    nlp : spacy.language.Language
+        The spacy model
+    batch_size : int
+        The number of texts that are processed together
+    n_process : int
+        The number of processes or threads
+
+    Returns
+    -------
+    Dict[str, Any]
+    """
+    pipe_parameters = inspect.signature(nlp.pipe).parameters
+    if "n_process" in pipe_parameters:
+        return {"batch_size": batch_size, "n_process": n_process}
+    return {"batch_size": batch_size, "n_threads": n_process}
+
 
 class WordTokenizer(BaseTokenizer):
-    def __init__(self, tokenizer: str = "spacy"):
+    def __init__(
+        self, tokenizer: str = "spacy", batch_size: int = 1000, n_process: int = 1
+    ):
         """ WordTokenizers split the text into tokens
 
         Parameters
@@ -23,6 +77,10 @@ class WordTokenizer(BaseTokenizer):
             spacy-whtiespace
                 Same as vanilla but implemented using custom white space tokenizer from spacy
 
+        batch_size : int
+            The number of texts that spacy tokenizes together in ``tokenize_batch``
+        n_process : int
+            The number of processes that spacy uses in ``tokenize_batch``
 
         """
         super(WordTokenizer, self).__init__()
@@ -33,14 +91,15 @@ class WordTokenizer(BaseTokenizer):
             f"The word tokenizer can be {self.allowed_tokenizers}"
         )
 
-        if self.tokenizer == "spacy" or "spacy-whitespace":
-            self.nlp = spacy.load("en_core_web_sm")
-            self.nlp.remove_pipe("parser")
-            self.nlp.remove_pipe("tagger")
-            self.nlp.remove_pipe("ner")
+        self.batch_size = batch_size
+        self.n_process = n_process
 
-        if self.tokenizer == "spacy-whitespace":
-            self.nlp.tokenizer = CustomSpacyWhiteSpaceTokenizer(self.nlp.vocab)
+    @property
+    def nlp(self):
+        # the spacy model is loaded only for the spacy tokenizers
+        if self.tokenizer not in ["spacy", "spacy-whitespace"]:
+            return None
+        return get_spacy_model(self.tokenizer)
 
     def tokenize(self, text: str) -> List[str]:
         """ Tokenize text into a set of tokens
@@ -68,7 +127,8 @@ class WordTokenizer(BaseTokenizer):
             return tokens
 
     def tokenize_batch(self, texts: List[str]) -> List[List[str]]:
-        """ Tokenize a batch of sentences
+        """ Tokenize a batch of sentences. The spacy tokenizers process the
+        batch using ``nlp.pipe``
 
         Parameters
         ----------
@@ -79,6 +139,19 @@ class WordTokenizer(BaseTokenizer):
         List[List[str]]
 
         """
+        if self.tokenizer == "spacy" or self.tokenizer == "spacy-whitespace":
+            nlp = self.nlp
+            docs = nlp.pipe(
+                texts,
+                **get_pipe_kwargs(
+                    nlp, batch_size=self.batch_size, n_process=self.n_process
+                ),
+            )
+            return [
+                [token.text for token in doc if bool(token.text.strip())]
+                for doc in docs
+            ]
+
         tokenized = []
         for text in texts:
             tokenized.append(self.tokenize(text))
@@ -0,0 +1,159 @@
+import torch
+from allennlp.modules.conditional_random_field import ConditionalRandomField
+from typing import List, Tuple, Optional, Union
+
+
+def get_constrained_transitions(
+    crf: ConditionalRandomField, num_tags: int
+) -> (torch.FloatTensor, torch.FloatTensor, torch.FloatTensor):
+    """ Returns the transition, start and end scores of the crf with the
+    constraints applied. Transitions that are not allowed get a score of ``-10000``.
+    This follows what is done in ``ConditionalRandomField.viterbi_tags``
+
+    Parameters
+    ----------
+    crf : ConditionalRandomField
+        An allennlp conditional random field
+    num_tags : int
+        The number of tags of the crf
+
+    Returns
+    -------
+    (torch.FloatTensor, torch.FloatTensor, torch.FloatTensor)
+        The transitions of size ``[num_tags, num_tags]``, the start transitions
+        of size ``[num_tags]`` and the end transitions of size ``[num_tags]``
+    """
+    start_tag = num_tags
+    end_tag = num_tags + 1
+    constraint_mask = crf._constraint_mask.detach().float()
+    tags_constraint_mask = constraint_mask[:num_tags, :num_tags]
+    start_constraint_mask = constraint_mask[start_tag, :num_tags]
+    end_constraint_mask = constraint_mask[:num_tags, end_tag]
+
+    transitions = crf.transitions.detach() * tags_constraint_mask + -10000.0 * (
+        1 - tags_constraint_mask
+    )
+    if crf.include_start_end_transitions:
+        start_transitions = crf.start_transitions.detach() * start_constraint_mask
+        end_transitions = crf.end_transitions.detach() * end_constraint_mask
+    else:
+        start_transitions = torch.zeros_like(start_constraint_mask)
+        end_transitions = torch.zeros_like(end_constraint_mask)
+
+    start_transitions = start_transitions + -10000.0 * (1 - start_constraint_mask)
+    end_transitions = end_transitions + -10000.0 * (1 - end_constraint_mask)
+
+    return transitions, start_transitions, end_transitions
+
+
+def batched_viterbi_tags(
+    crf: ConditionalRandomField,
+    logits: torch.FloatTensor,
+    mask: torch.Tensor,
+    top_k: Optional[int] = None,
+) -> Union[List[Tuple[List[int], float]], List[List[Tuple[List[int], float]]]]:
+    """ Viterbi decoding for a whole batch at once
+
+    ``ConditionalRandomField.viterbi_tags`` decodes one line at a time. This runs the
+    max-plus recursion over all the lines of the batch together. The constraints,
+    the start and end transitions of the crf are honoured the same way as
+    ``ConditionalRandomField.viterbi_tags``.
+
+    Parameters
+    ----------
+    crf : ConditionalRandomField
+        An allennlp conditional random field
+    logits : torch.FloatTensor
+        The emission scores of size ``[batch_size, max_time_steps, num_tags]``
+    mask : torch.Tensor
+        A mask of size ``[batch_size, max_time_steps]`` which is 1 for the real
+        tokens and 0 for the padding. Every line should have at least one token
+    top_k : Optional[int]
+        If this is given, the ``top_k`` best paths are returned for every line
+
+    Returns
+    -------
+    Union[List[Tuple[List[int], float]], List[List[Tuple[List[int], float]]]]
+        If ``top_k`` is None, the best path and its score for every line, like
+        ``ConditionalRandomField.viterbi_tags``. Otherwise a list of at most ``top_k``
+        ``(path, score)`` tuples for every line, ordered from the best to the worst.
+        The paths are trimmed to the length of the lines
+    """
+    num_paths = 1 if top_k is None else top_k
+    logits = logits.detach()
+    batch_size, max_time_steps, num_tags = logits.size()
+    transitions, start_transitions, end_transitions = get_constrained_transitions(
+        crf=crf, num_tags=num_tags
+    )
+    transitions = transitions.to(logits.device, logits.dtype)
+    start_transitions = start_transitions.to(logits.device, logits.dtype)
+    end_transitions = end_transitions.to(logits.device, logits.dtype)
+    mask = mask.bool()
+    lengths = mask.long().sum(dim=1)
+
+    # batch_size, num_paths, num_tags
+    # Only the first path is valid at the beginning of the line
+    scores = (start_transitions.view(1, num_tags) + logits[:, 0, :]).unsqueeze(1)
+    if num_paths > 1:
+        invalid_paths = scores.new_full(
+            (batch_size, num_paths - 1, num_tags), float("-inf")
+        )
+        scores = torch.cat([scores, invalid_paths], dim=1)
+
+    # a backpointer that points every (path, tag) to itself
+    # used to carry the best paths through the padding
+    identity_backpointer = torch.arange(
+        num_paths * num_tags, dtype=torch.long, device=logits.device
+    )
+    identity_backpointer = identity_backpointer.view(1, num_paths, num_tags).expand(
+        batch_size, num_paths, num_tags
+    )
+
+    backpointers = []
+    for time_step in range(1, max_time_steps):
+        # batch_size, num_paths * num_tags (previous), num_tags (current)
+        candidates = scores.unsqueeze(3) + transitions.view(1, 1, num_tags, num_tags)
+        candidates = candidates.view(batch_size, num_paths * num_tags, num_tags)
+
+        # batch_size, num_paths, num_tags
+        best_scores, best_previous = candidates.topk(num_paths, dim=1)
+        best_scores = best_scores + logits[:, time_step, :].unsqueeze(1)
+
+        time_step_mask = mask[:, time_step].view(batch_size, 1, 1)
+        scores = torch.where(time_step_mask, best_scores, scores)
+        backpointers.append(
+            torch.where(time_step_mask, best_previous, identity_backpointer)
+        )
+
+    # batch_size, num_paths * num_tags
+    final_scores = scores + end_transitions.view(1, 1, num_tags)
+    final_scores = final_scores.view(batch_size, num_paths * num_tags)
+    best_final_scores, best_final_states = final_scores.topk(num_paths, dim=1)
+
+    # follow the backpointers from the end of the lines to the beginning
+    states = best_final_states
+    path_tags = [states % num_tags]
+    for backpointer in reversed(backpointers):
+        backpointer = backpointer.reshape(batch_size, num_paths * num_tags)
+        states = backpointer.gather(1, states)
+        path_tags.append(states % num_tags)
+    path_tags.reverse()
+
+    # batch_size, num_paths, max_time_steps
+    paths = torch.stack(path_tags, dim=2).tolist()
+    path_scores = best_final_scores.tolist()
+    lengths = lengths.tolist()
+
+    best_paths = []
+    for line_paths, line_scores, length in zip(paths, path_scores, lengths):
+        line_best_paths = [
+            (path[:length], score)
+            for path, score in zip(line_paths, line_scores)
+            if score != float("-inf")
+        ]
+        best_paths.append(line_best_paths)
+
+    if top_k is None:
+        best_paths = [line_best_paths[0] for line_best_paths in best_paths]
+
+    return best_paths
@@ -0,0 +1,235 @@
+import os
+import json
+import glob
+import uuid
+import socket
+import hashlib
+import numpy as np
+import torch
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        embedding_dimension: int,
+        cache_dir: Optional[str] = None,
+        max_memory_items: int = 10000,
+        shard_name: Optional[str] = None,
+    ):
+        """ A cache of embeddings keyed by strings. The most recently used embeddings
+        are kept in memory. If a ``cache_dir`` is given, all the embeddings are also
+        written to shards on the disk and read back using memory maps.
+
+        Every writer appends to its own shard. A shard has a ``.data`` file with the
+        float32 rows of all the embeddings and a ``.index`` file with a json line
+        ``[key, start_row, num_rows]`` for every embedding. The indices of all
+        the shards in the directory are read when the cache is created. So a
+        cache directory can be filled by many processes and read by others.
+
+        Parameters
+        ----------
+        embedding_dimension : int
+            The dimension of the embeddings that are stored
+        cache_dir : Optional[str]
+            The directory where the shards are stored. If this is None, the embeddings
+            are only cached in memory
+        max_memory_items : int
+            The maximum number of embeddings that are kept in memory. The least
+            recently used embeddings are removed first
+        shard_name : Optional[str]
+            The name of the shard that this cache writes to. A unique name is
+            generated if this is not given
+        """
+        self.embedding_dimension = embedding_dimension
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.shard_name = shard_name or "{0}_{1}_{2}".format(
+            socket.gethostname(), os.getpid(), uuid.uuid4().hex[:8]
+        )
+
+        self.memory_cache: OrderedDict = OrderedDict()
+
+        # key -> (shard_name, start_row, num_rows)
+        self.index: Dict[str, Tuple[str, int, int]] = {}
+        self.shard_memmaps: Dict[str, np.memmap] = {}
+        self.data_fp = None
+        self.index_fp = None
+        self.num_shard_rows = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.load_index()
+            data_filename = self.get_data_filename(self.shard_name)
+            if os.path.isfile(data_filename):
+                num_bytes = os.path.getsize(data_filename)
+                self.num_shard_rows = num_bytes // (4 * self.embedding_dimension)
+
+    @staticmethod
+    def get_key(tokens: List[str], config: str = "") -> str:
+        """ Returns the key for a sequence of tokens
+
+        Parameters
+        ----------
+        tokens : List[str]
+            The tokens of a line
+        config : str
+            A string that describes the embedder which embeds the tokens
+
+        Returns
+        -------
+        str
+            A hash of the tokens and the config
+        """
+        return hashlib.sha1(json.dumps([config, tokens]).encode("utf-8")).hexdigest()
+
+    def get_data_filename(self, shard_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{shard_name}.data")
+
+    def get_index_filename(self, shard_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{shard_name}.index")
+
+    def load_index(self):
+        """ Reads the index of all the shards in the ``cache_dir``
+        """
+        for index_filename in glob.glob(os.path.join(self.cache_dir, "*.index")):
+            shard_name = os.path.splitext(os.path.basename(index_filename))[0]
+            with open(index_filename, "r") as fp:
+                for line in fp:
+                    try:
+                        key, start_row, num_rows = json.loads(line)
+                    except ValueError:
+                        # the last line of a shard might be partially written
+                        continue
+                    self.index[key] = (shard_name, start_row, num_rows)
+
+    def get_shard_rows(self, shard_name: str, end_row: int) -> np.memmap:
+        memmap = self.shard_memmaps.get(shard_name)
+        if memmap is None or memmap.shape[0] < end_row:
+            # the shard has grown since it was mapped
+            memmap = np.memmap(
+                self.get_data_filename(shard_name), dtype=np.float32, mode="r"
+            )
+            memmap = memmap.reshape(-1, self.embedding_dimension)
+            self.shard_memmaps[shard_name] = memmap
+        return memmap
+
+    def get(self, key: str) -> Optional[torch.FloatTensor]:
+        """ Returns the embedding for the key
+
+        Parameters
+        ----------
+        key : str
+            The key of the embedding
+
+        Returns
+        -------
+        Optional[torch.FloatTensor]
+            The embedding of size ``[num_rows, embedding_dimension]`` or None if
+            the key is not in the cache
+        """
+        embedding = self.memory_cache.get(key)
+        if embedding is not None:
+            self.memory_cache.move_to_end(key)
+            self.memory_hits += 1
+            return embedding
+
+        if key in self.index:
+            shard_name, start_row, num_rows = self.index[key]
+            if num_rows == 0:
+                embedding = torch.zeros(0, self.embedding_dimension)
+            else:
+                rows = self.get_shard_rows(shard_name, start_row + num_rows)
+                embedding = torch.from_numpy(
+                    np.array(rows[start_row : start_row + num_rows])
+                )
+            self.add_to_memory(key, embedding)
+            self.disk_hits += 1
+            return embedding
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, embedding: torch.FloatTensor):
+        """ Stores the embedding for the key
+
+        Parameters
+        ----------
+        key : str
+            The key of the embedding
+        embedding : torch.FloatTensor
+            The embedding of size ``[num_rows, embedding_dimension]``
+        """
+        embedding = embedding.detach().cpu().float()
+        self.add_to_memory(key, embedding)
+
+        if self.cache_dir is None or key in self.index:
+            return
+
+        if self.data_fp is None:
+            self.data_fp = open(self.get_data_filename(self.shard_name), "ab")
+            self.index_fp = open(self.get_index_filename(self.shard_name), "a")
+
+        num_rows = embedding.size(0)
+        self.data_fp.write(np.ascontiguousarray(embedding.numpy()).tobytes())
+        self.data_fp.flush()
+
+        # the index is written after the data, so that every indexed row exists
+        self.index_fp.write(json.dumps([key, self.num_shard_rows, num_rows]) + "\n")
+        self.index_fp.flush()
+
+        self.index[key] = (self.shard_name, self.num_shard_rows, num_rows)
+        self.num_shard_rows += num_rows
+
+    def add_to_memory(self, key: str, embedding: torch.FloatTensor):
+        if self.max_memory_items == 0:
+            return
+        self.memory_cache[key] = embedding
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.max_memory_items:
+            self.memory_cache.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.memory_cache or key in self.index
+
+    def __len__(self) -> int:
+        return len(set(self.memory_cache.keys()).union(self.index.keys()))
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def get_stats(self) -> Dict[str, int]:
+        """ Returns the hits and misses of the cache
+
+        Returns
+        -------
+        Dict[str, int]
+            The number of ``hits``, ``memory_hits``, ``disk_hits`` and ``misses``
+        """
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def clear_memory(self):
+        """ Removes all the embeddings from memory. The embeddings on the disk are kept
+        """
+        self.memory_cache.clear()
+
+    def close(self):
+        """ Closes the files of the shard that is written by this cache
+        """
+        if self.data_fp is not None:
+            self.data_fp.close()
+            self.index_fp.close()
+            self.data_fp = None
+            self.index_fp = None
+        self.shard_memmaps = {}
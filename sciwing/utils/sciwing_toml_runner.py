@@ -14,11 +14,15 @@ import networkx as nx
 import copy
 import wasabi
 import pathlib
+from sciwing.modules.embedders.cached_embedder import PRECOMPUTED_EMBEDDINGS_DIR
 import sciwing.constants as constants
 
 PATHS = constants.PATHS
 DATA_DIR = PATHS["DATA_DIR"]
 
+# embedders that are not trained and whose embeddings can be cached
+CACHEABLE_EMBEDDERS = ["BowElmoEmbedder", "BertEmbedder", "FlairEmbedder"]
+
 
 class SciWingTOMLRunner:
     def __init__(self, toml_filename: pathlib.Path, infer: bool = False):
@@ -34,6 +38,7 @@ class SciWingTOMLRunner:
         self.model_section = None
         self.dataset_section = None
         self.engine_section = None
+        self.embedding_cache_section = None
         self.model = None
         self.engine = None
         self.model_dag = nx.DiGraph()
@@ -63,9 +68,12 @@ class SciWingTOMLRunner:
         self.experiment_name = experiment_section.get("exp_name")
         self.experiment_dir = pathlib.Path(experiment_section.get("exp_dir"))
 
+        # a training that is resumed continues in the existing experiment directory
+        is_resumed = self.doc.get("engine", {}).get("resume_from") is not None
         if not self.infer:
             if self.experiment_dir.is_dir():
-                raise FileExistsError(f"{self.experiment_dir} already exists")
+                if not is_resumed:
+                    raise FileExistsError(f"{self.experiment_dir} already exists")
             else:
                 self.experiment_dir.mkdir(parents=True)
         else:
@@ -83,6 +91,13 @@ class SciWingTOMLRunner:
         # get the engine section from toml
         self.engine = self.parse_engine_section()
 
+    def parse_dataset_and_model(self):
+        """ Parses only the dataset and the model section of the toml file.
+        The experiment directory is neither created nor checked
+        """
+        self.datasets_manager = self.parse_dataset_section()
+        self.model = self.parse_model_section()
+
     def parse_dataset_section(self):
         """ Parse the dataset section of the toml file and instantiate the dataset
 
@@ -127,6 +142,27 @@ class SciWingTOMLRunner:
             "namespace_vocab_options": namespace_vocab_options,
             "namespace_numericalizer_map": namespace_numericalizer_map,
         }
+
+        # stores the datasets as arrays of token ids instead of lines
+        compact = dataset_section.get("compact")
+        if compact is not None:
+            args["compact"] = compact
+
+        # reads the examples from the files only when they are accessed
+        lazy = dataset_section.get("lazy")
+        if lazy is not None:
+            args["lazy"] = lazy
+
+        # reuses the tokenized datasets and the vocabs of earlier runs
+        use_snapshots = dataset_section.get("use_snapshots")
+        if use_snapshots is not None:
+            args["use_snapshots"] = use_snapshots
+
+        # tokenizes the lines of the datasets in a pool of processes
+        num_processes = dataset_section.get("num_processes")
+        if num_processes is not None:
+            args["num_processes"] = num_processes
+
         try:
             dataset_cls = create_class(
                 classname=dataset_classname,
@@ -245,6 +281,10 @@ class SciWingTOMLRunner:
                     module_name=ClassNursery.class_nursery[classname],
                 )
                 cls_obj = cls_obj(**class_args)
+                if tag == "embedder":
+                    cls_obj = self.wrap_embedder_with_cache(
+                        classname=classname, embedder=cls_obj
+                    )
                 self.model_dag.nodes[node_id]["instantiated_class"] = {
                     "key": tag,
                     "object": cls_obj,
@@ -308,6 +348,54 @@ class SciWingTOMLRunner:
 
         return self.model_dag.nodes[root_nodename]["instantiated_class"]["object"]
 
+    def wrap_embedder_with_cache(self, classname: str, embedder: nn.Module):
+        """ Wraps the embedder with a ``CachedEmbedder`` if the toml file has an
+        ``embedding_cache`` section and the embedder is one of the embedders to cache.
+
+        The ``embedding_cache`` section can have the following keys
+
+        cache_dir
+            The directory where the embeddings are stored on the disk.
+            Defaults to a directory inside the embedding cache of sciwing
+        max_memory_items
+            The maximum number of lines whose embeddings are kept in memory
+        embedders
+            The class names of the embedders to cache.
+            Defaults to the frozen contextual embedders
+
+        Parameters
+        ----------
+        classname : str
+            The class name of the embedder
+        embedder : nn.Module
+            The instantiated embedder
+
+        Returns
+        -------
+        nn.Module
+            The embedder, wrapped with ``CachedEmbedder`` if it has to be cached
+        """
+        embedding_cache_section = self.doc.get("embedding_cache")
+        if embedding_cache_section is None:
+            return embedder
+
+        self.embedding_cache_section = embedding_cache_section
+        embedders_to_cache = embedding_cache_section.get(
+            "embedders", CACHEABLE_EMBEDDERS
+        )
+        if classname not in embedders_to_cache:
+            return embedder
+
+        cache_dir = embedding_cache_section.get("cache_dir", PRECOMPUTED_EMBEDDINGS_DIR)
+        max_memory_items = embedding_cache_section.get("max_memory_items", 10000)
+        return CachedEmbedder(
+            embedder=embedder,
+            cache_dir=cache_dir,
+            max_memory_items=max_memory_items,
+            datasets_manager=self.datasets_manager,
+            device=getattr(embedder, "device", "cpu"),
+        )
+
     def parse_model_section(self):
         """ Parses the Model section of the toml file
 
@@ -1,5 +1,7 @@
 import torch
-from typing import Union
+import torch.nn as nn
+from typing import Union, Sequence
+from sciwing.data.line import Line
 
 
 def has_tensor(obj) -> bool:
@@ -72,13 +74,54 @@ def get_mask(batch_size: int, max_size: int, lengths: torch.LongTensor):
         Mask having 1 where there are no paddings and 0 where there are paddings
     """
     assert batch_size == lengths.size(0)
-    mask = []
+    time_steps = torch.arange(max_size, dtype=torch.long, device=lengths.device)
+    mask = time_steps.unsqueeze(0) < lengths.unsqueeze(1)
+    mask = mask.long()
+    return mask
 
-    for length in lengths:
-        zero_row = torch.zeros(max_size, dtype=torch.long)
-        zero_row[: length.item()] = 1
-        mask.append(zero_row.unsqueeze(0))
 
-    mask = torch.cat(mask, dim=0)
-    mask = torch.LongTensor(mask)
-    return mask
+def get_lines_lengths(
+    lines: Sequence[Line], namespace: str, max_length: int
+) -> torch.LongTensor:
+    """ Returns the real number of tokens of every line in a namespace
+
+    Parameters
+    ----------
+    lines : Sequence[Line]
+        The lines of a batch. The lengths of the lines collated by
+        ``NumericalizingCollator`` are used as they are
+    namespace : str
+        The namespace of the tokens
+    max_length : int
+        The number of time steps in the embedding of the batch. The lengths
+        are clipped to this value
+
+    Returns
+    -------
+    torch.LongTensor
+        The lengths of the lines of size ``[batch_size]``. Lines without any
+        tokens are given a length of 1. The lengths are always on cpu
+    """
+    lengths = getattr(lines, "lengths", {}).get(namespace)
+    if lengths is None:
+        lengths = torch.tensor(
+            [len(line.tokens[namespace]) for line in lines], dtype=torch.long
+        )
+    return lengths.clamp(min=1, max=max_length)
+
+
+def set_packed_sequences(model: nn.Module, use_packed_sequences: bool = True):
+    """ Switches the packed sequence mode of all the encoders in the model
+    that support it. With packed sequences, the encoders run only over the real
+    tokens of every line and not over the padding
+
+    Parameters
+    ----------
+    model : nn.Module
+        The model whose encoders are switched
+    use_packed_sequences : bool
+        Whether the encoders should pack the lines according to their lengths
+    """
+    for module in model.modules():
+        if hasattr(module, "use_packed_sequences"):
+            module.use_packed_sequences = use_packed_sequences
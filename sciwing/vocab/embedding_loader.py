@@ -1,6 +1,6 @@
 import os
 import sciwing.constants as constants
-from typing import Dict, Union
+from typing import Dict, Union, Iterator, Mapping, List, Set
 import numpy as np
 from tqdm import tqdm
 from wasabi import Printer
@@ -13,20 +13,62 @@ PATHS = constants.PATHS
 EMBEDDING_CACHE_DIR = PATHS["EMBEDDING_CACHE_DIR"]
 
 
+class EmbeddingsView(Mapping):
+    def __init__(self, word2idx: Dict[str, int], vectors: np.ndarray):
+        """ A read only mapping from a word to its embedding. The embeddings are
+        rows of a single matrix which can be memory mapped from the disk.
+
+        Parameters
+        ----------
+        word2idx : Dict[str, int]
+            A mapping from a word to its row in ``vectors``
+        vectors : np.ndarray
+            The embedding matrix of size ``[num_words, embedding_dimension]``
+        """
+        self.word2idx = word2idx
+        self.vectors = vectors
+
+    def __getitem__(self, word: str) -> np.ndarray:
+        return self.vectors[self.word2idx[word]]
+
+    def __contains__(self, word) -> bool:
+        return word in self.word2idx
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.word2idx)
+
+    def __len__(self) -> int:
+        return len(self.word2idx)
+
+
 class EmbeddingLoader:
     """
     This handles the loading of word embeddings for a vocab
     This can handle different kinds of embeddings.
 
+    The text embeddings (glove and lample conll) are converted once to a binary store
+    next to the text file. The store has a vocab file with one word per line and a
+    ``.npy`` file with a float32 matrix where the ith row is the embedding of the
+    ith word. The matrix is memory mapped on load, which makes loading fast and
+    shares the memory between the processes using the same embeddings.
+
+    If a vocab is given, only the embeddings of the tokens in the vocab and their
+    lower cased forms are kept. They are copied to memory and the rest of the
+    embeddings are never read.
+
     """
 
-    def __init__(self, embedding_type: Union[str] = "glove_6B_50"):
+    def __init__(
+        self, embedding_type: Union[str] = "glove_6B_50", vocab: Vocab = None
+    ):
         """
 
         Parameters
         ----------
         embedding_type : str
             The type of embedding that needs to be loaded
+        vocab : Vocab
+            If this is given, only the embeddings for the tokens of the vocab are kept
         """
         self.embedding_dimension = None
         self.embedding_type = embedding_type
@@ -47,7 +89,13 @@ class EmbeddingLoader:
         self.embedding_filename = self.get_preloaded_filename()
         self.vocab_embedding = {}  # stores the embedding for all words in vocab
         self.msg_printer = Printer()
-        self._embeddings: Dict[str, np.array] = {}
+        self.vocab = vocab
+        self.words_to_keep: Set[str] = None
+        if self.vocab is not None:
+            self.words_to_keep = self.get_words_to_keep(self.vocab)
+        self.word2idx: Dict[str, int] = {}
+        self.vectors: np.ndarray = None
+        self._embeddings: Mapping[str, np.ndarray] = {}
 
         if "glove" in self.embedding_type:
             self._embeddings = self.load_glove_embedding()
@@ -80,7 +128,135 @@ class EmbeddingLoader:
 
         return filename
 
-    def load_glove_embedding(self) -> Dict[str, np.array]:
+    @staticmethod
+    def get_words_to_keep(vocab: Vocab) -> Set[str]:
+        """ Returns the tokens of the vocab along with their lower cased forms
+
+        Parameters
+        ----------
+        vocab : Vocab
+            The vocab whose embeddings are needed
+
+        Returns
+        -------
+        Set[str]
+            The set of words whose embeddings should be kept
+        """
+        words_to_keep = set()
+        for token in vocab.get_idx2token_mapping().values():
+            words_to_keep.add(token)
+            words_to_keep.add(token.lower())
+        return words_to_keep
+
+    def set_embeddings_store(
+        self, words: List[str], vectors: np.ndarray
+    ) -> EmbeddingsView:
+        """ Sets the words and their embeddings. If a vocab was given, only the
+        words in the vocab are kept
+
+        Parameters
+        ----------
+        words : List[str]
+            The words in the order of the rows of ``vectors``
+        vectors : np.ndarray
+            The embedding matrix of size ``[num_words, embedding_dimension]``
+
+        Returns
+        -------
+        EmbeddingsView
+            A mapping from the words to their embeddings
+        """
+        if self.words_to_keep is not None:
+            kept_indices = [
+                idx for idx, word in enumerate(words) if word in self.words_to_keep
+            ]
+            words = [words[idx] for idx in kept_indices]
+            # only the rows that are kept are read and copied to memory
+            vectors = np.array(vectors[kept_indices], dtype=np.float32).reshape(
+                len(kept_indices), self.embedding_dimension
+            )
+
+        self.word2idx = dict(zip(words, range(len(words))))
+        self.vectors = vectors
+        return EmbeddingsView(word2idx=self.word2idx, vectors=self.vectors)
+
+    def get_binary_store_filenames(self) -> (str, str):
+        """ Returns the filenames of the binary store for the text embeddings
+
+        Returns
+        -------
+        (str, str)
+            The filename of the vocab file and the filename of the ``.npy``
+            embedding matrix
+        """
+        basename, _ = os.path.splitext(self.embedding_filename)
+        vocab_filename = f"{basename}.vocab.txt"
+        vectors_filename = f"{basename}.vectors.npy"
+        return vocab_filename, vectors_filename
+
+    def convert_text_to_binary_store(self, embedding_dim: int):
+        """ Converts the text embedding file to the binary store. This needs to
+        be done only once for every embedding type
+
+        Parameters
+        ----------
+        embedding_dim : int
+            The dimension of the embeddings in the text file
+        """
+        vocab_filename, vectors_filename = self.get_binary_store_filenames()
+        words = []
+        vectors = []
+        with open(self.embedding_filename, "r", encoding="utf-8") as fp:
+            for line in tqdm(
+                fp, desc=f"Converting embeddings from file {self.embedding_filename}"
+            ):
+                values = line.split()
+                if len(values) != embedding_dim + 1:
+                    continue
+                words.append(values[0])
+                vectors.append(np.asarray(values[1:], dtype=np.float32))
+
+        vectors = np.stack(vectors)
+
+        # write to temporary files and rename them, so that processes which
+        # load the embeddings at the same time never see a partial store
+        tmp_vectors_filename = f"{vectors_filename}.{os.getpid()}.tmp"
+        tmp_vocab_filename = f"{vocab_filename}.{os.getpid()}.tmp"
+        with open(tmp_vectors_filename, "wb") as fp:
+            np.save(fp, vectors)
+        with open(tmp_vocab_filename, "w", encoding="utf-8") as fp:
+            fp.write("\n".join(words))
+        os.replace(tmp_vectors_filename, vectors_filename)
+        os.replace(tmp_vocab_filename, vocab_filename)
+
+    def load_binary_store(self, embedding_dim: int) -> EmbeddingsView:
+        """ Loads the binary store of the text embeddings. The store is created
+        from the text file if it does not exist
+
+        Parameters
+        ----------
+        embedding_dim : int
+            The dimension of the embeddings
+
+        Returns
+        -------
+        EmbeddingsView
+            A mapping from the words to their embeddings
+        """
+        vocab_filename, vectors_filename = self.get_binary_store_filenames()
+        if not (os.path.isfile(vocab_filename) and os.path.isfile(vectors_filename)):
+            with self.msg_printer.loading(
+                f"Converting {self.embedding_type} embeddings to a binary store"
+            ):
+                self.convert_text_to_binary_store(embedding_dim=embedding_dim)
+
+        with open(vocab_filename, "r", encoding="utf-8") as fp:
+            words = fp.read().split("\n")
+
+        vectors = np.load(vectors_filename, mmap_mode="r")
+        return self.set_embeddings_store(words=words, vectors=vectors)
+
+    def load_glove_embedding(self) -> Mapping[str, np.ndarray]:
         """
         Imports the glove embedding
         Loads the word embedding for words in the vocabulary
@@ -89,61 +265,64 @@ class EmbeddingLoader:
         """
         embedding_dim = int(self.embedding_type.split("_")[-1])
         self.embedding_dimension = embedding_dim
-        glove_embeddings: Dict[str, np.array] = {}
-        with self.msg_printer.loading("Loading GLOVE embeddings"):
-            with open(self.embedding_filename, "r") as fp:
-                for line in tqdm(
-                    fp,
-                    desc="Loading embeddings from file {0}".format(self.embedding_type),
-                ):
-                    values = line.split()
-                    word = values[0]
-                    embedding = np.array([float(value) for value in values[1:]])
-                    glove_embeddings[word] = embedding
-
-        return glove_embeddings
-
-    def load_parscit_embedding(self) -> Dict[str, np.array]:
+        return self.load_binary_store(embedding_dim=embedding_dim)
+
+    def load_parscit_embedding(self) -> Mapping[str, np.ndarray]:
         pretrained = gensim.models.KeyedVectors.load(self.embedding_filename, mmap="r")
         self.embedding_dimension = 500
-        return pretrained
+        return self.set_embeddings_store(
+            words=pretrained.index2word, vectors=pretrained.vectors
+        )
 
-    def load_lample_conll_embedding(self) -> Dict[str, np.array]:
+    def load_lample_conll_embedding(self) -> Mapping[str, np.ndarray]:
         embedding_dim = 100
         self.embedding_dimension = embedding_dim
-        lample_conll_embedding: Dict[str, np.array] = {}
-        with open(self.embedding_filename, "r") as fp:
-            for line in tqdm(
-                fp,
-                desc=f"Loading Lample CoNLL embedding from file {self.embedding_filename}",
-            ):
-                values = line.split()
-                word = values[0]
-                embedding = values[1:]
-                embedding = list(map(lambda value: float(value), embedding))
-                embedding = np.array(embedding)
-                lample_conll_embedding[word] = embedding
-        return lample_conll_embedding
-
-    def get_embeddings_for_vocab(self, vocab: Vocab) -> torch.FloatTensor:
+        return self.load_binary_store(embedding_dim=embedding_dim)
+
+    def get_embeddings_for_vocab(
+        self, vocab: Vocab, zeros_for_missing: bool = False
+    ) -> torch.FloatTensor:
+        """ Returns the embeddings for all the tokens in the vocab. The tokens that
+        are not found in the embeddings are looked up in lower case. If they are
+        still not found, they are initialized from a normal distribution
+
+        Parameters
+        ----------
+        vocab : Vocab
+            The vocab for which the embeddings are needed
+        zeros_for_missing : bool
+            If True, the tokens without embeddings get zeros instead of values
+            from the normal distribution
+
+        Returns
+        -------
+        torch.FloatTensor
+            The embeddings of size ``[vocab_len, embedding_dimension]``
+        """
         idx2item = vocab.get_idx2token_mapping()
         len_vocab = len(idx2item)
-        embeddings = []
+        embedding_indices = []
         for idx in range(len_vocab):
             item = idx2item.get(idx)
-            try:
-                # try getting the embeddings from the embeddings dictionary
-                emb = self._embeddings[item]
-            except KeyError:
-                try:
-                    # try lowercasing the item and getting the embedding
-                    emb = self._embeddings[item.lower()]
-                except KeyError:
-                    # nothing is working, lets fill it with random integers from normal dist
-                    emb = np.random.randn(self.embedding_dimension)
-            embeddings.append(emb)
-
-        embeddings = torch.tensor(embeddings, dtype=torch.float)
+            embedding_idx = self.word2idx.get(item)
+            if embedding_idx is None:
+                embedding_idx = self.word2idx.get(item.lower(), -1)
+            embedding_indices.append(embedding_idx)
+
+        embedding_indices = np.array(embedding_indices, dtype=np.int64)
+        found = embedding_indices >= 0
+
+        embeddings = np.zeros((len_vocab, self.embedding_dimension), np.float32)
+        embeddings[found] = self.vectors[embedding_indices[found]]
+
+        # nothing is working for the rest, fill them with values from normal dist.
+        # The values are drawn only for the missing tokens and in the order of the
+        # vocab, as many as drawing them one token at a time
+        if not zeros_for_missing:
+            num_missing = int((~found).sum())
+            embeddings[~found] = np.random.randn(num_missing, self.embedding_dimension)
+
+        embeddings = torch.from_numpy(embeddings)
         return embeddings
 
     @property
@@ -151,5 +330,11 @@ class EmbeddingLoader:
         return self._embeddings
 
     @embeddings.setter
-    def embeddings(self, value):
-        self._embeddings = value
+    def embeddings(self, value: Mapping[str, np.ndarray]):
+        words = list(value.keys())
+        self.word2idx = dict(zip(words, range(len(words))))
+        if len(words) > 0:
+            self.vectors = np.stack([value[word] for word in words]).astype(np.float32)
+        else:
+            self.vectors = np.zeros((0, self.embedding_dimension), dtype=np.float32)
+        self._embeddings = EmbeddingsView(word2idx=self.word2idx, vectors=self.vectors)
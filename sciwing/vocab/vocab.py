@@ -1,14 +1,20 @@
-from typing import List, Dict, Tuple, Optional, Callable
+from typing import List, Dict, Tuple, Optional, Callable, Iterable, Any
 from collections import Counter
 from operator import itemgetter
 import json
 import os
+import struct
+import numpy as np
 from wasabi import Printer
 import wasabi
-from copy import deepcopy
 from sciwing.data.token import Token
 from sciwing.utils.common import flatten
 
+# vocabs with a store location that has this extension are stored in the compact
+# binary format instead of json
+COMPACT_VOCAB_EXTENSION = ".vocab"
+COMPACT_VOCAB_MAGIC = b"SCIWVOC1"
+
 
 class Vocab:
     def __init__(
@@ -25,6 +31,7 @@ class Vocab:
         max_instance_length: int = 100,
         include_special_vocab: bool = True,
         preprocessing_pipeline: List[Callable] = None,
+        token_counts: Optional[Dict[str, int]] = None,
     ):
         """
 
@@ -70,6 +77,10 @@ class Vocab:
             You can add a set of callables that take in a list of
             str and return a list of str for pre-processing. For
             example methods look at instance_preprocessing module in sciwing.preprocessing
+        token_counts: Optional[Dict[str, int]]
+            The number of times every token occurs. If this is given, the vocab is
+            built from the counts and the instances are not needed. The counts
+            should already be preprocessed
         """
 
         self.instances = instances
@@ -80,6 +91,14 @@ class Vocab:
         self.start_token = start_token
         self.end_token = end_token
         self.special_token_freq = special_token_freq
+        # the lengths and the highest index of the vocabs are cached. They are
+        # reset whenever the vocabs are set
+        self.vocab_len = None
+        self.orig_vocab_len = None
+        self.max_idx = None
+        # the arrays read from a compact vocab file. The mappings are made
+        # from them only when they are used
+        self.compact_state = None
         self.vocab = None
         self.orig_vocab = None
         self.idx2token = None
@@ -88,6 +107,7 @@ class Vocab:
         self.max_instance_length = max_instance_length
         self.include_special_vocab = include_special_vocab
         self.preprocessing_pipeline = preprocessing_pipeline
+        self.token_counts = token_counts
 
         self.msg_printer = Printer()
 
@@ -122,22 +142,81 @@ class Vocab:
                 self.instances = self.apply_preprocessing()
 
     def apply_preprocessing(self):
-        instances = deepcopy(self.instances)
+        # the preprocessors return new instances. So the instances are not copied
+        instances = self.instances
         for preprocessor in self.preprocessing_pipeline:
             instances = preprocessor(instances)
 
         return instances
 
+    @staticmethod
+    def count_tokens(
+        instances: Iterable[List[str]],
+        preprocessing_pipeline: Optional[List[Callable]] = None,
+        counter: Optional[Counter] = None,
+    ) -> Counter:
+        """ Counts the tokens of a set of instances in a single pass. The counts of
+        different shards of a corpus can be counted separately and merged using
+        ``from_counters``
+
+        Parameters
+        ----------
+        instances : Iterable[List[str]]
+            The tokenized instances
+        preprocessing_pipeline : Optional[List[Callable]]
+            The preprocessors that are applied to every instance before counting
+        counter : Optional[Counter]
+            If given, the counts are added to this counter instead of a new one
+
+        Returns
+        -------
+        Counter
+            The number of times every token occurs
+        """
+        if counter is None:
+            counter = Counter()
+        for instance in instances:
+            instance = [
+                token.text if isinstance(token, Token) else token for token in instance
+            ]
+            for preprocessor in preprocessing_pipeline or []:
+                instance = preprocessor(instance)
+            counter.update(instance)
+        return counter
+
+    @classmethod
+    def from_counters(cls, counters: Iterable[Dict[str, int]], **kwargs) -> "Vocab":
+        """ Makes a vocab from the token counts of several shards of a corpus.
+        The counts are added and the vocab is made from the total counts
+
+        Parameters
+        ----------
+        counters : Iterable[Dict[str, int]]
+            The token counts of every shard. For example from ``count_tokens``
+        kwargs : Dict[str, Any]
+            The other options of the vocab such as ``min_count``
+
+        Returns
+        -------
+        Vocab
+            The vocab. ``build_vocab`` has to be called to build it
+        """
+        token_counts = Counter()
+        for counter in counters:
+            token_counts.update(counter)
+        return cls(token_counts=token_counts, **kwargs)
+
     def map_tokens_to_freq_idx(self) -> Dict[str, Tuple[int, int]]:
         """
         Build vocab from instances
         return the word -> (freq, idx)
         :return:
         """
-        all_tokens = deepcopy(self.instances)
-
-        # counter will map a list to Dict[str, count] values
-        counter = Counter(all_tokens)
+        if self.token_counts is not None:
+            counter = Counter(self.token_counts)
+        else:
+            # counter will map a list to Dict[str, count] values
+            counter = Counter(self.instances)
 
         # order the order in decreasing order of their frequencies
         # List[Tuple]
@@ -206,26 +285,21 @@ class Vocab:
         :param token: type str
         :return:
         """
-        try:
-            vocab = self.vocab
-        except AttributeError:
+        if self.vocab is None:
             self.msg_printer.fail("Please build vocab using build vocab")
-        tokens = vocab.keys()
-        indices = [idx for freq, idx in vocab.values()]
-        indices = sorted(indices, reverse=True)
-        highest_idx = indices[0]
-
-        if token not in tokens:
-            self.vocab[token] = (1, highest_idx + 1)
-            self.idx2token[highest_idx + 1] = token
-            self.token2idx[token] = highest_idx + 1
+
+        if token not in self.vocab:
+            idx = self.get_max_idx() + 1
+            self.vocab[token] = (1, idx)
+            self.idx2token[idx] = token
+            self.token2idx[token] = idx
+            self.max_idx = idx
+            self.vocab_len = None
             if save_vocab:
                 self.save_to_file(self.store_location)  # this can be expensive.
 
     def add_tokens(self, tokens: List[str]):
-        try:
-            vocab = self.vocab
-        except AttributeError:
+        if self.vocab is None:
             self.msg_printer.fail("Please build vocab first")
 
         for token in tokens:
@@ -241,18 +315,22 @@ class Vocab:
             self.msg_printer.good(
                 "Loaded vocab from file {0}".format(self.store_location)
             )
-            self.vocab = vocab_object.vocab
-            self.orig_vocab = vocab_object.orig_vocab
-            self.idx2token = vocab_object.idx2token
-            self.token2idx = vocab_object.token2idx
-            vocab = vocab_object.vocab
+            if vocab_object.compact_state is not None:
+                self.set_compact_state(vocab_object.compact_state)
+            else:
+                self.vocab = vocab_object.vocab
+                self.orig_vocab = vocab_object.orig_vocab
+                self.idx2token = vocab_object.idx2token
+                self.token2idx = vocab_object.token2idx
+            vocab = self.vocab
 
         else:
             self.msg_printer.info("BUILDING VOCAB")
             vocab = self.map_tokens_to_freq_idx()
 
-            # dictionary are passed by reference. Be careful
-            self.orig_vocab = deepcopy(vocab)
+            # dictionary are passed by reference. Be careful. The values are
+            # tuples that are replaced and not changed. So a shallow copy is enough
+            self.orig_vocab = dict(vocab)
 
             # set max num of tokens to maximum possible if it is not set
             if self.max_num_tokens is None:
@@ -269,19 +347,53 @@ class Vocab:
                 self.save_to_file(self.store_location)
         return vocab
 
+    def is_built(self) -> bool:
+        return bool(self._vocab) or self.compact_state is not None
+
     def get_vocab_len(self) -> int:
-        if not self.vocab:
+        if not self.is_built():
             raise ValueError("Build vocab first by calling build_vocab()")
 
-        length = len(set(idx for freq, idx in self.vocab.values()))
-        return length
+        if self.vocab_len is None:
+            if self._vocab is None:
+                indices = self.compact_state["indices"]
+                self.vocab_len = len(np.unique(indices[indices >= 0]))
+            else:
+                self.vocab_len = len(set(idx for freq, idx in self.vocab.values()))
+        return self.vocab_len
 
     def get_orig_vocab_len(self) -> int:
+        if self._orig_vocab is None and self.compact_state is not None:
+            if self.orig_vocab_len is None:
+                orig_indices = self.compact_state["orig_indices"]
+                self.orig_vocab_len = len(np.unique(orig_indices[orig_indices >= 0]))
+            return self.orig_vocab_len
+
         if not self.orig_vocab:
             raise ValueError("Build vocab first by calling build_vocab()")
 
-        length = len(set(idx for freq, idx in self.orig_vocab.values()))
-        return length
+        if self.orig_vocab_len is None:
+            self.orig_vocab_len = len(
+                set(idx for freq, idx in self.orig_vocab.values())
+            )
+        return self.orig_vocab_len
+
+    def get_max_idx(self) -> int:
+        """ Returns the highest index of the vocab. New tokens are added after it
+
+        Returns
+        -------
+        int
+        """
+        if not self.is_built():
+            raise ValueError("Build vocab first by calling build_vocab()")
+
+        if self.max_idx is None:
+            if self._vocab is None:
+                self.max_idx = int(self.compact_state["indices"].max())
+            else:
+                self.max_idx = max(idx for freq, idx in self.vocab.values())
+        return self.max_idx
 
     def get_token2idx_mapping(self) -> Dict[str, int]:
         if not self.vocab:
@@ -311,22 +423,19 @@ class Vocab:
 
         :return: None
         The whole vocab object will be saved to the file
+        If the filename has the ``.vocab`` extension, the vocab is saved in the
+        compact binary format
         """
 
         if not self.vocab:
             raise ValueError("Build vocab first by calling build_vocab()")
 
+        if str(filename).endswith(COMPACT_VOCAB_EXTENSION):
+            self.save_to_compact_file(filename)
+            return
+
         vocab_state = dict()
-        vocab_state["options"] = {
-            "max_num_words": self.max_num_tokens,
-            "min_count": self.min_count,
-            "unk_token": self.unk_token,
-            "pad_token": self.pad_token,
-            "start_token": self.start_token,
-            "end_token": self.end_token,
-            "special_token_freq": self.special_token_freq,
-            "special_vocab": self.special_vocab,
-        }
+        vocab_state["options"] = self.get_options()
         vocab_state["vocab"] = self.vocab
         vocab_state["orig_vocab"] = self.orig_vocab
         try:
@@ -339,37 +448,202 @@ class Vocab:
                 "the path exists and try again".format(filename)
             )
 
+    def get_options(self) -> Dict[str, Any]:
+        return {
+            "max_num_words": self.max_num_tokens,
+            "min_count": self.min_count,
+            "unk_token": self.unk_token,
+            "pad_token": self.pad_token,
+            "start_token": self.start_token,
+            "end_token": self.end_token,
+            "special_token_freq": self.special_token_freq,
+            "special_vocab": self.special_vocab,
+            "include_special_vocab": self.include_special_vocab,
+            "max_instance_length": self.max_instance_length,
+        }
+
+    @classmethod
+    def from_options(cls, vocab_options: Dict[str, Any], filename: str) -> "Vocab":
+        # restore the object
+        # restore all the property values from the file
+        return cls(
+            max_num_tokens=vocab_options["max_num_words"],
+            min_count=vocab_options["min_count"],
+            unk_token=vocab_options["unk_token"],
+            pad_token=vocab_options["pad_token"],
+            start_token=vocab_options["start_token"],
+            end_token=vocab_options["end_token"],
+            instances=None,
+            special_token_freq=vocab_options["special_token_freq"],
+            store_location=filename,
+            include_special_vocab=vocab_options.get("include_special_vocab", True),
+            max_instance_length=vocab_options.get("max_instance_length", 100),
+        )
+
+    def save_to_compact_file(self, filename: str):
+        """ Saves the vocab in the compact binary format. The file has a json
+        header with the options followed by the arrays of the indices, the
+        original indices and the frequencies of the tokens, the offsets of the
+        tokens and the text of all the tokens
+
+        Parameters
+        ----------
+        filename : str
+            The file where the vocab is stored
+        """
+        orig_vocab = self.orig_vocab or {}
+        # the tokens are stored in the order of the vocab. So the mappings that
+        # are made from the file are the same as the ones that are saved
+        tokens = list(self.vocab.keys())
+        tokens.extend(token for token in orig_vocab if token not in self.vocab)
+
+        indices = np.full(len(tokens), -1, dtype=np.int64)
+        orig_indices = np.full(len(tokens), -1, dtype=np.int64)
+        freqs = np.zeros(len(tokens), dtype=np.float64)
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        for token_idx, token in enumerate(tokens):
+            if token in self.vocab:
+                freq, indices[token_idx] = self.vocab[token]
+            if token in orig_vocab:
+                freq, orig_indices[token_idx] = orig_vocab[token]
+            freqs[token_idx] = freq
+            offsets[token_idx + 1] = offsets[token_idx] + len(token)
+
+        header = {"options": self.get_options(), "num_tokens": len(tokens)}
+        header = json.dumps(header).encode("utf-8")
+        with open(filename, "wb") as fp:
+            fp.write(COMPACT_VOCAB_MAGIC)
+            fp.write(struct.pack("<Q", len(header)))
+            fp.write(header)
+            for array in [indices, orig_indices, freqs, offsets]:
+                fp.write(array.tobytes())
+            fp.write("".join(tokens).encode("utf-8"))
+
+    @classmethod
+    def load_from_compact_file(cls, filename: str) -> "Vocab":
+        """ Loads a vocab that is stored in the compact binary format. The file is
+        read at once. The vocab, the original vocab and the mappings between tokens
+        and indices are made only when they are used
+
+        Parameters
+        ----------
+        filename : str
+            The file where the vocab is stored
+
+        Returns
+        -------
+        Vocab
+        """
+        with open(filename, "rb") as fp:
+            data = fp.read()
+
+        if not data.startswith(COMPACT_VOCAB_MAGIC):
+            raise ValueError(f"{filename} is not a compact vocab file")
+
+        position = len(COMPACT_VOCAB_MAGIC)
+        (header_len,) = struct.unpack_from("<Q", data, position)
+        position += struct.calcsize("<Q")
+        header = json.loads(data[position : position + header_len].decode("utf-8"))
+        position += header_len
+
+        num_tokens = header["num_tokens"]
+        arrays = []
+        for dtype, length in [
+            (np.int64, num_tokens),
+            (np.int64, num_tokens),
+            (np.float64, num_tokens),
+            (np.int64, num_tokens + 1),
+        ]:
+            arrays.append(
+                np.frombuffer(data, dtype=dtype, count=length, offset=position)
+            )
+            position += arrays[-1].nbytes
+        indices, orig_indices, freqs, offsets = arrays
+
+        vocab = cls.from_options(header["options"], filename=filename)
+        vocab.set_compact_state(
+            {
+                "indices": indices,
+                "orig_indices": orig_indices,
+                "freqs": freqs,
+                "offsets": offsets,
+                "text": data[position:].decode("utf-8"),
+            }
+        )
+        return vocab
+
+    def set_compact_state(self, compact_state: Dict[str, Any]):
+        self._vocab = None
+        self._orig_vocab = None
+        self._token2idx = None
+        self._idx2token = None
+        self.vocab_len = None
+        self.orig_vocab_len = None
+        self.max_idx = None
+        self.compact_state = compact_state
+
+    def get_compact_tokens(self) -> List[str]:
+        if "tokens" not in self.compact_state:
+            text = self.compact_state["text"]
+            offsets = self.compact_state["offsets"].tolist()
+            self.compact_state["tokens"] = [
+                text[start:end] for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+        return self.compact_state["tokens"]
+
+    def get_compact_freqs(self) -> List[float]:
+        # the frequencies are stored as floats. The frequencies of the tokens
+        # other than the special tokens are integers
+        return [
+            freq if freq >= self.special_token_freq else int(freq)
+            for freq in self.compact_state["freqs"].tolist()
+        ]
+
+    def get_compact_mapping(self, name: str) -> Dict:
+        tokens = self.get_compact_tokens()
+        if name in ["vocab", "orig_vocab"]:
+            key = "indices" if name == "vocab" else "orig_indices"
+            mapping = {}
+            for token, freq, idx in zip(
+                tokens, self.get_compact_freqs(), self.compact_state[key].tolist()
+            ):
+                if idx >= 0:
+                    mapping[token] = (freq, idx)
+            return mapping
+
+        mapping = {}
+        for token, idx in zip(tokens, self.compact_state["indices"].tolist()):
+            if idx < 0:
+                continue
+            if name == "token2idx":
+                mapping[token] = idx
+            else:
+                mapping[idx] = token
+        return mapping
+
+    def release_compact_state(self):
+        """ Makes all the mappings from the compact state and drops it. This is
+        done before any of the mappings is replaced
+        """
+        if self.compact_state is None:
+            return
+        for name in ["vocab", "orig_vocab", "token2idx", "idx2token"]:
+            if getattr(self, f"_{name}") is None:
+                setattr(self, f"_{name}", self.get_compact_mapping(name))
+        self.compact_state = None
+
     @classmethod
     def load_from_file(cls, filename: str) -> "Vocab":
+        if str(filename).endswith(COMPACT_VOCAB_EXTENSION):
+            return cls.load_from_compact_file(filename)
+
         try:
             with open(filename, "r") as fp:
                 vocab_state = json.load(fp)
                 vocab_options = vocab_state["options"]
                 vocab_dict = vocab_state["vocab"]
                 orig_vocab_dict = vocab_state["orig_vocab"]
-
-                # restore the object
-                # restore all the property values from the file
-
-                max_num_tokens = vocab_options["max_num_words"]
-                min_count = vocab_options["min_count"]
-                unk_token = vocab_options["unk_token"]
-                pad_token = vocab_options["pad_token"]
-                start_token = vocab_options["start_token"]
-                end_token = vocab_options["end_token"]
-                special_token_freq = vocab_options["special_token_freq"]
-                store_location = filename
-                vocab = cls(
-                    max_num_tokens=max_num_tokens,
-                    min_count=min_count,
-                    unk_token=unk_token,
-                    pad_token=pad_token,
-                    start_token=start_token,
-                    end_token=end_token,
-                    instances=None,
-                    special_token_freq=special_token_freq,
-                    store_location=store_location,
-                )
+                vocab = cls.from_options(vocab_options, filename=filename)
 
                 # instead of building the vocab, set the vocab from vocab_dict
                 vocab.set_vocab(vocab=vocab_dict)
@@ -388,7 +662,7 @@ class Vocab:
             )
 
     def get_token_from_idx(self, idx: int) -> str:
-        if not self.vocab:
+        if not self.is_built():
             raise ValueError("Please build the vocab first")
 
         if not self.idx2token:
@@ -407,7 +681,7 @@ class Vocab:
         return token
 
     def get_idx_from_token(self, token: str) -> int:
-        if not self.vocab:
+        if not self.is_built():
             raise ValueError("Please build the vocab first")
 
         if not self.token2idx:
@@ -486,18 +760,49 @@ class Vocab:
         sentence = " ".join(token)
         return sentence
 
+    @property
+    def vocab(self):
+        if self._vocab is None and self.compact_state is not None:
+            self._vocab = self.get_compact_mapping("vocab")
+        return self._vocab
+
+    @vocab.setter
+    def vocab(self, value):
+        self.release_compact_state()
+        self._vocab = value
+        self.vocab_len = None
+        self.max_idx = None
+
+    @property
+    def orig_vocab(self):
+        if self._orig_vocab is None and self.compact_state is not None:
+            self._orig_vocab = self.get_compact_mapping("orig_vocab")
+        return self._orig_vocab
+
+    @orig_vocab.setter
+    def orig_vocab(self, value):
+        self.release_compact_state()
+        self._orig_vocab = value
+        self.orig_vocab_len = None
+
     @property
     def token2idx(self):
+        if self._token2idx is None and self.compact_state is not None:
+            self._token2idx = self.get_compact_mapping("token2idx")
         return self._token2idx
 
     @token2idx.setter
     def token2idx(self, value):
+        self.release_compact_state()
         self._token2idx = value
 
     @property
     def idx2token(self):
+        if self._idx2token is None and self.compact_state is not None:
+            self._idx2token = self.get_compact_mapping("idx2token")
         return self._idx2token
 
     @idx2token.setter
     def idx2token(self, value):
+        self.release_compact_state()
         self._idx2token = value
@@ -0,0 +1,91 @@
+import pytest
+from sciwing.data.bucket_batch_sampler import BucketBatchSampler
+import itertools
+import numpy as np
+
+
+@pytest.fixture
+def lengths():
+    return [5, 1, 9, 3, 7, 2, 8, 4, 6, 10]
+
+
+class TestBucketBatchSampler:
+    def test_all_indices_sampled_once(self, lengths):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(indices=indices, lengths=lengths, batch_size=3)
+        batches = list(sampler)
+        sampled = sorted(itertools.chain.from_iterable(batches))
+        assert sampled == indices
+
+    def test_batch_size_respected(self, lengths):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(indices=indices, lengths=lengths, batch_size=3)
+        for batch in sampler:
+            assert len(batch) <= 3
+
+    def test_batches_sorted_within_bucket(self, lengths):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(
+            indices=indices, lengths=lengths, batch_size=2, shuffle=False
+        )
+        batches = list(sampler)
+        batch_lengths = [[lengths[idx] for idx in batch] for batch in batches]
+        assert batch_lengths == [[1, 2], [3, 4], [5, 6], [7, 8], [9, 10]]
+
+    def test_only_subset_indices_sampled(self, lengths):
+        indices = [0, 2, 4]
+        sampler = BucketBatchSampler(indices=indices, lengths=lengths, batch_size=2)
+        sampled = sorted(itertools.chain.from_iterable(sampler))
+        assert sampled == indices
+
+    @pytest.mark.parametrize("max_tokens_per_batch", [10, 20, 30])
+    def test_max_tokens_per_batch(self, lengths, max_tokens_per_batch):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(
+            indices=indices,
+            lengths=lengths,
+            batch_size=len(lengths),
+            max_tokens_per_batch=max_tokens_per_batch,
+        )
+        for batch in sampler:
+            max_length = max(lengths[idx] for idx in batch)
+            assert len(batch) == 1 or max_length * len(batch) <= max_tokens_per_batch
+
+    def test_len(self, lengths):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(indices=indices, lengths=lengths, batch_size=3)
+        assert len(sampler) == 4
+
+    @pytest.mark.parametrize("max_tokens_per_batch", [None, 12])
+    def test_len_same_batches_as_iter(self, lengths, max_tokens_per_batch):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(
+            indices=indices,
+            lengths=lengths,
+            batch_size=3,
+            max_tokens_per_batch=max_tokens_per_batch,
+        )
+        np.random.seed(0)
+        num_batches = len(sampler)
+        batches = list(sampler)
+        assert len(batches) == num_batches
+        assert len(sampler) == num_batches
+        random_state = np.random.get_state()[1]
+
+        np.random.seed(0)
+        assert batches == list(
+            BucketBatchSampler(
+                indices=indices,
+                lengths=lengths,
+                batch_size=3,
+                max_tokens_per_batch=max_tokens_per_batch,
+            )
+        )
+        assert (np.random.get_state()[1] == random_state).all()
+
+    def test_new_batches_every_epoch(self, lengths):
+        indices = list(range(len(lengths)))
+        sampler = BucketBatchSampler(indices=indices, lengths=lengths, batch_size=3)
+        np.random.seed(0)
+        epochs = [list(sampler) for _ in range(5)]
+        assert any(epoch != epochs[0] for epoch in epochs[1:])
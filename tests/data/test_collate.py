@@ -0,0 +1,160 @@
+import pytest
+import pickle
+import torch
+from sciwing.data.line import Line
+from sciwing.data.label import Label
+from sciwing.data.collate import (
+    NumericalizingCollator,
+    CollatedInstances,
+    get_numericalized_batch,
+    transpose_batch,
+)
+from sciwing.numericalizers.numericalizer import Numericalizer
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+from sciwing.vocab.vocab import Vocab
+
+
+@pytest.fixture
+def lines_labels():
+    lines = [
+        Line(text="First line here", tokenizers={"tokens": WordTokenizer()}),
+        Line(text="Second", tokenizers={"tokens": WordTokenizer()}),
+    ]
+    labels = [Label(text="A"), Label(text="B")]
+    return lines, labels
+
+
+@pytest.fixture
+def namespace_to_numericalizer(lines_labels):
+    lines, labels = lines_labels
+    word_vocab = Vocab(
+        instances=[[token.text for token in line.tokens["tokens"]] for line in lines]
+    )
+    word_vocab.build_vocab()
+    label_vocab = Vocab(
+        instances=[[token.text for token in label.tokens["label"]] for label in labels],
+        include_special_vocab=False,
+    )
+    label_vocab.build_vocab()
+    return {
+        "tokens": Numericalizer(vocabulary=word_vocab),
+        "label": Numericalizer(vocabulary=label_vocab),
+    }
+
+
+class TestCollate:
+    def test_collator_numericalizes_all_namespaces(
+        self, lines_labels, namespace_to_numericalizer
+    ):
+        lines, labels = lines_labels
+        collator = NumericalizingCollator(
+            namespace_to_numericalizer=namespace_to_numericalizer
+        )
+        batch = collator(list(zip(lines, labels)))
+        assert len(batch) == 2
+        collated_lines, collated_labels = transpose_batch(batch)
+        assert isinstance(collated_lines, CollatedInstances)
+        assert list(collated_lines) == lines
+        assert list(collated_labels) == labels
+        assert collated_lines.padded["tokens"].size() == (2, 3)
+        assert collated_lines.lengths["tokens"].tolist() == [3, 1]
+        assert collated_labels.padded["label"].size() == (2, 1)
+
+    def test_collator_does_not_change_instances(
+        self, lines_labels, namespace_to_numericalizer
+    ):
+        lines, labels = lines_labels
+        collator = NumericalizingCollator(
+            namespace_to_numericalizer=namespace_to_numericalizer
+        )
+        collator(list(zip(lines, labels)))
+        for line, label in zip(lines, labels):
+            assert line.numericalized == {}
+            assert label.numericalized == {}
+
+    def test_transpose_list_batch(self, lines_labels):
+        lines, labels = lines_labels
+        transposed_lines, transposed_labels = transpose_batch(list(zip(lines, labels)))
+        assert list(transposed_lines) == lines
+        assert list(transposed_labels) == labels
+
+    def test_numericalized_batch_padded(self, lines_labels, namespace_to_numericalizer):
+        lines, _ = lines_labels
+        numericalizer = namespace_to_numericalizer["tokens"]
+        vocab = numericalizer.vocabulary
+        pad_idx = vocab.get_idx_from_token(vocab.pad_token)
+        indices = get_numericalized_batch(
+            instances=lines,
+            namespace="tokens",
+            numericalizer=numericalizer,
+            max_length=3,
+        )
+        assert indices.size() == (2, 3)
+        assert indices.dtype == torch.long
+        assert indices[1, 1:].tolist() == [pad_idx, pad_idx]
+
+    def test_numericalized_batch_same_with_collator(
+        self, lines_labels, namespace_to_numericalizer
+    ):
+        lines, labels = lines_labels
+        numericalizer = namespace_to_numericalizer["tokens"]
+        expected = get_numericalized_batch(
+            instances=lines,
+            namespace="tokens",
+            numericalizer=numericalizer,
+            max_length=3,
+        )
+        collator = NumericalizingCollator(
+            namespace_to_numericalizer=namespace_to_numericalizer
+        )
+        collated_lines, _ = transpose_batch(collator(list(zip(lines, labels))))
+        indices = get_numericalized_batch(
+            instances=collated_lines,
+            namespace="tokens",
+            numericalizer=numericalizer,
+            max_length=3,
+        )
+        assert torch.equal(indices, expected)
+
+    @pytest.mark.parametrize("max_length", [1, 5])
+    def test_collated_indices_truncated_or_padded(
+        self, lines_labels, namespace_to_numericalizer, max_length
+    ):
+        lines, labels = lines_labels
+        numericalizer = namespace_to_numericalizer["tokens"]
+        expected = get_numericalized_batch(
+            instances=lines,
+            namespace="tokens",
+            numericalizer=numericalizer,
+            max_length=max_length,
+        )
+        collator = NumericalizingCollator(
+            namespace_to_numericalizer=namespace_to_numericalizer
+        )
+        collated_lines, _ = transpose_batch(collator(list(zip(lines, labels))))
+        indices = get_numericalized_batch(
+            instances=collated_lines,
+            namespace="tokens",
+            numericalizer=numericalizer,
+            max_length=max_length,
+        )
+        assert torch.equal(indices, expected)
+
+    def test_pickled_collated_batch(self, lines_labels, namespace_to_numericalizer):
+        lines, labels = lines_labels
+        collator = NumericalizingCollator(
+            namespace_to_numericalizer=namespace_to_numericalizer
+        )
+        batch = pickle.loads(pickle.dumps(collator(list(zip(lines, labels)))))
+        collated_lines, _ = transpose_batch(batch)
+        assert collated_lines.padded["tokens"].size() == (2, 3)
+
+    def test_pickled_line_drops_tokenizers(self, lines_labels):
+        lines, _ = lines_labels
+        line = pickle.loads(pickle.dumps(lines[0]))
+        assert line.tokenizers == {}
+        assert [token.text for token in line.tokens["tokens"]] == [
+            "First",
+            "line",
+            "here",
+        ]
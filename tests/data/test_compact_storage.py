@@ -0,0 +1,105 @@
+import pytest
+import pickle
+from sciwing.data.line import Line
+from sciwing.data.label import Label
+from sciwing.data.seq_label import SeqLabel
+from sciwing.data.compact_storage import (
+    CompactInstances,
+    CompactLines,
+    CompactLabels,
+    CompactSeqLabels,
+)
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
+
+
+@pytest.fixture
+def lines():
+    tokenizers = {"tokens": WordTokenizer(), "char_tokens": CharacterTokenizer()}
+    texts = ["First line", "Second line here", "line"]
+    return [Line(text=text, tokenizers=tokenizers) for text in texts]
+
+
+@pytest.fixture
+def compact_lines(lines):
+    compact_lines = CompactLines()
+    for line in lines:
+        compact_lines.append(line)
+    return compact_lines
+
+
+class TestCompactStorage:
+    def test_len(self, lines, compact_lines):
+        assert len(compact_lines) == len(lines)
+
+    def test_lines_same_tokens(self, lines, compact_lines):
+        for line, compact_line in zip(lines, compact_lines):
+            assert compact_line.text == line.text
+            for namespace in ["tokens", "char_tokens"]:
+                assert [tok.text for tok in compact_line.tokens[namespace]] == [
+                    tok.text for tok in line.tokens[namespace]
+                ]
+
+    def test_tokens_stored_once(self, compact_lines):
+        store = compact_lines.store
+        assert len(store.id2token) == len(set(store.id2token))
+        assert store.id2token.count("line") == 1
+
+    def test_get_num_tokens(self, lines, compact_lines):
+        for idx, line in enumerate(lines):
+            assert compact_lines.get_num_tokens(idx, "tokens") == len(
+                line.tokens["tokens"]
+            )
+
+    def test_index_out_of_range(self, compact_lines):
+        with pytest.raises(IndexError):
+            compact_lines[len(compact_lines)]
+
+    def test_negative_index_and_slice(self, compact_lines):
+        assert compact_lines[-1].text == "line"
+        assert [line.text for line in compact_lines[:2]] == [
+            "First line",
+            "Second line here",
+        ]
+
+    def test_pickle(self, compact_lines):
+        unpickled = pickle.loads(pickle.dumps(compact_lines))
+        assert [line.text for line in unpickled] == [
+            line.text for line in compact_lines
+        ]
+        assert unpickled.store.token2id == compact_lines.store.token2id
+
+    def test_labels(self):
+        compact_labels = CompactLabels()
+        for text in ["title", "abstract", "title"]:
+            compact_labels.append(Label(text=text))
+        assert [label.text for label in compact_labels] == [
+            "title",
+            "abstract",
+            "title",
+        ]
+        assert compact_labels[0].namespace == "label"
+
+    def test_seq_labels(self):
+        compact_labels = CompactSeqLabels()
+        compact_labels.append(SeqLabel(labels={"seq_label": ["B", "I"]}))
+        compact_labels.append(SeqLabel(labels={"seq_label": ["O"]}))
+        assert [tok.text for tok in compact_labels[0].tokens["seq_label"]] == [
+            "B",
+            "I",
+        ]
+        assert [tok.text for tok in compact_labels[1].tokens["seq_label"]] == ["O"]
+
+    def test_save_load(self, lines, compact_lines, tmpdir):
+        compact_lines.save(directory=str(tmpdir), prefix="train.lines")
+        loaded = CompactLines.load(directory=str(tmpdir), prefix="train.lines")
+        assert len(loaded) == len(lines)
+        for line, loaded_line in zip(lines, loaded):
+            assert loaded_line.text == line.text
+            assert [tok.text for tok in loaded_line.tokens["char_tokens"]] == [
+                tok.text for tok in line.tokens["char_tokens"]
+            ]
+
+    def test_compact_instances_is_abstract(self):
+        with pytest.raises(TypeError):
+            CompactInstances()
@@ -1,5 +1,7 @@
 import pytest
+from unittest import mock
 from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDataset,
     TextClassificationDatasetManager,
 )
 from sciwing.utils.class_nursery import ClassNursery
@@ -62,3 +64,26 @@ class TestDatasetManager:
         assert (
             ClassNursery.class_nursery["TextClassificationDatasetManager"] is not None
         )
+
+    def test_lazy_vocab_reads_examples_once(self, tmpdir):
+        train_file = tmpdir.join("train_file.txt")
+        train_file.write("train_line1###label1\ntrain_line2###label2")
+        dev_file = tmpdir.join("dev_file.txt")
+        dev_file.write("dev_line1###label1\ndev_line2###label2")
+
+        with mock.patch.object(
+            TextClassificationDataset,
+            "get_line_label",
+            autospec=True,
+            side_effect=TextClassificationDataset.get_line_label,
+        ) as get_line_label:
+            dataset_manager = TextClassificationDatasetManager(
+                train_filename=str(train_file),
+                dev_filename=str(dev_file),
+                test_filename=str(dev_file),
+                lazy=True,
+            )
+
+        assert get_line_label.call_count == 2
+        assert dataset_manager.label_namespaces == ["label"]
+        assert dataset_manager.namespace_to_vocab["tokens"].get_vocab_len() == 2 + 4
@@ -0,0 +1,80 @@
+import pytest
+import os
+from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDatasetManager,
+)
+from sciwing.data.dataset_snapshot import SnapshotDataset
+
+
+@pytest.fixture
+def data_files(tmpdir):
+    filenames = []
+    for split in ["train", "dev", "test"]:
+        p = tmpdir.join(f"{split}.txt")
+        p.write("first line###label1\nsecond line here###label2\n")
+        filenames.append(str(p))
+    return filenames
+
+
+@pytest.fixture
+def snapshots_dir(tmpdir):
+    return str(tmpdir.mkdir("snapshots"))
+
+
+def make_manager(data_files, snapshots_dir):
+    train_filename, dev_filename, test_filename = data_files
+    return TextClassificationDatasetManager(
+        train_filename=train_filename,
+        dev_filename=dev_filename,
+        test_filename=test_filename,
+        use_snapshots=True,
+        snapshots_dir=snapshots_dir,
+    )
+
+
+class TestDatasetSnapshot:
+    def test_snapshot_written(self, data_files, snapshots_dir):
+        manager = make_manager(data_files, snapshots_dir)
+        assert manager.snapshot.exists()
+        assert len(os.listdir(snapshots_dir)) == 1
+
+    def test_snapshot_loaded(self, data_files, snapshots_dir):
+        manager = make_manager(data_files, snapshots_dir)
+        snapshot_manager = make_manager(data_files, snapshots_dir)
+        assert isinstance(snapshot_manager.train_dataset, SnapshotDataset)
+        assert snapshot_manager.label_namespaces == manager.label_namespaces
+        for namespace, vocab in manager.namespace_to_vocab.items():
+            snapshot_vocab = snapshot_manager.namespace_to_vocab[namespace]
+            assert snapshot_vocab.token2idx == vocab.token2idx
+
+    def test_snapshot_lines_same(self, data_files, snapshots_dir):
+        manager = make_manager(data_files, snapshots_dir)
+        snapshot_manager = make_manager(data_files, snapshots_dir)
+        for idx in range(len(manager.dev_dataset)):
+            line, label = manager.dev_dataset[idx]
+            snapshot_line, snapshot_label = snapshot_manager.dev_dataset[idx]
+            assert snapshot_line.text == line.text
+            assert snapshot_label.text == label.text
+            for namespace in line.namespaces:
+                assert [tok.text for tok in snapshot_line.tokens[namespace]] == [
+                    tok.text for tok in line.tokens[namespace]
+                ]
+
+    def test_snapshot_lines_numericalized(self, data_files, snapshots_dir):
+        make_manager(data_files, snapshots_dir)
+        snapshot_manager = make_manager(data_files, snapshots_dir)
+        numericalizer = snapshot_manager.namespace_to_numericalizer["tokens"]
+        line, label = snapshot_manager.train_dataset[0]
+        texts = [tok.text for tok in line.tokens["tokens"]]
+        assert line.numericalized["tokens"].tolist() == (
+            numericalizer.numericalize_instance(texts)
+        )
+        assert "label" in label.numericalized
+
+    def test_changed_file_new_snapshot(self, data_files, snapshots_dir):
+        make_manager(data_files, snapshots_dir)
+        with open(data_files[0], "a") as fp:
+            fp.write("third line###label1\n")
+        manager = make_manager(data_files, snapshots_dir)
+        assert len(os.listdir(snapshots_dir)) == 2
+        assert len(manager.train_dataset) == 3
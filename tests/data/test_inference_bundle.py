@@ -0,0 +1,115 @@
+import pytest
+import json
+import os
+import torch
+from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDatasetManager,
+)
+from sciwing.data.inference_bundle import InferenceBundle, InferenceDatasetsManager
+from sciwing.data.line import Line
+
+
+@pytest.fixture
+def datasets_manager(tmpdir):
+    filenames = []
+    for split in ["train", "dev", "test"]:
+        p = tmpdir.join(f"{split}.txt")
+        p.write("first line###label1\nsecond line here###label2\n")
+        filenames.append(str(p))
+    train_filename, dev_filename, test_filename = filenames
+    return TextClassificationDatasetManager(
+        train_filename=train_filename,
+        dev_filename=dev_filename,
+        test_filename=test_filename,
+    )
+
+
+@pytest.fixture
+def model_filepath(tmpdir):
+    filepath = str(tmpdir.join("best_model.pt"))
+    torch.save({"model_state": {}, "loss": 0.0}, filepath)
+    return filepath
+
+
+@pytest.fixture
+def bundle(datasets_manager, model_filepath, tmpdir):
+    return InferenceBundle.export(
+        datasets_manager=datasets_manager,
+        bundle_dir=str(tmpdir.join("bundle")),
+        model_filepath=model_filepath,
+    )
+
+
+class TestInferenceBundle:
+    def test_bundle_exists(self, bundle, tmpdir):
+        assert bundle.exists()
+        assert not InferenceBundle(str(tmpdir.join("empty"))).exists()
+
+    def test_model_copied(self, bundle):
+        assert os.path.dirname(bundle.model_filepath) == bundle.bundle_dir
+        assert os.path.isfile(bundle.model_filepath)
+
+    def test_manager_vocabs(self, bundle, datasets_manager):
+        manager = bundle.get_datasets_manager()
+        assert isinstance(manager, InferenceDatasetsManager)
+        assert manager.namespaces == datasets_manager.namespaces
+        for namespace, vocab in datasets_manager.namespace_to_vocab.items():
+            assert manager.namespace_to_vocab[namespace].token2idx == vocab.token2idx
+
+    def test_manager_labels(self, bundle, datasets_manager):
+        manager = bundle.get_datasets_manager()
+        assert manager.label_namespaces == datasets_manager.label_namespaces
+        assert manager.num_labels == datasets_manager.num_labels
+        assert manager.get_label_idx_mapping("label") == (
+            datasets_manager.get_label_idx_mapping("label")
+        )
+
+    def test_manager_numericalizers(self, bundle, datasets_manager):
+        manager = bundle.get_datasets_manager()
+        tokens = ["first", "line"]
+        for namespace, numericalizer in manager.namespace_to_numericalizer.items():
+            original_numericalizer = datasets_manager.namespace_to_numericalizer[
+                namespace
+            ]
+            assert numericalizer.__class__ == original_numericalizer.__class__
+            assert numericalizer.numericalize_instance(tokens) == (
+                original_numericalizer.numericalize_instance(tokens)
+            )
+
+    def test_manager_makes_line(self, bundle, datasets_manager):
+        manager = bundle.get_datasets_manager()
+        line = manager.make_line("first line")
+        assert isinstance(line, Line)
+        original_line = datasets_manager.make_line("first line")
+        for namespace in original_line.namespaces:
+            assert [tok.text for tok in line.tokens[namespace]] == [
+                tok.text for tok in original_line.tokens[namespace]
+            ]
+
+    def test_manager_without_datasets(self, bundle, datasets_manager, tmpdir):
+        for split in ["train", "dev", "test"]:
+            os.remove(str(tmpdir.join(f"{split}.txt")))
+        manager = InferenceBundle(bundle.bundle_dir).get_datasets_manager()
+        assert manager.train_dataset is None
+        assert manager.namespaces == datasets_manager.namespaces
+
+    def test_manager_loaded_once(self, bundle):
+        assert bundle.get_datasets_manager() is bundle.get_datasets_manager()
+
+    def test_missing_bundle_raises(self, tmpdir):
+        bundle = InferenceBundle(str(tmpdir.join("empty")))
+        with pytest.raises(FileNotFoundError, match="export-bundle"):
+            bundle.get_datasets_manager()
+
+    def test_label_map_mismatch_raises(self, bundle):
+        with open(bundle.meta_filename) as fp:
+            meta = json.load(fp)
+        label_map = meta["label_maps"]["label"]
+        meta["label_maps"]["label"] = {
+            token: len(label_map) - 1 - idx for token, idx in label_map.items()
+        }
+        with open(bundle.meta_filename, "w") as fp:
+            json.dump(meta, fp)
+
+        with pytest.raises(ValueError):
+            InferenceBundle(bundle.bundle_dir).get_datasets_manager()
@@ -0,0 +1,50 @@
+import pytest
+import pickle
+from torch.utils.data import DataLoader
+from sciwing.data.lazy_storage import LineOffsets, LazyExamples
+
+
+@pytest.fixture
+def test_file(tmpdir):
+    p = tmpdir.join("test.txt")
+    p.write_text("first###a\n\nsecond line###b\nthird ü###c\n", encoding="utf-8")
+    return str(p)
+
+
+def parse_example(text):
+    line, label = text.split("###")
+    return line, label
+
+
+class TestLazyStorage:
+    def test_offsets_skip_empty_lines(self, test_file):
+        line_offsets = LineOffsets(filename=test_file)
+        assert len(line_offsets) == 3
+        assert line_offsets.get_text(2) == "third ü###c"
+        assert line_offsets.get_text(0) == "first###a"
+
+    def test_offsets_pickle(self, test_file):
+        line_offsets = LineOffsets(filename=test_file)
+        line_offsets.get_text(0)
+        unpickled = pickle.loads(pickle.dumps(line_offsets))
+        assert unpickled.get_text(1) == "second line###b"
+
+    def test_lazy_examples_views(self, test_file):
+        examples = LazyExamples(filename=test_file, parse_example=parse_example)
+        assert list(examples.lines) == ["first", "second line", "third ü"]
+        assert list(examples.labels) == ["a", "b", "c"]
+        assert examples.labels[-1] == "c"
+        assert examples.lines[:2] == ["first", "second line"]
+
+    def test_lazy_examples_index_error(self, test_file):
+        examples = LazyExamples(filename=test_file, parse_example=parse_example)
+        with pytest.raises(IndexError):
+            examples[3]
+
+
+    @pytest.mark.parametrize("num_workers", [0, 2])
+    def test_lazy_examples_in_data_loader_workers(self, test_file, num_workers):
+        examples = LazyExamples(filename=test_file, parse_example=parse_example)
+        loader = DataLoader(examples, batch_size=None, num_workers=num_workers)
+        labels = [label for _, label in loader]
+        assert labels == ["a", "b", "c"]
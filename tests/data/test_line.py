@@ -37,3 +37,10 @@ class TestLine:
         text = "Single line"
         line = Line(text=text, tokenizers={"tokens": WordTokenizer()})
         assert line.namespaces == ["tokens"]
+
+    def test_line_from_tokens(self):
+        line = Line.from_tokens(
+            text="Single line", tokens={"tokens": ["Single", "line"]}
+        )
+        assert line.namespaces == ["tokens"]
+        assert [token.text for token in line.tokens["tokens"]] == ["Single", "line"]
@@ -0,0 +1,76 @@
+import pytest
+from sciwing.data.parallel import parallel_map, make_lines
+from sciwing.data.line import Line
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
+
+
+def count_tokens(text, tokenizers):
+    return len(tokenizers["tokens"].tokenize(text))
+
+
+@pytest.fixture
+def tokenizers():
+    return {
+        "tokens": WordTokenizer(tokenizer="vanilla"),
+        "char_tokens": CharacterTokenizer(),
+    }
+
+
+@pytest.fixture
+def texts():
+    return [" ".join(["word"] * (idx % 7 + 1)) + f" line{idx}" for idx in range(50)]
+
+
+class TestParallel:
+    @pytest.mark.parametrize("num_processes", [1, 2])
+    def test_parallel_map_order(self, texts, tokenizers, num_processes):
+        counts = parallel_map(
+            func=count_tokens,
+            items=texts,
+            tokenizers=tokenizers,
+            num_processes=num_processes,
+            chunksize=3,
+        )
+        assert list(counts) == [len(text.split()) for text in texts]
+
+    @pytest.mark.parametrize("batch_size", [1, 7, 100])
+    def test_make_lines_parallel_same_as_serial(self, texts, tokenizers, batch_size):
+        serial_lines = list(
+            make_lines(texts=texts, tokenizers=tokenizers, batch_size=batch_size)
+        )
+        parallel_lines = list(
+            make_lines(
+                texts=texts,
+                tokenizers=tokenizers,
+                batch_size=batch_size,
+                num_processes=2,
+            )
+        )
+        assert len(parallel_lines) == len(serial_lines) == len(texts)
+        for text, serial_line, parallel_line in zip(
+            texts, serial_lines, parallel_lines
+        ):
+            assert parallel_line.text == serial_line.text == text
+            for namespace in tokenizers.keys():
+                assert [tok.text for tok in parallel_line.tokens[namespace]] == [
+                    tok.text for tok in serial_line.tokens[namespace]
+                ]
+
+    def test_make_lines_have_tokenizers(self, texts, tokenizers):
+        lines = make_lines(texts=texts, tokenizers=tokenizers, num_processes=2)
+        for line in lines:
+            assert line.tokenizers is tokenizers
+            assert line.namespaces == list(tokenizers.keys())
+
+    def test_make_lines_same_as_line(self, texts, tokenizers):
+        lines = list(make_lines(texts=texts, tokenizers=tokenizers, batch_size=2))
+        assert len(lines) == len(texts)
+        for text, line in zip(texts, lines):
+            expected_line = Line(text=text, tokenizers=tokenizers)
+            assert line.text == text
+            assert line.namespaces == expected_line.namespaces
+            for namespace in line.namespaces:
+                assert [token.text for token in line.tokens[namespace]] == [
+                    token.text for token in expected_line.tokens[namespace]
+                ]
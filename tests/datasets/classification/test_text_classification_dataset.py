@@ -40,3 +40,56 @@ class TestTextClassificationDataset:
         line_tokens = list(map(lambda token: token.text, line_tokens))
 
         assert set(tokens) == set(line_tokens)
+
+    def test_compact_dataset_same_as_lines(self, test_file):
+        dataset = TextClassificationDataset(
+            filename=str(test_file), tokenizers={"tokens": WordTokenizer()}
+        )
+        compact_dataset = TextClassificationDataset(
+            filename=str(test_file),
+            tokenizers={"tokens": WordTokenizer()},
+            compact=True,
+        )
+        assert len(compact_dataset) == len(dataset)
+        for idx in range(len(dataset)):
+            line, label = dataset[idx]
+            compact_line, compact_label = compact_dataset[idx]
+            assert compact_line.text == line.text
+            assert [tok.text for tok in compact_line.tokens["tokens"]] == [
+                tok.text for tok in line.tokens["tokens"]
+            ]
+            assert compact_label.text == label.text
+
+    def test_parallel_dataset_same_as_serial(self, test_file):
+        dataset = TextClassificationDataset(
+            filename=str(test_file), tokenizers={"tokens": WordTokenizer()}
+        )
+        parallel_dataset = TextClassificationDataset(
+            filename=str(test_file),
+            tokenizers={"tokens": WordTokenizer()},
+            num_processes=2,
+        )
+        assert len(parallel_dataset) == len(dataset)
+        for idx in range(len(dataset)):
+            line, label = dataset[idx]
+            parallel_line, parallel_label = parallel_dataset[idx]
+            assert parallel_line.text == line.text
+            assert [tok.text for tok in parallel_line.tokens["tokens"]] == [
+                tok.text for tok in line.tokens["tokens"]
+            ]
+            assert parallel_label.text == label.text
+
+    def test_lazy_dataset_same_as_lines(self, test_file):
+        dataset = TextClassificationDataset(
+            filename=str(test_file), tokenizers={"tokens": WordTokenizer()}
+        )
+        lazy_dataset = TextClassificationDataset(
+            filename=str(test_file), tokenizers={"tokens": WordTokenizer()}, lazy=True
+        )
+        assert len(lazy_dataset) == len(dataset)
+        for idx in range(len(dataset)):
+            line, label = dataset[idx]
+            lazy_line, lazy_label = lazy_dataset[idx]
+            assert lazy_line.text == line.text
+            assert lazy_label.text == label.text
+        assert [line.text for line in lazy_dataset.lines] == ["line1", "line2"]
@@ -38,3 +38,30 @@ class TestSeqLabellingDataset:
             label_tokens = label.tokens["seq_label"]
             print(f"label tokens {label.tokens}")
             assert len(word_tokens) == len(label_tokens)
+
+    def test_compact_get_item(self, test_file):
+        dataset = SeqLabellingDataset(
+            filename=str(test_file),
+            tokenizers={"tokens": WordTokenizer()},
+            compact=True,
+        )
+        line, label = dataset[1]
+        assert [tok.text for tok in line.tokens["tokens"]] == [
+            "word12",
+            "word22",
+            "word32",
+        ]
+        assert [tok.text for tok in label.tokens["seq_label"]] == [
+            "label1",
+            "label2",
+            "label3",
+        ]
+
+    def test_lazy_get_item(self, test_file):
+        dataset = SeqLabellingDataset(
+            filename=str(test_file), tokenizers={"tokens": WordTokenizer()}, lazy=True
+        )
+        assert len(dataset) == 2
+        line, label = dataset[0]
+        assert [tok.text for tok in line.tokens["tokens"]] == ["word11", "word21"]
+        assert [tok.text for tok in label.tokens["seq_label"]] == ["label1", "label2"]
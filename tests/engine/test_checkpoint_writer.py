@@ -0,0 +1,66 @@
+import pytest
+import torch
+from sciwing.engine.checkpoint_writer import CheckpointWriter
+
+
+@pytest.fixture(params=[True, False])
+def writer(request):
+    return CheckpointWriter(keep_last=2, asynchronous=request.param)
+
+
+class TestCheckpointWriter:
+    def test_writes_checkpoint(self, writer, tmp_path):
+        state = {"weights": torch.ones(3), "epoch_num": 1, "losses": [(0.5, 2)]}
+        writer.write(state, tmp_path.joinpath("model.pt"))
+        writer.wait()
+
+        loaded = torch.load(tmp_path.joinpath("model.pt"))
+        assert torch.equal(loaded["weights"], torch.ones(3))
+        assert loaded["epoch_num"] == 1
+        assert loaded["losses"] == [(0.5, 2)]
+
+    def test_no_temporary_files_left(self, writer, tmp_path):
+        writer.write({"weights": torch.ones(3)}, tmp_path.joinpath("model.pt"))
+        writer.wait()
+        assert [path.name for path in tmp_path.iterdir()] == ["model.pt"]
+
+    def test_snapshot_does_not_share_memory(self, writer, tmp_path):
+        weights = torch.ones(3)
+        writer.write({"weights": weights}, tmp_path.joinpath("model.pt"))
+        weights.add_(1)
+        writer.wait()
+
+        loaded = torch.load(tmp_path.joinpath("model.pt"))
+        assert torch.equal(loaded["weights"], torch.ones(3))
+
+    def test_keeps_last_checkpoints(self, writer, tmp_path):
+        for epoch_num in range(4):
+            writer.write(
+                {"epoch_num": epoch_num},
+                tmp_path.joinpath(f"model_epoch_{epoch_num}.pt"),
+            )
+        writer.write({"epoch_num": 3}, tmp_path.joinpath("best_model.pt"), False)
+        writer.wait()
+
+        filenames = sorted(path.name for path in tmp_path.iterdir())
+        assert filenames == ["best_model.pt", "model_epoch_2.pt", "model_epoch_3.pt"]
+
+    def test_existing_checkpoints_are_retained(self, tmp_path):
+        existing_checkpoint = tmp_path.joinpath("model_epoch_1.pt")
+        torch.save({"epoch_num": 0}, existing_checkpoint)
+        writer = CheckpointWriter(
+            keep_last=1, existing_checkpoints=[existing_checkpoint]
+        )
+        writer.write({"epoch_num": 1}, tmp_path.joinpath("model_epoch_2.pt"))
+        writer.wait()
+
+        assert [path.name for path in tmp_path.iterdir()] == ["model_epoch_2.pt"]
+
+    def test_error_raised_on_wait(self, writer, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            writer.write({"epoch_num": 1}, tmp_path.joinpath("missing", "model.pt"))
+            writer.wait()
+
+    def test_keep_last_at_least_one(self):
+        with pytest.raises(ValueError):
+            CheckpointWriter(keep_last=0)
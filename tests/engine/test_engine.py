@@ -9,6 +9,8 @@ from sciwing.data.line import Line
 from sciwing.data.label import Label
 from sciwing.metrics.precision_recall_fmeasure import PrecisionRecallFMeasure
 import torch
+import copy
+from unittest import mock
 import os
 from sciwing.utils.class_nursery import ClassNursery
 
@@ -86,6 +88,49 @@ def setup_engine_test_with_simple_classifier(
     return engine
 
 
+@pytest.fixture
+def make_engine(clf_datasets_manager, tmpdir_factory):
+    """ Makes engines that train a simple classifier. The options that a test
+    exercises are passed as keyword arguments of ``Engine``
+    """
+    datasets_manager = clf_datasets_manager
+
+    def _make_engine(model=None, **kwargs) -> Engine:
+        if model is None:
+            model = make_simple_classifier(datasets_manager)
+        engine_kwargs = dict(
+            model=model,
+            datasets_manager=datasets_manager,
+            batch_size=1,
+            save_dir=tmpdir_factory.mktemp("experiment"),
+            num_epochs=1,
+            save_every=1,
+            log_train_metrics_every=10,
+            train_metric=PrecisionRecallFMeasure(datasets_manager=datasets_manager),
+            validation_metric=PrecisionRecallFMeasure(
+                datasets_manager=datasets_manager
+            ),
+            test_metric=PrecisionRecallFMeasure(datasets_manager=datasets_manager),
+        )
+        engine_kwargs.update(kwargs)
+        if "optimizer" not in engine_kwargs:
+            engine_kwargs["optimizer"] = torch.optim.Adam(params=model.parameters())
+        return Engine(**engine_kwargs)
+
+    return _make_engine
+
+
+def make_simple_classifier(datasets_manager) -> SimpleClassifier:
+    word_embedder = WordEmbedder(embedding_type="glove_6B_50")
+    return SimpleClassifier(
+        encoder=BOW_Encoder(embedder=word_embedder),
+        encoding_dim=word_embedder.get_embedding_dimension(),
+        num_classes=2,
+        classification_layer_bias=True,
+        datasets_manager=datasets_manager,
+    )
+
+
 class TestEngine:
     def test_train_loader(self, setup_engine_test_with_simple_classifier):
         engine = setup_engine_test_with_simple_classifier
@@ -105,6 +150,7 @@ class TestEngine:
     def test_save_model(self, setup_engine_test_with_simple_classifier):
         engine = setup_engine_test_with_simple_classifier
         engine.train_epoch_end(0)
+        engine.checkpoint_writer.wait()
 
         # test for the file model_epoch_1.pt
         assert os.path.isdir(engine.save_dir)
@@ -135,3 +181,163 @@ class TestEngine:
 
     def test_engine_in_class_nursery(self):
         assert ClassNursery.class_nursery["Engine"] is not None
+
+    def test_bucket_batches_loader(self, make_engine):
+        engine = make_engine(batch_size=2, bucket_batches=True, max_tokens_per_batch=10)
+        num_lines = 0
+        for lines_labels in engine.train_loader:
+            for line, label in lines_labels:
+                assert isinstance(line, Line)
+                assert isinstance(label, Label)
+                num_lines += 1
+        assert num_lines == len(engine.get_train_dataset())
+
+    def test_bfloat16_train_epoch(self, make_engine):
+        engine = make_engine(batch_size=2, mixed_precision="bfloat16")
+        classifier = engine.model
+        weights_before = classifier.classification_layer.weight.clone()
+        engine.train_epoch(0)
+        weights_after = classifier.classification_layer.weight
+        assert weights_after.dtype == torch.float32
+        assert not torch.equal(weights_before, weights_after)
+        assert engine.train_loss_meter.get_average() is not None
+
+    def test_mixed_precision_unknown_dtype(self, make_engine):
+        with pytest.raises(ValueError):
+            make_engine(mixed_precision="int8")
+
+    @pytest.mark.parametrize("accumulation_steps", [2, 3])
+    def test_accumulation_steps_same_as_large_batch(
+        self, make_engine, clf_datasets_manager, accumulation_steps
+    ):
+        classifier = make_simple_classifier(clf_datasets_manager)
+        accumulating_classifier = copy.deepcopy(classifier)
+
+        engines = []
+        for model, batch_size, steps in [
+            (classifier, 2, 1),
+            (accumulating_classifier, 1, accumulation_steps),
+        ]:
+            engine = make_engine(
+                model=model,
+                optimizer=torch.optim.SGD(params=model.parameters(), lr=0.1),
+                batch_size=batch_size,
+                accumulation_steps=steps,
+            )
+            engine.train_epoch(0)
+            engines.append(engine)
+
+        assert torch.allclose(
+            classifier.classification_layer.weight,
+            accumulating_classifier.classification_layer.weight,
+            atol=1e-6,
+        )
+        assert engines[0].train_loss_meter.get_average() == pytest.approx(
+            engines[1].train_loss_meter.get_average()
+        )
+        assert len(engines[1].train_loss_meter.losses) == 1
+
+    @pytest.mark.parametrize("log_train_metrics_every", [1, 2, 10])
+    def test_train_metrics_only_for_logged_batches(
+        self, make_engine, log_train_metrics_every
+    ):
+        engine = make_engine(log_train_metrics_every=log_train_metrics_every)
+        train_metric = engine.train_metric_calc
+        with mock.patch.object(
+            train_metric, "calc_metric", wraps=train_metric.calc_metric
+        ) as calc_metric:
+            engine.train_epoch(0)
+
+        # two batches in the epoch
+        expected_num_calls = max(2 // log_train_metrics_every, 1)
+        assert calc_metric.call_count == expected_num_calls
+        assert isinstance(engine.train_loss_meter.get_average(), float)
+
+    @pytest.mark.parametrize(
+        "checkpoint_filename", ["model_epoch_1_iteration_1.pt", "model_epoch_1.pt"]
+    )
+    def test_resume_from_checkpoint(
+        self, make_engine, clf_datasets_manager, tmpdir_factory, checkpoint_filename
+    ):
+        classifier = make_simple_classifier(clf_datasets_manager)
+        resumed_classifier = copy.deepcopy(classifier)
+        save_dir = tmpdir_factory.mktemp("experiment_resume")
+
+        engine = make_engine(
+            model=classifier, save_dir=save_dir, num_epochs=2, checkpoint_every=1
+        )
+        engine.train_epoch(0)
+        train_loss = engine.train_loss_meter.get_average()
+        engine.train_epoch(1)
+        engine.checkpoint_writer.wait()
+
+        resumed_engine = make_engine(
+            model=resumed_classifier,
+            save_dir=save_dir,
+            num_epochs=2,
+            checkpoint_every=1,
+            resume_from=os.path.join(save_dir, checkpoint_filename),
+        )
+        assert resumed_engine.start_epoch == 0
+        resumed_engine.train_epoch(0)
+        assert resumed_engine.train_loss_meter.get_average() == pytest.approx(
+            train_loss
+        )
+        resumed_engine.train_epoch(1)
+
+        for parameter, resumed_parameter in zip(
+            classifier.parameters(), resumed_classifier.parameters()
+        ):
+            assert torch.allclose(parameter, resumed_parameter)
+
+    def test_resume_from_latest_without_checkpoints(self, make_engine):
+        engine = make_engine(resume_from="latest")
+        assert engine.start_epoch == 0
+        assert engine.resume_state is None
+
+    def test_keep_last_checkpoints(self, make_engine):
+        engine = make_engine(num_epochs=2, checkpoint_every=1, keep_last_checkpoints=2)
+        engine.train_epoch(0)
+        engine.train_epoch(1)
+        engine.checkpoint_writer.wait()
+
+        checkpoints = [checkpoint.name for checkpoint in engine.get_checkpoints()]
+        assert checkpoints == ["model_epoch_2_iteration_2.pt", "model_epoch_2.pt"]
+        assert engine.get_latest_checkpoint().name == "model_epoch_2.pt"
+        assert not any(
+            filename.endswith(".tmp") for filename in os.listdir(engine.save_dir)
+        )
+
+    @pytest.mark.parametrize("checkpoint_every", [0, 3, 5])
+    def test_checkpoint_every_not_multiple_of_accumulation_steps(
+        self, make_engine, checkpoint_every
+    ):
+        with pytest.raises(ValueError):
+            make_engine(accumulation_steps=2, checkpoint_every=checkpoint_every)
+
+    def test_checkpoint_every_with_accumulation_steps(self, make_engine):
+        engine = make_engine(accumulation_steps=2, checkpoint_every=2)
+        engine.train_epoch(0)
+        engine.checkpoint_writer.wait()
+        checkpoints = [checkpoint.name for checkpoint in engine.get_checkpoints()]
+        assert "model_epoch_1_iteration_2.pt" in checkpoints
+
+    def test_checkpoints_ordered_by_epoch_and_iteration(self, make_engine):
+        engine = make_engine()
+        filenames = [
+            "model_epoch_1_iteration_2.pt",
+            "model_epoch_1.pt",
+            "model_epoch_2_iteration_3.pt",
+            "model_epoch_2_iteration_10.pt",
+            "model_epoch_2.pt",
+        ]
+        # the newest checkpoint has the oldest modification time
+        for mtime, filename in enumerate(reversed(filenames)):
+            filepath = engine.save_dir.joinpath(filename)
+            filepath.touch()
+            os.utime(filepath, (mtime, mtime))
+        engine.save_dir.joinpath("model_epoch_best.pt").touch()
+
+        checkpoints = [checkpoint.name for checkpoint in engine.get_checkpoints()]
+        assert checkpoints == filenames
+        assert engine.get_latest_checkpoint().name == "model_epoch_2.pt"
@@ -1,4 +1,5 @@
 import pytest
+import torch
 from sciwing.meters.loss_meter import LossMeter
 
 
@@ -24,3 +25,14 @@ class TestLossMeter:
     def test_average_with_empty_losses(self):
         loss_meter = LossMeter()
         assert loss_meter.get_average() is None
+
+    def test_tensor_losses(self):
+        loss_meter = LossMeter()
+        loss_1 = torch.tensor(1.2, requires_grad=True)
+        loss_2 = torch.tensor(1.4)
+        loss_meter.add_loss(avg_batch_loss=loss_1, num_instances=5)
+        loss_meter.add_loss(avg_batch_loss=loss_2, num_instances=5)
+        assert not loss_meter.losses[0].requires_grad
+        average_loss = loss_meter.get_average()
+        assert isinstance(average_loss, float)
+        assert average_loss == pytest.approx(1.3)
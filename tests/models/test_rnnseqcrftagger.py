@@ -1,3 +1,4 @@
+import torch
 import pytest
 from sciwing.models.rnn_seq_crf_tagger import RnnSeqCrfTagger
 from sciwing.modules.lstm2seqencoder import Lstm2SeqEncoder
@@ -117,3 +118,65 @@ class TestParscitTagger:
             is_test=False,
         )
         assert output_dict["logits_seq_label"].size() == (2, 3, 7)
+
+    def test_parscit_tagger_predicted_tags_lengths(
+        self, setup_parscit_tagger, seq_dataset_manager
+    ):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        output_dict = tagger(
+            lines=lines,
+            labels=labels,
+            is_training=True,
+            is_validation=False,
+            is_test=False,
+        )
+        predicted_tags = output_dict["predicted_tags_seq_label"]
+        for line, tags in zip(lines, predicted_tags):
+            assert len(tags) == len(line.tokens["tokens"])
+
+    def test_parscit_tagger_batched_viterbi_parity(
+        self, setup_parscit_tagger, seq_dataset_manager
+    ):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        tagger.eval()
+        batched_output_dict = tagger(lines=lines, is_test=True)
+        tagger.use_batched_viterbi = False
+        output_dict = tagger(lines=lines, is_test=True)
+        assert (
+            batched_output_dict["predicted_tags_seq_label"]
+            == output_dict["predicted_tags_seq_label"]
+        )
+
+    def test_parscit_tagger_top_k(self, setup_parscit_tagger, seq_dataset_manager):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        tagger.eval()
+        tagger.top_k = 3
+        output_dict = tagger(lines=lines, is_test=True)
+        top_k_tags = output_dict["top_k_tags_seq_label"]
+        top_k_scores = output_dict["top_k_scores_seq_label"]
+        predicted_tags = output_dict["predicted_tags_seq_label"]
+        for line_tags, line_scores, tags in zip(
+            top_k_tags, top_k_scores, predicted_tags
+        ):
+            assert len(line_tags) == 3
+            assert line_tags[0] == tags
+            assert line_scores == sorted(line_scores, reverse=True)
+
+    def test_parscit_tagger_bfloat16_autocast(
+        self, setup_parscit_tagger, seq_dataset_manager
+    ):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        with torch.autocast(device_type="cpu", dtype=torch.bfloat16):
+            output_dict = tagger(
+                lines=lines,
+                labels=labels,
+                is_training=True,
+                is_validation=False,
+                is_test=False,
+            )
+        assert output_dict["logits_seq_label"].dtype == torch.float32
+        assert output_dict["loss"].dtype == torch.float32
@@ -0,0 +1,130 @@
+import pytest
+import torch
+from sciwing.modules.embedders.cached_embedder import CachedEmbedder
+from sciwing.modules.embedders.char_embedder import CharEmbedder
+from sciwing.data.line import Line
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
+from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDatasetManager,
+)
+from sciwing.utils.class_nursery import ClassNursery
+
+
+@pytest.fixture(scope="session")
+def clf_dataset_manager(tmpdir_factory):
+    train_file = tmpdir_factory.mktemp("train_data").join("train_file.txt")
+    train_file.write("train_line1###label1\ntrain_line2###label2")
+
+    dev_file = tmpdir_factory.mktemp("dev_data").join("dev_file.txt")
+    dev_file.write("dev_line1###label1\ndev_line2###label2")
+
+    test_file = tmpdir_factory.mktemp("test_data").join("test_file.txt")
+    test_file.write("test_line1###label1\ntest_line2###label2")
+
+    clf_dataset_manager = TextClassificationDatasetManager(
+        train_filename=str(train_file),
+        dev_filename=str(dev_file),
+        test_filename=str(test_file),
+        batch_size=1,
+    )
+
+    return clf_dataset_manager
+
+
+@pytest.fixture
+def setup_lines():
+    texts = ["This is sentence", "This is another sentence"]
+    lines = []
+    for text in texts:
+        line = Line(
+            text=text,
+            tokenizers={"tokens": WordTokenizer(), "char_tokens": CharacterTokenizer()},
+        )
+        lines.append(line)
+    return lines
+
+
+@pytest.fixture
+def setup_char_embedder(clf_dataset_manager):
+    embedder = CharEmbedder(
+        char_embedding_dimension=10,
+        hidden_dimension=20,
+        datasets_manager=clf_dataset_manager,
+    )
+    embedder.eval()
+    return embedder
+
+
+class TestCachedEmbedder:
+    def test_same_embeddings_as_embedder(self, setup_char_embedder, setup_lines):
+        embedder = setup_char_embedder
+        cached_embedder = CachedEmbedder(embedder=embedder, cache_dir=None)
+        lines = setup_lines
+        expected = embedder(lines)
+        embedded = cached_embedder(lines)
+        assert embedded.size() == expected.size()
+        assert torch.allclose(embedded, expected, atol=1e-6)
+
+    def test_hits_after_first_pass(self, setup_char_embedder, setup_lines):
+        cached_embedder = CachedEmbedder(embedder=setup_char_embedder, cache_dir=None)
+        lines = setup_lines
+        first_embedded = cached_embedder(lines)
+        assert cached_embedder.embedding_cache.misses == 2
+        second_embedded = cached_embedder(lines)
+        assert cached_embedder.embedding_cache.hits == 2
+        assert torch.allclose(first_embedded, second_embedded)
+
+    def test_disk_cache_reused(self, setup_char_embedder, setup_lines, tmpdir):
+        cache_dir = str(tmpdir.mkdir("cache"))
+        cached_embedder = CachedEmbedder(
+            embedder=setup_char_embedder, cache_dir=cache_dir
+        )
+        lines = setup_lines
+        first_embedded = cached_embedder(lines)
+        cached_embedder.embedding_cache.close()
+
+        another_cached_embedder = CachedEmbedder(
+            embedder=setup_char_embedder, cache_dir=cache_dir
+        )
+        second_embedded = another_cached_embedder(lines)
+        assert another_cached_embedder.embedding_cache.disk_hits == 2
+        assert torch.allclose(first_embedded, second_embedded)
+
+    def test_disk_cache_hits_beyond_memory(
+        self, setup_char_embedder, setup_lines, tmpdir
+    ):
+        # every line is evicted from memory before the next pass reaches it
+        cached_embedder = CachedEmbedder(
+            embedder=setup_char_embedder,
+            cache_dir=str(tmpdir.mkdir("cache")),
+            max_memory_items=1,
+        )
+        lines = setup_lines
+        for line in lines:
+            cached_embedder([line])
+        for line in lines:
+            cached_embedder([line])
+        stats = cached_embedder.embedding_cache.get_stats()
+        assert stats["misses"] == len(lines)
+        assert stats["hits"] == len(lines)
+        assert stats["memory_hits"] == 0
+
+    def test_memory_cache_misses_beyond_memory(self, setup_char_embedder, setup_lines):
+        cached_embedder = CachedEmbedder(
+            embedder=setup_char_embedder, cache_dir=None, max_memory_items=1
+        )
+        lines = setup_lines
+        for line in lines:
+            cached_embedder([line])
+        for line in lines:
+            cached_embedder([line])
+        assert cached_embedder.embedding_cache.hits == 0
+
+    def test_embedder_config(self, setup_char_embedder):
+        config = CachedEmbedder.get_embedder_config(setup_char_embedder)
+        assert "CharEmbedder" in config
+        assert "hidden_dimension" in config
+
+    def test_cached_embedder_in_class_nursery(self):
+        assert ClassNursery.class_nursery["CachedEmbedder"] is not None
@@ -67,3 +67,42 @@ class TestCharEmbedder:
                 assert isinstance(
                     token.get_embedding("char_embedding"), torch.FloatTensor
                 )
+
+    def test_padding_words_are_zeros(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        embedded = embedder(lines)
+        # the first line has 3 tokens and the second has 4 tokens
+        assert torch.all(embedded[0, 3] == 0)
+
+    def test_encoding_independent_of_batch(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        embedded = embedder(lines)
+        first_line_embedded = embedder(lines[:1])
+        assert torch.allclose(
+            embedded[0, :3], first_line_embedded[0, :3], atol=1e-6
+        )
+
+    def test_same_word_same_encoding(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        embedded = embedder(lines)
+        # "This" is the first word of both lines
+        assert torch.allclose(embedded[0, 0], embedded[1, 0])
+
+    def test_char_encodings_cache(self, clf_dataset_manager, setup_char_embedder):
+        _, lines = setup_char_embedder
+        embedder = CharEmbedder(
+            char_embedding_dimension=10,
+            hidden_dimension=100,
+            datasets_manager=clf_dataset_manager,
+            char_encodings_cache_size=2,
+        )
+        embedded = embedder(lines)
+        assert len(embedder.char_encodings_cache) == 0
+
+        embedder.eval()
+        cached_embedded = embedder(lines)
+        assert 0 < len(embedder.char_encodings_cache) <= 2
+        assert torch.allclose(embedded, cached_embedded, atol=1e-6)
+
+        embedder.train()
+        assert len(embedder.char_encodings_cache) == 0
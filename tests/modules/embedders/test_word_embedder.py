@@ -4,6 +4,9 @@ from sciwing.data.line import Line
 from sciwing.utils.class_nursery import ClassNursery
 import torch
 from sciwing.utils.common import get_system_mem_in_gb
+from sciwing.datasets.seq_labeling.seq_labelling_dataset import (
+    SeqLabellingDatasetManager,
+)
 
 mem_in_gb = get_system_mem_in_gb()
 
@@ -17,6 +20,26 @@ def setup_embedder(request):
     return embedder
 
 
+@pytest.fixture(scope="session")
+def seq_dataset_manager(tmpdir_factory):
+    train_file = tmpdir_factory.mktemp("train_data").join("train.txt")
+    train_file.write("first###label1 line###label2\nsecond###label1 line###label2")
+
+    dev_file = tmpdir_factory.mktemp("dev_data").join("dev.txt")
+    dev_file.write("first###label1 line###label2\nsecond###label1 line###label2")
+
+    test_file = tmpdir_factory.mktemp("test_data").join("test.txt")
+    test_file.write("first###label1 line###label2\nsecond###label1 line###label2")
+
+    data_manager = SeqLabellingDatasetManager(
+        train_filename=str(train_file),
+        dev_filename=str(dev_file),
+        test_filename=str(test_file),
+    )
+
+    return data_manager
+
+
 @pytest.fixture
 def setup_lines():
     texts = ["first line", "second line"]
@@ -50,3 +73,52 @@ class TestWordEmbedder:
 
     def test_vanilla_embedder_in_class_nursery(self):
         assert ClassNursery.class_nursery["WordEmbedder"] is not None
+
+    @pytest.mark.slow
+    def test_restrict_to_vocab(self, seq_dataset_manager, setup_lines):
+        embedder = WordEmbedder(
+            embedding_type="glove_6B_50",
+            datasets_manager=seq_dataset_manager,
+            restrict_to_vocab=True,
+        )
+        full_embedder = WordEmbedder(embedding_type="glove_6B_50")
+        lines = setup_lines
+        embeddings = embedder(lines)
+        full_embeddings = full_embedder(lines)
+        assert embeddings.size() == (2, 2, 50)
+        assert torch.allclose(embeddings, full_embeddings)
+        assert not embedder.embedding.weight.requires_grad
+        vocab_len = seq_dataset_manager.namespace_to_vocab["tokens"].get_vocab_len()
+        assert len(embedder.embedding_loader.embeddings) <= vocab_len * 2
+
+    @pytest.mark.slow
+    def test_padding_is_zeros(self, setup_embedder):
+        embedder = setup_embedder
+        lines = [Line(text="first line"), Line(text="second")]
+        embeddings = embedder(lines)
+        assert embeddings.size(1) == 2
+        assert torch.all(embeddings[1, 1] == 0)
+
+    @pytest.mark.slow
+    def test_embedding_same_as_loader(self, setup_embedder, setup_lines):
+        embedder = setup_embedder
+        lines = setup_lines
+        embeddings = embedder(lines)
+        for line, line_embeddings in zip(lines, embeddings):
+            for token, token_embedding in zip(line.tokens["tokens"], line_embeddings):
+                expected = torch.tensor(
+                    embedder.embedding_loader.embeddings[token.text], dtype=torch.float
+                )
+                assert torch.allclose(token_embedding, expected)
+
+    @pytest.mark.slow
+    def test_without_token_embeddings(self, setup_lines):
+        embedder = WordEmbedder(
+            embedding_type="glove_6B_50", set_token_embeddings=False
+        )
+        lines = setup_lines
+        _ = embedder(lines)
+        for line in lines:
+            for token in line.tokens["tokens"]:
+                with pytest.raises(KeyError):
+                    token.get_embedding(name=embedder.embedding_type)
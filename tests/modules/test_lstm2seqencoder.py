@@ -1,4 +1,5 @@
 import pytest
+import torch
 from sciwing.modules.lstm2seqencoder import Lstm2SeqEncoder
 from sciwing.modules.embedders.word_embedder import WordEmbedder
 from sciwing.data.line import Line
@@ -63,3 +64,15 @@ class TestLstm2SeqEncoder:
         encoding = encoder(lines=lines)
         batch_size = len(lines)
         assert encoding.size() == (batch_size, num_time_steps, expected_hidden_size)
+
+    def test_packed_sequences_ignore_padding(self, setup_lstm2seqencoder):
+        encoder, options = setup_lstm2seqencoder
+        encoder.use_packed_sequences = True
+        short_line = Line(text="First")
+        long_line = Line(text="second longer sentence")
+        batch_encoding = encoder(lines=[short_line, long_line])
+        single_encoding = encoder(lines=[short_line])
+        assert batch_encoding.size(1) == 3
+        assert torch.allclose(
+            batch_encoding[0, :1, :], single_encoding[0, :1, :], atol=1e-5
+        )
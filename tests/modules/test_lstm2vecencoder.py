@@ -63,3 +63,12 @@ class TestLstm2VecEncoder:
         batch_size = len(lines)
         encoding = encoder(lines=lines)
         assert encoding.size() == (batch_size, hidden_dim)
+
+    def test_packed_sequences_ignore_padding(self, setup_lstm2vecencoder):
+        encoder, options = setup_lstm2vecencoder
+        encoder.use_packed_sequences = True
+        short_line = Line(text="First")
+        long_line = Line(text="second longer sentence")
+        batch_encoding = encoder(lines=[short_line, long_line])
+        single_encoding = encoder(lines=[short_line])
+        assert torch.allclose(batch_encoding[0], single_encoding[0], atol=1e-5)
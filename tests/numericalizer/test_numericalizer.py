@@ -74,3 +74,66 @@ class TestNumericalizer:
         expected_mask = torch.ByteTensor(expected_mask)
         mask = numericalizer.get_mask_for_instance(instance=padded_numerical_tokens)
         assert torch.all(torch.eq(mask, expected_mask))
+
+    def test_special_indices(self, single_instance_setup):
+        single_instance, numericalizer, vocab = single_instance_setup
+        special_indices = numericalizer.get_special_indices()
+        assert special_indices["start"] == vocab.get_idx_from_token(vocab.start_token)
+        assert special_indices["end"] == vocab.get_idx_from_token(vocab.end_token)
+        assert special_indices["pad"] == vocab.get_idx_from_token(vocab.pad_token)
+        assert special_indices["unk"] == vocab.get_idx_from_token(vocab.unk_token)
+
+    def test_special_indices_reset_with_vocabulary(self, single_instance_setup):
+        single_instance, numericalizer, vocab = single_instance_setup
+        numericalizer.get_special_indices()
+        numericalizer.vocabulary = vocab
+        assert numericalizer._special_indices is None
+
+    def test_unknown_token(self, single_instance_setup):
+        single_instance, numericalizer, vocab = single_instance_setup
+        numerical_tokens = numericalizer.numericalize_instance(["i", "unseen"])
+        assert numerical_tokens[1] == vocab.get_idx_from_token(vocab.unk_token)
+
+    @pytest.mark.parametrize("max_length", [3, 5, 10])
+    @pytest.mark.parametrize("add_start_end_token", [True, False])
+    def test_batch_to_tensor_same_as_padded_instances(
+        self, single_instance_setup, max_length, add_start_end_token
+    ):
+        single_instance, numericalizer, vocab = single_instance_setup
+        instances = [single_instance[0], single_instance[0][:2], []]
+        expected = numericalizer.pad_batch_instances(
+            instances=numericalizer.numericalize_batch_instances(instances),
+            max_length=max_length,
+            add_start_end_token=add_start_end_token,
+        )
+        tensor = numericalizer.numericalize_batch_to_tensor(
+            instances=instances,
+            max_length=max_length,
+            add_start_end_token=add_start_end_token,
+        )
+        assert tensor.dtype == torch.long
+        assert tensor.tolist() == expected
+
+    def test_pad_batch_to_tensor_of_tensors(self, single_instance_setup):
+        single_instance, numericalizer, vocab = single_instance_setup
+        instances = numericalizer.numericalize_batch_instances(
+            [single_instance[0], single_instance[0][:2]]
+        )
+        from_lists = numericalizer.pad_batch_to_tensor(instances=instances)
+        from_tensors = numericalizer.pad_batch_to_tensor(
+            instances=[torch.tensor(instance) for instance in instances]
+        )
+        assert from_lists.size() == (2, len(single_instance[0]))
+        assert torch.equal(from_lists, from_tensors)
+
+    def test_mask_batch_tensor(self, single_instance_setup):
+        single_instance, numericalizer, vocab = single_instance_setup
+        instances = [single_instance[0], single_instance[0][:2]]
+        tensor = numericalizer.numericalize_batch_to_tensor(
+            instances=instances, add_start_end_token=True
+        )
+        expected_mask = numericalizer.get_mask_for_batch_instances(tensor.tolist())
+        mask = numericalizer.get_mask_for_batch_tensor(tensor)
+        assert mask.dtype == torch.bool
+        assert torch.equal(mask, expected_mask)
+        assert mask.sum().item() == 2 * 2 + 3
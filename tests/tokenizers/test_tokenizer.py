@@ -1,5 +1,6 @@
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 import pytest
+import spacy
 
 
 class TestWordTokenizer:
@@ -67,3 +68,40 @@ class TestWordTokenizer:
             "Event",
             "Systems.",
         ]
+
+    def test_vanilla_tokenizer_no_spacy_model(self):
+        tokenizer = WordTokenizer(tokenizer="vanilla")
+        assert tokenizer.nlp is None
+
+    def test_spacy_model_shared(self):
+        tokenizer = WordTokenizer()
+        other_tokenizer = WordTokenizer()
+        assert tokenizer.nlp is other_tokenizer.nlp
+
+    @pytest.mark.parametrize("tokenizer_type", ["spacy", "spacy-whitespace", "vanilla"])
+    def test_tokenize_batch_same_as_tokenize(self, tokenizer_type):
+        sample_sentences = ["I like big apple.", "We process text", "I don't"]
+        tokenizer = WordTokenizer(tokenizer=tokenizer_type, batch_size=2)
+        tokenized = tokenizer.tokenize_batch(sample_sentences)
+        assert tokenized == [tokenizer.tokenize(text) for text in sample_sentences]
+
+    def test_tokenize_batch_spacy_without_n_process(self, monkeypatch):
+        # Language.pipe of spacy 2.1 takes n_threads and has no n_process
+        tokenizer = WordTokenizer()
+        nlp = tokenizer.nlp
+
+        def pipe(
+            texts,
+            as_tuples=False,
+            n_threads=-1,
+            batch_size=1000,
+            disable=[],
+            cleanup=False,
+            component_cfg=None,
+        ):
+            return spacy.language.Language.pipe(nlp, texts, batch_size=batch_size)
+
+        monkeypatch.setattr(nlp, "pipe", pipe)
+        sample_sentences = ["I like big apple.", "We process text"]
+        tokenized = tokenizer.tokenize_batch(sample_sentences)
+        assert tokenized == [tokenizer.tokenize(text) for text in sample_sentences]
@@ -0,0 +1,81 @@
+import pytest
+import itertools
+import torch
+from allennlp.modules.conditional_random_field import ConditionalRandomField as CRF
+from allennlp.modules.conditional_random_field import allowed_transitions
+from sciwing.utils.crf_utils import batched_viterbi_tags, get_constrained_transitions
+from sciwing.utils.tensor_utils import get_mask
+
+
+@pytest.fixture(params=[True, False])
+def setup_crf(request):
+    include_start_end_transitions = request.param
+    torch.manual_seed(1729)
+    idx2label = {0: "B-A", 1: "I-A", 2: "B-B", 3: "I-B", 4: "O"}
+    constraints = allowed_transitions(constraint_type="BIO", labels=idx2label)
+    num_tags = len(idx2label)
+    crf = CRF(
+        num_tags=num_tags,
+        constraints=constraints,
+        include_start_end_transitions=include_start_end_transitions,
+    )
+    torch.nn.init.normal_(crf.transitions)
+    if include_start_end_transitions:
+        torch.nn.init.normal_(crf.start_transitions)
+        torch.nn.init.normal_(crf.end_transitions)
+
+    batch_size = 6
+    max_time_steps = 5
+    lengths = torch.LongTensor([5, 1, 3, 5, 2, 4])
+    logits = torch.randn(batch_size, max_time_steps, num_tags)
+    mask = get_mask(batch_size=batch_size, max_size=max_time_steps, lengths=lengths)
+    return crf, logits, mask, lengths
+
+
+def brute_force_paths(crf, logits, length):
+    num_tags = logits.size(1)
+    transitions, start_transitions, end_transitions = get_constrained_transitions(
+        crf=crf, num_tags=num_tags
+    )
+    paths = []
+    for path in itertools.product(range(num_tags), repeat=length):
+        score = start_transitions[path[0]] + end_transitions[path[-1]]
+        score += sum(logits[time_step, tag] for time_step, tag in enumerate(path))
+        score += sum(
+            transitions[from_tag, to_tag] for from_tag, to_tag in zip(path, path[1:])
+        )
+        paths.append((list(path), score.item()))
+    return sorted(paths, key=lambda path_score: path_score[1], reverse=True)
+
+
+class TestCrfUtils:
+    def test_parity_with_viterbi_tags(self, setup_crf):
+        crf, logits, mask, _ = setup_crf
+        expected = crf.viterbi_tags(logits=logits, mask=mask)
+        batched = batched_viterbi_tags(crf=crf, logits=logits, mask=mask)
+        assert len(batched) == len(expected)
+        for (tags, score), (expected_tags, expected_score) in zip(batched, expected):
+            assert tags == expected_tags
+            assert score == pytest.approx(expected_score, rel=1e-4)
+
+    def test_paths_trimmed_to_lengths(self, setup_crf):
+        crf, logits, mask, lengths = setup_crf
+        batched = batched_viterbi_tags(crf=crf, logits=logits, mask=mask)
+        assert [len(tags) for tags, _ in batched] == lengths.tolist()
+
+    def test_top_1_same_as_best(self, setup_crf):
+        crf, logits, mask, _ = setup_crf
+        best = batched_viterbi_tags(crf=crf, logits=logits, mask=mask)
+        top_k = batched_viterbi_tags(crf=crf, logits=logits, mask=mask, top_k=1)
+        assert [line_paths[0] for line_paths in top_k] == best
+
+    @pytest.mark.parametrize("top_k", [2, 5, 10])
+    def test_top_k_with_brute_force(self, setup_crf, top_k):
+        crf, logits, mask, lengths = setup_crf
+        batched = batched_viterbi_tags(crf=crf, logits=logits, mask=mask, top_k=top_k)
+        for line_paths, line_logits, length in zip(batched, logits, lengths.tolist()):
+            expected = brute_force_paths(crf, line_logits, length)[:top_k]
+            assert len(line_paths) == len(expected)
+            assert len(set(tuple(tags) for tags, _ in line_paths)) == len(line_paths)
+            for (_, score), (_, expected_score) in zip(line_paths, expected):
+                assert score == pytest.approx(expected_score, rel=1e-4)
@@ -0,0 +1,65 @@
+import pytest
+import torch
+from sciwing.utils.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache_dir(tmpdir):
+    return str(tmpdir.mkdir("embedding_cache"))
+
+
+class TestEmbeddingCache:
+    def test_key_depends_on_tokens_and_config(self):
+        key = EmbeddingCache.get_key(tokens=["a", "b"], config="elmo")
+        assert key == EmbeddingCache.get_key(tokens=["a", "b"], config="elmo")
+        assert key != EmbeddingCache.get_key(tokens=["a", "b"], config="bert")
+        assert key != EmbeddingCache.get_key(tokens=["a", "c"], config="elmo")
+
+    def test_memory_cache(self):
+        cache = EmbeddingCache(embedding_dimension=3)
+        assert cache.get("key") is None
+        cache.put("key", torch.ones(2, 3))
+        assert torch.equal(cache.get("key"), torch.ones(2, 3))
+        assert cache.get_stats() == {
+            "hits": 1,
+            "memory_hits": 1,
+            "disk_hits": 0,
+            "misses": 1,
+        }
+
+    def test_memory_cache_lru(self):
+        cache = EmbeddingCache(embedding_dimension=3, max_memory_items=2)
+        cache.put("first", torch.ones(1, 3))
+        cache.put("second", torch.ones(1, 3))
+        cache.get("first")
+        cache.put("third", torch.ones(1, 3))
+        assert list(cache.memory_cache.keys()) == ["first", "third"]
+        assert cache.get("second") is None
+
+    def test_disk_cache(self, cache_dir):
+        cache = EmbeddingCache(
+            embedding_dimension=3, cache_dir=cache_dir, max_memory_items=0
+        )
+        first = torch.randn(2, 3)
+        second = torch.randn(4, 3)
+        cache.put("first", first)
+        cache.put("second", second)
+        assert torch.allclose(cache.get("first"), first)
+        assert torch.allclose(cache.get("second"), second)
+        assert cache.disk_hits == 2
+
+    def test_disk_cache_shared_across_instances(self, cache_dir):
+        first = torch.randn(2, 3)
+        second = torch.randn(1, 3)
+        writer = EmbeddingCache(embedding_dimension=3, cache_dir=cache_dir)
+        writer.put("first", first)
+        writer.close()
+        another_writer = EmbeddingCache(embedding_dimension=3, cache_dir=cache_dir)
+        another_writer.put("second", second)
+        another_writer.close()
+
+        reader = EmbeddingCache(embedding_dimension=3, cache_dir=cache_dir)
+        assert len(reader) == 2
+        assert torch.allclose(reader.get("first"), first)
+        assert torch.allclose(reader.get("second"), second)
+        assert reader.get_stats()["disk_hits"] == 2
@@ -1,6 +1,86 @@
+import pytest
 from sciwing.utils.sciwing_toml_runner import SciWingTOMLRunner
+from sciwing.modules.embedders.char_embedder import CharEmbedder
+from sciwing.modules.embedders.cached_embedder import CachedEmbedder
+from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDatasetManager,
+)
+import pathlib
+
+
+@pytest.fixture(scope="session")
+def clf_dataset_manager(tmpdir_factory):
+    train_file = tmpdir_factory.mktemp("train_data").join("train_file.txt")
+    train_file.write("train_line1###label1\ntrain_line2###label2")
+
+    dev_file = tmpdir_factory.mktemp("dev_data").join("dev_file.txt")
+    dev_file.write("dev_line1###label1\ndev_line2###label2")
+
+    test_file = tmpdir_factory.mktemp("test_data").join("test_file.txt")
+    test_file.write("test_line1###label1\ntest_line2###label2")
+
+    clf_dataset_manager = TextClassificationDatasetManager(
+        train_filename=str(train_file),
+        dev_filename=str(dev_file),
+        test_filename=str(test_file),
+        batch_size=1,
+    )
+
+    return clf_dataset_manager
+
+
+@pytest.fixture
+def setup_char_embedder(clf_dataset_manager):
+    embedder = CharEmbedder(
+        char_embedding_dimension=10,
+        hidden_dimension=20,
+        datasets_manager=clf_dataset_manager,
+    )
+    return embedder
+
+
+def write_toml(tmpdir, content: str) -> pathlib.Path:
+    toml_file = tmpdir.join("experiment.toml")
+    toml_file.write(content)
+    return pathlib.Path(str(toml_file))
 
 
 class TestSciWingTOMLParse:
     def test_parse_toml_raises_error(self):
         pass
+
+    def test_embedder_not_wrapped_without_cache_section(
+        self, tmpdir, setup_char_embedder
+    ):
+        toml_filename = write_toml(tmpdir, '[experiment]\nexp_name = "exp"\n')
+        runner = SciWingTOMLRunner(toml_filename=toml_filename)
+        embedder = runner.wrap_embedder_with_cache(
+            classname="CharEmbedder", embedder=setup_char_embedder
+        )
+        assert embedder is setup_char_embedder
+
+    def test_embedder_wrapped_with_cache_section(self, tmpdir, setup_char_embedder):
+        cache_dir = str(tmpdir.mkdir("cache"))
+        toml_filename = write_toml(
+            tmpdir,
+            f'[embedding_cache]\ncache_dir = "{cache_dir}"\n'
+            f'embedders = ["CharEmbedder"]\n',
+        )
+        runner = SciWingTOMLRunner(toml_filename=toml_filename)
+        embedder = runner.wrap_embedder_with_cache(
+            classname="CharEmbedder", embedder=setup_char_embedder
+        )
+        assert isinstance(embedder, CachedEmbedder)
+        assert embedder.embedder is setup_char_embedder
+        assert embedder.cache_dir.startswith(cache_dir)
+
+    def test_only_listed_embedders_wrapped(self, tmpdir, setup_char_embedder):
+        cache_dir = str(tmpdir.mkdir("cache"))
+        toml_filename = write_toml(
+            tmpdir, f'[embedding_cache]\ncache_dir = "{cache_dir}"\n'
+        )
+        runner = SciWingTOMLRunner(toml_filename=toml_filename)
+        embedder = runner.wrap_embedder_with_cache(
+            classname="CharEmbedder", embedder=setup_char_embedder
+        )
+        assert embedder is setup_char_embedder
@@ -2,6 +2,11 @@ import pytest
 import torch
 from sciwing.utils.tensor_utils import has_tensor
 from sciwing.utils.tensor_utils import get_mask
+from sciwing.utils.tensor_utils import get_lines_lengths
+from sciwing.utils.tensor_utils import set_packed_sequences
+from sciwing.data.line import Line
+from sciwing.data.collate import CollatedInstances
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
 
 
 @pytest.fixture
@@ -43,3 +48,28 @@ class TestTensorUtils:
         for row, size in zip(mask, lengths):
             number_ones = sum(torch.gt(row, 0).tolist())
             assert number_ones == size
+
+    def test_get_lines_lengths(self):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        lines = [
+            Line(text="one two three", tokenizers=tokenizers),
+            Line(text="", tokenizers=tokenizers),
+        ]
+        lengths = get_lines_lengths(lines=lines, namespace="tokens", max_length=2)
+        assert lengths.tolist() == [2, 1]
+
+    def test_get_lines_lengths_collated(self):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        lines = CollatedInstances(
+            instances=[Line(text="one two", tokenizers=tokenizers)],
+            lengths={"tokens": torch.LongTensor([5])},
+        )
+        lengths = get_lines_lengths(lines=lines, namespace="tokens", max_length=10)
+        assert lengths.tolist() == [5]
+
+    def test_set_packed_sequences(self):
+        model = torch.nn.Sequential(torch.nn.Linear(2, 2), torch.nn.Linear(2, 2))
+        model[0].use_packed_sequences = False
+        set_packed_sequences(model, True)
+        assert model[0].use_packed_sequences
+        assert not hasattr(model[1], "use_packed_sequences")
@@ -412,3 +412,150 @@ class TestVocab:
         for instance in instances:
             for token in instance:
                 assert token.islower()
+
+    @pytest.mark.parametrize("include_special_vocab", [True, False])
+    def test_token_counts_same_as_instances(self, instances, include_special_vocab):
+        single_instance = instances["single_instance"]
+        vocab_builder = Vocab(
+            instances=single_instance, include_special_vocab=include_special_vocab
+        )
+        vocab_builder.build_vocab()
+
+        counts_vocab_builder = Vocab(
+            token_counts={"i": 3, "like": 2, "nlp": 1},
+            include_special_vocab=include_special_vocab,
+        )
+        counts_vocab_builder.build_vocab()
+
+        assert counts_vocab_builder.vocab == vocab_builder.vocab
+
+    @pytest.mark.parametrize("include_special_vocab", [True, False])
+    def test_from_counters_same_as_instances(self, include_special_vocab):
+        shards = [
+            [["i", "like", "nlp"], ["i", "i"]],
+            [["like", "deep", "nlp"]],
+            [["i", "learning", "deep"]],
+        ]
+        all_instances = [instance for shard in shards for instance in shard]
+        vocab_builder = Vocab(
+            instances=all_instances, include_special_vocab=include_special_vocab
+        )
+        vocab_builder.build_vocab()
+
+        counters = [Vocab.count_tokens(shard) for shard in shards]
+        counters_vocab_builder = Vocab.from_counters(
+            counters, include_special_vocab=include_special_vocab
+        )
+        counters_vocab_builder.build_vocab()
+
+        assert counters_vocab_builder.vocab == vocab_builder.vocab
+        assert counters_vocab_builder.token2idx == vocab_builder.token2idx
+
+    def test_count_tokens_preprocessing(self):
+        instance_preprocesing = InstancePreprocessing()
+        counter = Vocab.count_tokens(
+            [["I", "like"], ["i", "Like", "NLP"]],
+            preprocessing_pipeline=[instance_preprocesing.lowercase],
+        )
+        assert counter == {"i": 2, "like": 2, "nlp": 1}
+
+    def test_count_tokens_into_counter(self):
+        counter = Vocab.count_tokens([["I", "like"]])
+        same_counter = Vocab.count_tokens([["I", "NLP"]], counter=counter)
+        assert same_counter is counter
+        assert counter == {"I": 2, "like": 1, "NLP": 1}
+
+    def test_add_many_tokens_indices(self, instances):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance)
+        vocab.build_vocab()
+        vocab_len = vocab.get_vocab_len()
+        new_tokens = [f"token{idx}" for idx in range(1000)]
+        vocab.add_tokens(new_tokens)
+        assert vocab.get_vocab_len() == vocab_len + len(new_tokens)
+        for idx, token in enumerate(new_tokens):
+            assert vocab.get_idx_from_token(token) == vocab_len + idx
+
+    def test_vocab_len_reset_on_set_vocab(self, instances):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance, include_special_vocab=False)
+        vocab.build_vocab()
+        assert vocab.get_vocab_len() == 3
+        vocab.set_vocab({"i": (3, 0), "like": (2, 1)})
+        assert vocab.get_vocab_len() == 2
+
+    def test_orig_vocab_not_clipped(self, instances):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance, min_count=2)
+        vocab.build_vocab()
+        unk_idx = vocab.get_idx_from_token(vocab.unk_token)
+        assert vocab.vocab["nlp"] == (1, unk_idx)
+        assert vocab.orig_vocab["nlp"][1] != unk_idx
+
+    @pytest.mark.parametrize(
+        "include_special_vocab, min_count", [(True, 1), (True, 2), (False, 1)]
+    )
+    def test_compact_file_same_as_vocab(
+        self, instances, tmpdir, include_special_vocab, min_count
+    ):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(
+            instances=single_instance,
+            include_special_vocab=include_special_vocab,
+            min_count=min_count,
+        )
+        vocab.build_vocab()
+        vocab_file = str(tmpdir.join("vocab.vocab"))
+        vocab.save_to_file(vocab_file)
+
+        loaded_vocab = Vocab.load_from_file(vocab_file)
+        assert loaded_vocab.get_vocab_len() == vocab.get_vocab_len()
+        assert loaded_vocab.get_orig_vocab_len() == vocab.get_orig_vocab_len()
+        assert loaded_vocab.vocab == vocab.vocab
+        assert loaded_vocab.orig_vocab == vocab.orig_vocab
+        assert loaded_vocab.token2idx == vocab.token2idx
+        assert loaded_vocab.idx2token == vocab.idx2token
+        assert loaded_vocab.include_special_vocab == include_special_vocab
+
+    def test_compact_file_mappings_lazy(self, instances, tmpdir):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance)
+        vocab.build_vocab()
+        vocab_file = str(tmpdir.join("vocab.vocab"))
+        vocab.save_to_file(vocab_file)
+
+        loaded_vocab = Vocab.load_from_file(vocab_file)
+        assert loaded_vocab.get_vocab_len() == vocab.get_vocab_len()
+        assert loaded_vocab.get_idx_from_token("like") == vocab.get_idx_from_token(
+            "like"
+        )
+        assert loaded_vocab._vocab is None
+        assert loaded_vocab._idx2token is None
+
+    def test_compact_store_location(self, instances, tmpdir):
+        single_instance = instances["single_instance"]
+        vocab_file = str(tmpdir.join("vocab.vocab"))
+        vocab = Vocab(instances=single_instance, store_location=vocab_file)
+        vocab.build_vocab()
+        with open(vocab_file, "rb") as fp:
+            assert not fp.read().startswith(b"{")
+
+        stored_vocab = Vocab(instances=single_instance, store_location=vocab_file)
+        stored_vocab.build_vocab()
+        assert stored_vocab.vocab == vocab.vocab
+        assert stored_vocab.token2idx == vocab.token2idx
+
+    def test_compact_file_add_tokens(self, instances, tmpdir):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance)
+        vocab.build_vocab()
+        vocab_file = str(tmpdir.join("vocab.vocab"))
+        vocab.save_to_file(vocab_file)
+
+        loaded_vocab = Vocab.load_from_file(vocab_file)
+        loaded_vocab.add_tokens(["very"])
+        assert loaded_vocab.get_idx_from_token("very") == 7
+        assert loaded_vocab.get_token_from_idx(7) == "very"
+
+        reloaded_vocab = Vocab.load_from_file(vocab_file)
+        assert reloaded_vocab.get_idx_from_token("very") == 7
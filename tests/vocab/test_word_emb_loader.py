@@ -1,5 +1,5 @@
 import pytest
-from sciwing.vocab.embedding_loader import EmbeddingLoader
+from sciwing.vocab.embedding_loader import EmbeddingLoader, EmbeddingsView
 import numpy as np
 import os
 from sciwing.utils.common import get_system_mem_in_gb
@@ -92,3 +92,95 @@ class TestWordEmbLoader:
         vocab_len = vocab.get_vocab_len()
         embedding = emb_loader.get_embeddings_for_vocab(vocab=vocab)
         assert embedding.size(0) == vocab_len
+
+    @pytest.mark.slow
+    def test_binary_store_exists(self, setup_word_emb_loader):
+        emb_loader = setup_word_emb_loader
+        if emb_loader.embedding_type != "parscit":
+            vocab_filename, vectors_filename = emb_loader.get_binary_store_filenames()
+            assert os.path.isfile(vocab_filename)
+            assert os.path.isfile(vectors_filename)
+
+    @pytest.mark.slow
+    def test_vectors_are_memory_mapped(self, setup_word_emb_loader):
+        emb_loader = setup_word_emb_loader
+        assert isinstance(emb_loader.vectors, np.memmap)
+        assert emb_loader.vectors.shape == (
+            len(emb_loader.word2idx),
+            emb_loader.embedding_dimension,
+        )
+
+    @pytest.mark.slow
+    def test_get_embedding_for_vocab_values(
+        self, setup_word_emb_loader, setup_parscit_dataset_manager
+    ):
+        emb_loader = setup_word_emb_loader
+        data_manager = setup_parscit_dataset_manager
+        vocab = data_manager.namespace_to_vocab["tokens"]
+        embedding = emb_loader.get_embeddings_for_vocab(vocab=vocab)
+        for idx, token in vocab.get_idx2token_mapping().items():
+            if token in emb_loader.embeddings:
+                expected = torch.tensor(emb_loader.embeddings[token], dtype=torch.float)
+                assert torch.allclose(embedding[idx], expected)
+
+    @pytest.mark.slow
+    def test_get_embedding_for_vocab_random_only_for_missing(
+        self, setup_word_emb_loader, setup_parscit_dataset_manager
+    ):
+        emb_loader = setup_word_emb_loader
+        vocab = setup_parscit_dataset_manager.namespace_to_vocab["tokens"]
+        np.random.seed(0)
+        embedding = emb_loader.get_embeddings_for_vocab(vocab=vocab)
+        state_after = np.random.get_state()[1]
+
+        # one draw for every missing token in the order of the vocab
+        np.random.seed(0)
+        idx2token = vocab.get_idx2token_mapping()
+        for idx in range(len(idx2token)):
+            token = idx2token[idx]
+            if token in emb_loader.embeddings or token.lower() in emb_loader.embeddings:
+                continue
+            expected = np.random.randn(emb_loader.embedding_dimension)
+            assert torch.allclose(embedding[idx], torch.tensor(expected).float())
+        assert np.array_equal(np.random.get_state()[1], state_after)
+
+
+class TestEmbeddingsView:
+    def test_embeddings_view_lookup(self):
+        vectors = np.arange(6, dtype=np.float32).reshape(3, 2)
+        view = EmbeddingsView(word2idx={"a": 0, "b": 1, "c": 2}, vectors=vectors)
+        assert len(view) == 3
+        assert "b" in view
+        assert "d" not in view
+        assert view["c"].tolist() == [4.0, 5.0]
+        with pytest.raises(KeyError):
+            view["d"]
+
+
+@pytest.mark.skipif(
+    memory_available < 16, reason="Memory is too low to run the word emb loader tests"
+)
+class TestVocabRestrictedWordEmbLoader:
+    @pytest.mark.slow
+    @pytest.mark.parametrize("embedding_type", ["glove_6B_50", "parscit"])
+    def test_only_vocab_words_kept(self, setup_parscit_dataset_manager, embedding_type):
+        vocab = setup_parscit_dataset_manager.namespace_to_vocab["tokens"]
+        emb_loader = EmbeddingLoader(embedding_type=embedding_type, vocab=vocab)
+        words_to_keep = EmbeddingLoader.get_words_to_keep(vocab)
+        assert len(emb_loader.embeddings) <= len(words_to_keep)
+        for word in emb_loader.embeddings:
+            assert word in words_to_keep
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("embedding_type", ["glove_6B_50", "parscit"])
+    def test_same_embeddings_as_full_loader(
+        self, setup_parscit_dataset_manager, embedding_type
+    ):
+        vocab = setup_parscit_dataset_manager.namespace_to_vocab["tokens"]
+        emb_loader = EmbeddingLoader(embedding_type=embedding_type, vocab=vocab)
+        full_emb_loader = EmbeddingLoader(embedding_type=embedding_type)
+        embeddings = emb_loader.get_embeddings_for_vocab(vocab, zeros_for_missing=True)
+        full_embeddings = full_emb_loader.get_embeddings_for_vocab(
+            vocab, zeros_for_missing=True
+        )
+        assert torch.allclose(embeddings, full_embeddings)